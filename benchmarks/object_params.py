@@ -0,0 +1,95 @@
+"""Measure the cost of initial parameters given as a DataArray of objects.
+
+Fits small Gaussian peaks with ``params`` given as a DataArray of JSON strings, dicts
+or :class:`lmfit.Parameters`, either tiled from a few presets or with distinct
+values for every curve. Tiled presets are parsed once per block, so the difference
+between the two is the cost of constructing the parameters of every fit. Reports the
+best of a few runs, and checks that both give the same coefficients.
+
+Run with ``python benchmarks/object_params.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import lmfit
+import numpy as np
+import xarray as xr
+
+import xarray_lmfit  # noqa: F401
+
+N_PRESETS: int = 4
+N_REPEATS: int = 3
+
+
+def _data(n_curves: int) -> xr.DataArray:
+    x = np.linspace(-5, 5, 32)
+    rng = np.random.default_rng(0)
+    center = np.tile(np.linspace(-1, 1, N_PRESETS), n_curves // N_PRESETS)
+    values = np.exp(-((x - center[:, None]) ** 2) / 0.5)
+    values += rng.normal(0, 0.01, values.shape)
+    return xr.DataArray(values, dims=("curve", "x"), coords={"x": x})
+
+
+def _elements(kind: str, model: lmfit.Model, n_curves: int, *, tiled: bool) -> list:
+    center = np.tile(np.linspace(-1, 1, N_PRESETS), n_curves // N_PRESETS)
+    # Negligibly different initial values, so that no two curves share a preset
+    jitter = 0.0 if tiled else np.arange(n_curves) * 1e-9
+    center = (center + jitter)[: N_PRESETS if tiled else n_curves]
+    presets = [
+        model.make_params(center=c, sigma={"value": 0.7, "min": 0}, amplitude=1.5)
+        for c in center
+    ]
+    if kind == "JSON strings":
+        return [params.dumps() for params in presets]
+    if kind == "dicts":
+        return [
+            {
+                name: {"value": params[name].value, "min": params[name].min}
+                for name in ("amplitude", "center", "sigma")
+            }
+            for params in presets
+        ]
+    return presets
+
+
+def _params(elements: list, n_curves: int) -> xr.DataArray:
+    specs = np.empty(n_curves, dtype=object)
+    for i in range(n_curves):
+        specs[i] = elements[i % len(elements)]
+    return xr.DataArray(specs, dims="curve")
+
+
+def main() -> None:
+    n_curves = 256
+    da = _data(n_curves)
+    model = lmfit.models.GaussianModel()
+    # Warm up imports and caches
+    elements = _elements("dicts", model, N_PRESETS, tiled=True)
+    da.isel(curve=slice(N_PRESETS)).xlm.modelfit(
+        "x", model=model, params=_params(elements, N_PRESETS)
+    )
+
+    for kind in ("JSON strings", "dicts", "Parameters"):
+        print(kind)
+        coefficients = {}
+        for label, tiled in (("distinct", False), ("tiled", True)):
+            params = _params(_elements(kind, model, n_curves, tiled=tiled), n_curves)
+            elapsed = np.inf
+            for _ in range(N_REPEATS):
+                start = time.perf_counter()
+                result = da.xlm.modelfit(
+                    "x", model=model, params=params, output_result=False
+                )
+                elapsed = min(elapsed, time.perf_counter() - start)
+            coefficients[label] = result.modelfit_coefficients
+            print(
+                f"  {label:>8}: {elapsed:.2f} s, "
+                f"{elapsed / n_curves * 1e3:.3f} ms per fit"
+            )
+        xr.testing.assert_allclose(coefficients["distinct"], coefficients["tiled"])
+
+
+if __name__ == "__main__":
+    main()
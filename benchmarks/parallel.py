@@ -0,0 +1,84 @@
+"""Compare the serial, dask, thread-pool and process-pool execution of fits.
+
+Fits a Gaussian peak broadened by a Lorentzian, evaluated by FFT convolution on a
+dense grid. Nearly all of the time is spent in NumPy kernels that release the GIL, so
+that the fits can run in parallel on threads. Reports the wall time of each
+execution mode and checks that they give the same coefficients as the serial fit.
+
+Run with ``python benchmarks/parallel.py [n_workers]``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import lmfit
+import numpy as np
+import xarray as xr
+
+import xarray_lmfit  # noqa: F401
+
+
+def broadened(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=0.5):
+    """Gaussian peak convolved with a Lorentzian of half-width `gamma`."""
+    step = x[1] - x[0]
+    gaussian = np.exp(-((x - center) ** 2) / (2 * sigma**2))
+    kernel_x = (np.arange(x.size) - x.size // 2) * step
+    lorentzian = gamma / np.pi / (kernel_x**2 + gamma**2)
+    spectrum = np.fft.rfft(gaussian) * np.fft.rfft(np.fft.ifftshift(lorentzian))
+    return amplitude * np.fft.irfft(spectrum, n=x.size) * step
+
+
+def _data(n_curves: int, n_points: int) -> xr.DataArray:
+    x = np.linspace(-20, 20, n_points)
+    rng = np.random.default_rng(0)
+    center = rng.uniform(-2, 2, n_curves)
+    values = np.stack([broadened(x, 1.0, c, 1.0, 0.5) for c in center])
+    values += rng.normal(0, 0.01, values.shape)
+    return xr.DataArray(values, dims=("curve", "x"), coords={"x": x})
+
+
+def main() -> None:
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    da = _data(n_curves=64, n_points=2**16)
+    model = lmfit.Model(broadened)
+    params = {"amplitude": 1.0, "center": 0.0, "sigma": 1.5, "gamma": 0.3}
+    fit = {"model": model, "params": params, "output_result": False}
+
+    modes = {
+        "serial": lambda: da.xlm.modelfit("x", **fit),
+        "dask (threads)": lambda: (
+            da.chunk(curve=4)
+            .xlm.modelfit("x", **fit)
+            .compute(scheduler="threads", num_workers=n_workers)
+        ),
+        "dask (processes)": lambda: (
+            da.chunk(curve=4)
+            .xlm.modelfit("x", **fit)
+            .compute(scheduler="processes", num_workers=n_workers)
+        ),
+        'engine="threads"': lambda: da.xlm.modelfit(
+            "x", engine="threads", n_workers=n_workers, **fit
+        ),
+        'engine="processes"': lambda: da.xlm.modelfit(
+            "x", engine="processes", n_workers=n_workers, **fit
+        ),
+    }
+
+    print(f"{da.sizes['curve']} fits of {da.sizes['x']} points, {n_workers} workers")
+    reference: xr.DataArray | None = None
+    for name, run in modes.items():
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        coefficients = result.modelfit_coefficients
+        if reference is None:
+            reference = coefficients
+        agrees = np.allclose(coefficients, reference, rtol=1e-6, equal_nan=True)
+        print(f"  {name:>18}: {elapsed:6.2f} s{'' if agrees else '  (differs)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare static initialization with warm starts on synthetic data.
+
+Fits a Gaussian peak whose center drifts smoothly along a temperature sweep and
+across a 2D map, and reports the number of function evaluations and failed fits with
+and without ``warm_start``.
+
+Run with ``python benchmarks/warm_start.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import lmfit
+import numpy as np
+import xarray as xr
+
+import xarray_lmfit  # noqa: F401
+
+
+def _peaks(center: np.ndarray, seed: int = 0) -> xr.DataArray:
+    x = np.linspace(-10, 10, 201)
+    rng = np.random.default_rng(seed)
+    values = np.exp(-((x - center[..., None]) ** 2) / 0.5)
+    values = values + rng.normal(0, 0.02, values.shape)
+    dims = [f"dim_{i}" for i in range(center.ndim)]
+    return xr.DataArray(values, dims=(*dims, "x"), coords={"x": x})
+
+
+def _run(name: str, da: xr.DataArray, center: np.ndarray, **kwargs) -> None:
+    model = lmfit.models.GaussianModel()
+    params = {"center": float(center.flat[0]), "sigma": 0.5, "amplitude": 1.0}
+
+    print(name)
+    for label, warm_start in (("static", None), ("warm start", list(da.dims[:-1]))):
+        start = time.perf_counter()
+        result = da.xlm.modelfit(
+            "x",
+            model=model,
+            params=params,
+            output_result=False,
+            warm_start=warm_start,
+            **kwargs,
+        ).compute()
+        elapsed = time.perf_counter() - start
+
+        nfev = result.modelfit_stats.sel(fit_stat="nfev")
+        fitted = result.modelfit_coefficients.sel(param="center")
+        failed = int((np.abs(fitted - center) > 0.1).sum() + fitted.isnull().sum())
+        print(
+            f"  {label:>10}: {float(nfev.mean()):6.1f} nfev per fit, "
+            f"{failed:4d}/{center.size} wrong or failed, {elapsed:.2f} s"
+        )
+
+
+def main() -> None:
+    sweep = np.linspace(-6, 6, 400)
+    _run("Temperature sweep (400 points)", _peaks(sweep), sweep)
+
+    grid = np.add.outer(np.linspace(-3, 3, 40), np.linspace(-2, 2, 40))
+    _run("2D map (40 x 40, single chunk)", _peaks(grid), grid)
+    _run(
+        "2D map (40 x 40, 20 x 20 chunks)",
+        _peaks(grid).chunk({"dim_0": 20, "dim_1": 20}),
+        grid,
+    )
+
+
+if __name__ == "__main__":
+    main()
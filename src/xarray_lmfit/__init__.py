@@ -1,9 +1,11 @@
-__all__ = ["load_fit", "save_fit"]
+__all__ = ["FitCache", "LiteModelResult", "load_fit", "save_fit"]
 
 from importlib.metadata import version as _version
 
 from xarray_lmfit import modelfit as modelfit
+from xarray_lmfit._cache import FitCache
 from xarray_lmfit._io import load_fit, save_fit
+from xarray_lmfit._results import LiteModelResult
 
 try:
     __version__ = _version("xarray-lmfit")
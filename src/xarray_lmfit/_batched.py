@@ -0,0 +1,428 @@
+"""Vectorized Levenberg-Marquardt fitting of many pixels at once.
+
+The functions in this module operate on stacked parameter arrays of shape
+``(n_pixels, n_params)`` so that a single NumPy evaluation advances the fit of every
+pixel in a block by one damped least-squares iteration.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import functools
+import operator
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    import lmfit
+    import lmfit.models
+else:
+    import lazy_loader as _lazy
+
+    lmfit = _lazy.load("lmfit")
+
+_TINY: float = 1.0e-15
+_S2PI: float = np.sqrt(2 * np.pi)
+_S2: float = np.sqrt(2.0)
+_LOG2: float = np.log(2.0)
+
+#: Damping factor limits of the Levenberg-Marquardt iteration.
+_LAMBDA_INIT: float = 1.0e-3
+_LAMBDA_MAX: float = 1.0e10
+
+
+def _gaussian(x, amplitude=1.0, center=0.0, sigma=1.0):
+    return (amplitude / np.maximum(_TINY, _S2PI * sigma)) * np.exp(
+        -((1.0 * x - center) ** 2) / np.maximum(_TINY, 2 * sigma**2)
+    )
+
+
+def _lorentzian(x, amplitude=1.0, center=0.0, sigma=1.0):
+    return (amplitude / (1 + ((1.0 * x - center) / np.maximum(_TINY, sigma)) ** 2)) / (
+        np.maximum(_TINY, np.pi * sigma)
+    )
+
+
+def _voigt(x, amplitude=1.0, center=0.0, sigma=1.0, gamma=None):
+    from scipy.special import wofz
+
+    if gamma is None:
+        gamma = sigma
+    z = (x - center + 1j * gamma) / np.maximum(_TINY, sigma * _S2)
+    return amplitude * np.real(wofz(z)) / np.maximum(_TINY, sigma * _S2PI)
+
+
+def _pvoigt(x, amplitude=1.0, center=0.0, sigma=1.0, fraction=0.5):
+    sigma_g = sigma / np.sqrt(2 * _LOG2)
+    return (1 - fraction) * _gaussian(
+        x, amplitude, center, sigma_g
+    ) + fraction * _lorentzian(x, amplitude, center, sigma)
+
+
+def _moffat(x, amplitude=1.0, center=0.0, sigma=1.0, beta=1.0):
+    return amplitude / (((x - center) / np.maximum(_TINY, sigma)) ** 2 + 1) ** beta
+
+
+def _exponential(x, amplitude=1.0, decay=1.0):
+    decay = np.copysign(np.maximum(_TINY, np.abs(decay)), decay)
+    return amplitude * np.exp(-x / decay)
+
+
+def _polynomial(x, c0=0.0, c1=0.0, c2=0.0, c3=0.0, c4=0.0, c5=0.0, c6=0.0, c7=0.0):
+    out = np.zeros_like(x, dtype=np.float64)
+    for c in (c7, c6, c5, c4, c3, c2, c1, c0):
+        out = out * x + c
+    return out
+
+
+@functools.cache
+def _lineshape_overrides() -> dict[Callable, Callable]:
+    """Map lmfit lineshapes that only accept scalar parameters to batched versions.
+
+    Most lineshapes in :mod:`lmfit.lineshapes` guard against division by zero with
+    the builtin :func:`max`, which does not broadcast over arrays of parameters.
+    """
+    import lmfit.lineshapes
+
+    return {
+        lmfit.lineshapes.gaussian: _gaussian,
+        lmfit.lineshapes.lorentzian: _lorentzian,
+        lmfit.lineshapes.voigt: _voigt,
+        lmfit.lineshapes.pvoigt: _pvoigt,
+        lmfit.lineshapes.moffat: _moffat,
+        lmfit.lineshapes.exponential: _exponential,
+    }
+
+
+def batched_eval(
+    model: lmfit.Model,
+    values: Mapping[str, npt.NDArray],
+    independent_vars: Mapping[str, typing.Any],
+) -> npt.NDArray:
+    """Evaluate a model for a stack of parameter values.
+
+    Parameters
+    ----------
+    model
+        The model to evaluate. Composite models are evaluated component-wise.
+    values
+        Mapping from parameter name to an array of shape ``(n_pixels, 1)``.
+    independent_vars
+        Mapping from independent variable name to an array that broadcasts against
+        ``(n_pixels, n_points)``.
+    """
+    if isinstance(model, lmfit.model.CompositeModel):
+        return model.op(
+            batched_eval(model.left, values, independent_vars),
+            batched_eval(model.right, values, independent_vars),
+        )
+    if isinstance(model, lmfit.models.PolynomialModel):
+        # np.polyval cannot stack scalar defaults with arrays of coefficients
+        func: Callable = _polynomial
+    else:
+        func = _lineshape_overrides().get(model.func, model.func)
+    kwargs = dict(model.opts)
+    for name in model.independent_vars:
+        if name in independent_vars:
+            kwargs[name] = independent_vars[name]
+    for root in model._param_root_names:
+        kwargs[root] = values[f"{model.prefix}{root}"]
+    return np.asarray(func(**kwargs), dtype=np.float64)
+
+
+def function_param_names(model: lmfit.Model) -> list[str]:
+    """Return the names of the parameters taken by the functions of a model.
+
+    Unlike :attr:`lmfit.Model.param_names`, parameter hints that are not arguments of
+    the functions, such as the ``fwhm`` and ``height`` of peak models, are not
+    included. Components of composite models are walked in order.
+    """
+    return list(
+        dict.fromkeys(
+            f"{component.prefix}{root}"
+            for component in model.components
+            for root in component._param_root_names
+        )
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class _Bounds:
+    """Vectorized version of the bound transformations used by lmfit.
+
+    See :meth:`lmfit.Parameter.setup_bounds`.
+    """
+
+    lower: npt.NDArray
+    upper: npt.NDArray
+
+    def __getitem__(self, index: npt.NDArray) -> _Bounds:
+        return _Bounds(self.lower[index], self.upper[index])
+
+    @property
+    def _kinds(self) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        has_lower, has_upper = np.isfinite(self.lower), np.isfinite(self.upper)
+        return has_lower & has_upper, has_lower & ~has_upper, ~has_lower & has_upper
+
+    def _finite_bounds(self) -> tuple[npt.NDArray, npt.NDArray]:
+        return (
+            np.where(np.isfinite(self.lower), self.lower, 0.0),
+            np.where(np.isfinite(self.upper), self.upper, 0.0),
+        )
+
+    def clip(self, p: npt.NDArray) -> npt.NDArray:
+        return np.clip(p, self.lower, self.upper)
+
+    def to_internal(self, p: npt.NDArray) -> npt.NDArray:
+        both, lower_only, upper_only = self._kinds
+        lo, hi = self._finite_bounds()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            span = np.where(both, hi - lo, 1.0)
+            u = np.where(
+                both,
+                np.arcsin(np.clip(2 * (p - lo) / span - 1, -1, 1)),
+                p,
+            )
+            u = np.where(lower_only, np.sqrt(np.maximum((p - lo + 1) ** 2 - 1, 0)), u)
+            return np.where(
+                upper_only, np.sqrt(np.maximum((hi - p + 1) ** 2 - 1, 0)), u
+            )
+
+    def from_internal(self, u: npt.NDArray) -> npt.NDArray:
+        both, lower_only, upper_only = self._kinds
+        lo, hi = self._finite_bounds()
+        p = np.where(both, lo + (np.sin(u) + 1) * (hi - lo) / 2, u)
+        p = np.where(lower_only, lo - 1 + np.sqrt(u * u + 1), p)
+        return np.where(upper_only, hi + 1 - np.sqrt(u * u + 1), p)
+
+    def gradient(self, u: npt.NDArray) -> npt.NDArray:
+        """Return the derivative of the external parameters w.r.t. the internal ones."""
+        both, lower_only, upper_only = self._kinds
+        lo, hi = self._finite_bounds()
+        grad = np.where(both, np.cos(u) * (hi - lo) / 2, 1.0)
+        grad = np.where(lower_only, u / np.sqrt(u * u + 1), grad)
+        return np.where(upper_only, -u / np.sqrt(u * u + 1), grad)
+
+
+@dataclasses.dataclass
+class BatchedResult:
+    """Outcome of :func:`levenberg_marquardt` for a stack of pixels."""
+
+    params: npt.NDArray
+    covar: npt.NDArray
+    residual: npt.NDArray
+    nfev: npt.NDArray
+    success: npt.NDArray
+    aborted: npt.NDArray
+
+
+def _solve(lhs: npt.NDArray, rhs: npt.NDArray) -> npt.NDArray:
+    try:
+        return np.linalg.solve(lhs, rhs[..., np.newaxis])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("...ij,...j->...i", np.linalg.pinv(lhs), rhs)
+
+
+def _inv(matrices: npt.NDArray) -> npt.NDArray:
+    """Invert a stack of matrices, leaving singular ones as NaN."""
+    try:
+        return np.linalg.inv(matrices)
+    except np.linalg.LinAlgError:
+        out = np.full_like(matrices, np.nan)
+        for k, matrix in enumerate(matrices):
+            with contextlib.suppress(np.linalg.LinAlgError):
+                out[k] = np.linalg.inv(matrix)
+        return out
+
+
+def _jacobian(
+    residual: Callable[[npt.NDArray, npt.NDArray], npt.NDArray],
+    u: npt.NDArray,
+    r: npt.NDArray,
+    bounds: _Bounds,
+    index: npt.NDArray,
+) -> npt.NDArray:
+    """Forward-difference Jacobian in internal coordinates."""
+    n_params = u.shape[-1]
+    jac = np.empty((*r.shape, n_params))
+    h = np.sqrt(np.finfo(np.float64).eps) * np.maximum(np.abs(u), 1.0)
+    for j in range(n_params):
+        u_step = u.copy()
+        u_step[:, j] += h[:, j]
+        r_step = residual(bounds.from_internal(u_step), index)
+        jac[..., j] = (r_step - r) / h[:, j, np.newaxis]
+    return jac
+
+
+def levenberg_marquardt(
+    residual: Callable[[npt.NDArray, npt.NDArray], npt.NDArray],
+    p0: npt.NDArray,
+    lower: npt.NDArray,
+    upper: npt.NDArray,
+    *,
+    max_nfev: int,
+    ftol: float = 1.5e-8,
+    xtol: float = 1.5e-8,
+) -> BatchedResult:
+    """Minimize the sum of squared residuals of many independent problems at once.
+
+    Parameters
+    ----------
+    residual
+        Function that takes parameters of shape ``(n, n_params)`` and an integer index
+        array of length ``n`` selecting the pixels, and returns the residuals of those
+        pixels with shape ``(n, n_points)``.
+    p0
+        Initial parameter values of shape ``(n_pixels, n_params)``.
+    lower, upper
+        Parameter bounds broadcastable to `p0`. Bounds are handled with the same
+        transformations as in lmfit.
+    max_nfev
+        Maximum number of residual evaluations per pixel.
+    ftol, xtol
+        Relative tolerances on the sum of squares and on the parameters.
+
+    Returns
+    -------
+    BatchedResult
+        Best-fit parameters, unscaled covariance matrices, residuals, number of
+        function evaluations and convergence flags. Convergence is tracked per pixel,
+        and pixels that converge early are not evaluated further. Pixels whose initial
+        residuals are not finite are flagged as aborted.
+    """
+    n_pixels, n_params = p0.shape
+    bounds = _Bounds(np.broadcast_to(lower, p0.shape), np.broadcast_to(upper, p0.shape))
+    index = np.arange(n_pixels)
+    u = bounds.to_internal(bounds.clip(p0))
+    r = residual(bounds.from_internal(u), index)
+    chisqr = np.einsum("ij,ij->i", r, r)
+    nfev = np.ones(n_pixels, dtype=np.int64)
+    lam = np.full(n_pixels, _LAMBDA_INIT)
+    success = np.zeros(n_pixels, dtype=bool)
+    active = np.isfinite(chisqr)
+    need_jac = active.copy()
+    jac = np.zeros((*r.shape, n_params))
+
+    while active.any():
+        update = np.flatnonzero(active & need_jac)
+        if update.size:
+            jac[update] = _jacobian(
+                residual, u[update], r[update], bounds[update], update
+            )
+            nfev[update] += n_params
+
+        idx = np.flatnonzero(active)
+        jac_a, r_a = jac[idx], r[idx]
+        hess = np.einsum("nmi,nmj->nij", jac_a, jac_a)
+        grad = np.einsum("nmi,nm->ni", jac_a, r_a)
+        diag = np.maximum(np.diagonal(hess, axis1=-2, axis2=-1), _TINY)
+        damped = hess + (lam[idx, np.newaxis] * diag)[..., np.newaxis] * np.eye(
+            n_params
+        )
+        step = -_solve(damped, grad)
+
+        u_trial = u[idx] + step
+        r_trial = residual(bounds[idx].from_internal(u_trial), idx)
+        nfev[idx] += 1
+        chisqr_trial = np.einsum("ij,ij->i", r_trial, r_trial)
+
+        accept = np.isfinite(chisqr_trial) & (chisqr_trial <= chisqr[idx])
+        acc = idx[accept]
+        reduction = chisqr[acc] - chisqr_trial[accept]
+        small_step = np.linalg.norm(step[accept], axis=-1) <= xtol * (
+            np.linalg.norm(u_trial[accept], axis=-1) + xtol
+        )
+        u[acc] = u_trial[accept]
+        r[acc] = r_trial[accept]
+        chisqr[acc] = chisqr_trial[accept]
+        lam[acc] = np.maximum(lam[acc] / 10, 1e-12)
+        need_jac[acc] = True
+        converged = (reduction <= ftol * chisqr[acc]) | small_step
+        success[acc[converged]] = True
+        active[acc[converged]] = False
+
+        rej = idx[~accept]
+        lam[rej] *= 10
+        need_jac[rej] = False
+        stuck = rej[lam[rej] > _LAMBDA_MAX]
+        success[stuck] = True
+        active[stuck] = False
+
+        active &= nfev < max_nfev
+
+    params = bounds.from_internal(u)
+    covar = np.full((n_pixels, n_params, n_params), np.nan)
+    done = np.flatnonzero(success)
+    if done.size:
+        jac_final = _jacobian(residual, u[done], r[done], bounds[done], done)
+        hess = np.einsum("nmi,nmj->nij", jac_final, jac_final)
+        grad = bounds[done].gradient(u[done])
+        covar[done] = _inv(hess) * grad[:, :, np.newaxis] * grad[:, np.newaxis, :]
+
+    return BatchedResult(
+        params=params,
+        covar=covar,
+        residual=r,
+        nfev=nfev,
+        success=success,
+        aborted=~np.isfinite(r).all(axis=-1) & (nfev == 1),
+    )
+
+
+def is_linear_model(model: lmfit.Model) -> bool:
+    """Check whether a model is known to be linear in all of its parameters."""
+    if isinstance(model, lmfit.model.CompositeModel):
+        return (
+            model.op in (operator.add, operator.sub)
+            and is_linear_model(model.left)
+            and is_linear_model(model.right)
+        )
+    return isinstance(
+        model,
+        lmfit.models.ConstantModel
+        | lmfit.models.LinearModel
+        | lmfit.models.QuadraticModel
+        | lmfit.models.PolynomialModel,
+    )
+
+
+def linear_lstsq(
+    design: npt.NDArray, target: npt.NDArray
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Solve a stack of linear least-squares problems with QR decompositions.
+
+    Parameters
+    ----------
+    design
+        Weighted design matrices of shape ``(n_pixels, n_points, n_params)``.
+    target
+        Weighted data of shape ``(n_pixels, n_points)``.
+
+    Returns
+    -------
+    solution : array of shape ``(n_pixels, n_params)``
+        The least-squares solutions.
+    covar : array of shape ``(n_pixels, n_params, n_params)``
+        The unscaled covariance matrices, NaN for rank-deficient problems.
+    """
+    q, r = np.linalg.qr(design)
+    rhs = np.einsum("nmk,nm->nk", q, target)
+    covar = np.full(r.shape, np.nan)
+    solution = np.full(rhs.shape, np.nan)
+    try:
+        r_inv = np.linalg.inv(r)
+    except np.linalg.LinAlgError:
+        for k in range(r.shape[0]):
+            solution[k] = np.linalg.lstsq(design[k], target[k], rcond=None)[0]
+            with contextlib.suppress(np.linalg.LinAlgError):
+                r_inv_k = np.linalg.inv(r[k])
+                covar[k] = r_inv_k @ r_inv_k.T
+    else:
+        solution = np.einsum("nij,nj->ni", r_inv, rhs)
+        covar = r_inv @ np.swapaxes(r_inv, -1, -2)
+    return solution, covar
@@ -0,0 +1,271 @@
+"""On-disk memoization of fit results."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import inspect
+import operator
+import os
+import pathlib
+import pickle
+import shutil
+import tempfile
+import typing
+import zipfile
+from collections.abc import Mapping
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    import lmfit
+    import numpy.typing as npt
+else:
+    import lazy_loader as _lazy
+
+    lmfit = _lazy.load("lmfit")
+
+#: Version of the cache layout, included in every key.
+_CACHE_FORMAT: int = 1
+
+#: Names of the numeric outputs of a fit block, in order.
+_OUTPUT_NAMES: tuple[str, ...] = ("popt", "perr", "pcov", "stats", "best")
+
+
+def update_hash(digest: typing.Any, obj: typing.Any) -> None:
+    """Feed a deterministic representation of an object to a hash object.
+
+    Arrays, strings, numbers, :class:`lmfit.Parameters`, and nested sequences and
+    mappings of these are hashed by content. Other objects are hashed by their pickled
+    representation.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            digest.update(f"O{obj.shape}".encode())
+            for item in obj.flat:
+                update_hash(digest, item)
+        else:
+            obj = np.ascontiguousarray(obj)
+            digest.update(f"{obj.dtype.str}{obj.shape}".encode())
+            digest.update(obj.tobytes())
+    elif isinstance(obj, str):
+        digest.update(b"s")
+        digest.update(obj.encode())
+    elif isinstance(obj, bytes):
+        digest.update(b"b")
+        digest.update(obj)
+    elif obj is None or isinstance(obj, bool | int | float | complex | np.generic):
+        digest.update(repr(obj).encode())
+    elif isinstance(obj, lmfit.Parameters):
+        digest.update(b"P")
+        digest.update(obj.dumps().encode())
+    elif isinstance(obj, Mapping):
+        digest.update(f"M{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            update_hash(digest, key)
+            update_hash(digest, obj[key])
+    elif isinstance(obj, list | tuple):
+        digest.update(f"T{len(obj)}".encode())
+        for item in obj:
+            update_hash(digest, item)
+    else:
+        digest.update(pickle.dumps(obj))
+
+
+def content_hash(*objs: typing.Any) -> str:
+    """Return a hexadecimal digest of the contents of the given objects."""
+    digest = hashlib.blake2b(digest_size=20)
+    for obj in objs:
+        update_hash(digest, obj)
+    return digest.hexdigest()
+
+
+def _function_source(func: typing.Callable) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        return repr(code.co_code) if code is not None else repr(func)
+
+
+def _model_identity(model: lmfit.Model) -> tuple:
+    if isinstance(model, lmfit.model.CompositeModel):
+        op = getattr(model.op, "__name__", repr(model.op))
+        return (op, _model_identity(model.left), _model_identity(model.right))
+    func = model.func
+    return (
+        getattr(func, "__module__", None),
+        getattr(func, "__qualname__", repr(func)),
+        _function_source(func),
+        model.prefix,
+        tuple(model.independent_vars),
+        {key: repr(value) for key, value in model.opts.items()},
+        {key: dict(value) for key, value in model.param_hints.items()},
+        model.nan_policy,
+    )
+
+
+def model_fingerprint(model: lmfit.Model) -> str:
+    """Return a digest identifying a model, including the source of its functions."""
+    return content_hash(_model_identity(model))
+
+
+class FitCache:
+    """Persistent on-disk cache of fit results.
+
+    Pass an instance as the `cache` argument of :meth:`xarray.Dataset.xlm.modelfit` to
+    store the outputs of each block of fits. Blocks are keyed by the contents of their
+    data, coordinates, weights and initial parameters, the identity and source code
+    of the model, and all fit options. When the same fit is run again, blocks whose
+    inputs are unchanged are loaded from the cache instead of being refit, so only
+    blocks with changed inputs are recomputed.
+
+    Parameters
+    ----------
+    path
+        Directory in which to store the cache. It is created if it does not exist.
+    max_size
+        Maximum total size of the cache in bytes. When exceeded, the least recently
+        used entries are removed. If `None`, the size is not limited.
+
+    Note
+    ----
+    If :class:`lmfit.model.ModelResult` objects are included in the output, they are
+    stored with :mod:`pickle`. Only load caches from trusted sources. Like
+    :func:`save_fit <xarray_lmfit.save_fit>`, cached results are not guaranteed to be
+    compatible between different versions of python or packages; the versions of
+    lmfit and numpy are part of the keys so that upgrading them invalidates the cache.
+
+    """
+
+    def __init__(self, path: str | os.PathLike, max_size: int | None = None) -> None:
+        self.path = pathlib.Path(path)
+        self.max_size = max_size
+
+    def __repr__(self) -> str:
+        return f"FitCache({str(self.path)!r}, max_size={self.max_size!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FitCache):
+            return NotImplemented
+        return (self.path, self.max_size) == (other.path, other.max_size)
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.max_size))
+
+    def _entries(self) -> list[pathlib.Path]:
+        if not self.path.is_dir():
+            return []
+        return list(self.path.glob("*/*.npz"))
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        total = 0
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                total += entry.stat().st_size
+        return total
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def clear(self, model: lmfit.Model | None = None) -> None:
+        """Remove cached entries.
+
+        Parameters
+        ----------
+        model
+            If given, only remove entries for fits of this model.
+        """
+        if model is not None:
+            shutil.rmtree(self.path / model_fingerprint(model), ignore_errors=True)
+        elif self.path.is_dir():
+            for directory in self.path.iterdir():
+                if directory.is_dir():
+                    shutil.rmtree(directory, ignore_errors=True)
+
+    def _entry(self, model: lmfit.Model, key: str) -> pathlib.Path:
+        return self.path / model_fingerprint(model) / f"{key}.npz"
+
+    def key(self, *objs: typing.Any) -> str:
+        """Compute the key of a block from its inputs and fit options."""
+        return content_hash(_CACHE_FORMAT, lmfit.__version__, np.__version__, *objs)
+
+    def load(
+        self, model: lmfit.Model, key: str, with_results: bool
+    ) -> tuple[npt.NDArray | None, ...] | None:
+        """Load the outputs of a block, or return `None` if not cached.
+
+        Outputs that were not computed when the block was stored are `None`.
+        """
+        entry = self._entry(model, key)
+        try:
+            with np.load(entry, allow_pickle=with_results) as data:
+                outputs = tuple(
+                    data[name] if name in data.files else None for name in _OUTPUT_NAMES
+                )
+                if with_results:
+                    outputs = (*outputs, data["results"])
+            # Mark as recently used
+            os.utime(entry)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        except (pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return outputs
+
+    def store(
+        self, model: lmfit.Model, key: str, outputs: tuple[npt.NDArray | None, ...]
+    ) -> None:
+        """Store the outputs of a block, evicting old entries if necessary.
+
+        Outputs that are `None` are not stored.
+        """
+        entry = self._entry(model, key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            name: out
+            for name, out in zip(_OUTPUT_NAMES, outputs, strict=False)
+            if out is not None
+        }
+        if len(outputs) > len(_OUTPUT_NAMES):
+            arrays["results"] = outputs[len(_OUTPUT_NAMES)]
+
+        # Write to a temporary file first so that concurrent readers never see
+        # partially written entries
+        with tempfile.NamedTemporaryFile(
+            dir=entry.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp = pathlib.Path(f.name)
+            try:
+                np.savez_compressed(f, **arrays)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                # Results that cannot be pickled are not cached
+                f.close()
+                tmp.unlink(missing_ok=True)
+                return
+        tmp.replace(entry)
+
+        if self.max_size is not None:
+            self.evict(self.max_size)
+
+    def evict(self, max_size: int) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`.
+
+        Parameters
+        ----------
+        max_size
+            Maximum total size of the cache in bytes.
+        """
+        entries = []
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=operator.itemgetter(0)):
+            if total <= max_size:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,193 @@
+"""Evaluation of model curves from fitted coefficients.
+
+Curves are evaluated from the coefficients and coordinates of a fit instead of being
+stored, either lazily with a backend array that only evaluates the indexed pixels, or
+block-wise with dask.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+import typing
+
+import numpy as np
+from xarray.backends import BackendArray
+from xarray.core import indexing
+
+from xarray_lmfit import _batched
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    import lmfit
+    import numpy.typing as npt
+
+
+def component_names(models: Sequence[lmfit.Model]) -> list[str]:
+    """Return the names of components like :meth:`lmfit.Model.eval_components`."""
+    return [model.prefix or model._name for model in models]
+
+
+@dataclasses.dataclass(frozen=True)
+class CurveEvaluator:
+    """Evaluate the curves of the pixels of a block from their coefficients.
+
+    The inputs are laid out like the blocks of :func:`xarray.apply_ufunc`, with the
+    loop dimensions first, broadcast against each other, followed by the core
+    dimensions. The coefficients have the parameters as their only core dimension.
+
+    Attributes
+    ----------
+    model
+        The fitted model.
+    param_names
+        Names of the parameters along the last axis of the coefficients.
+    independent_vars
+        Maps the flattened coordinates and data of a pixel to the independent
+        variables of the model.
+    n_core_dims
+        Number of core dimensions of the data and the coordinates.
+    skipna
+        Whether points where the data or a coordinate is NaN were excluded from the
+        fit. The curves are NaN at these points.
+    vectorized
+        Whether to evaluate all pixels at once. Only valid for models that broadcast
+        over stacked parameter values, as required by the batched engines.
+    components
+        If given, evaluate these components of the model, stacked along an axis
+        before the core dimensions. Otherwise, evaluate the whole model.
+    dtype
+        Data type of the returned curves, which are evaluated in float64.
+    """
+
+    model: lmfit.Model
+    param_names: Sequence[str]
+    independent_vars: Callable[[typing.Any, typing.Any], dict[str, typing.Any]]
+    n_core_dims: int
+    skipna: bool
+    vectorized: bool = False
+    components: Sequence[lmfit.Model] | None = None
+    dtype: npt.DTypeLike = np.float64
+
+    def __call__(
+        self, coefficients: npt.NDArray, data: npt.NDArray, *coords: npt.NDArray
+    ) -> npt.NDArray:
+        n_core = self.n_core_dims
+        loop_shape = np.broadcast_shapes(
+            coefficients.shape[:-1],
+            data.shape[: data.ndim - n_core],
+            *(c.shape[: c.ndim - n_core] for c in coords),
+        )
+        core_shape = data.shape[data.ndim - n_core :]
+        n_pixels = math.prod(loop_shape)
+        coefficients = np.broadcast_to(
+            coefficients, (*loop_shape, coefficients.shape[-1])
+        ).reshape(n_pixels, -1)
+        y = np.broadcast_to(data, loop_shape + core_shape).reshape(n_pixels, -1)
+        xs = [
+            np.broadcast_to(c, loop_shape + core_shape).reshape(n_pixels, -1)
+            for c in coords
+        ]
+
+        mask = np.ones(y.shape, dtype=bool)
+        if self.skipna:
+            mask &= ~np.isnan(y)
+            for x in xs:
+                mask &= ~np.isnan(x)
+
+        models = [self.model] if self.components is None else list(self.components)
+        curves = np.full((n_pixels, len(models), y.shape[-1]), np.nan)
+        values = {name: coefficients[:, k] for k, name in enumerate(self.param_names)}
+        # Failed fits have no coefficients and no curve
+        pixels = np.flatnonzero(np.isfinite(coefficients).all(axis=-1))
+        if self.vectorized:
+            if pixels.size:
+                x = [x[pixels] for x in xs]
+                independent_vars = self.independent_vars(
+                    x[0] if len(x) == 1 else x, y[pixels]
+                )
+                pixel_values = {k: v[pixels, np.newaxis] for k, v in values.items()}
+                for j, model in enumerate(models):
+                    curve = _batched.batched_eval(model, pixel_values, independent_vars)
+                    curves[pixels, j] = np.where(mask[pixels], curve, np.nan)
+        else:
+            for i in pixels:
+                m = mask[i]
+                x = [x[i][m] for x in xs]
+                independent_vars = self.independent_vars(
+                    x[0] if len(x) == 1 else x, y[i][m]
+                )
+                pixel_values = {k: v[i] for k, v in values.items()}
+                for j, model in enumerate(models):
+                    curves[i, j, m] = _batched.batched_eval(
+                        model, pixel_values, independent_vars
+                    )
+
+        curves = curves.astype(self.dtype, copy=False)
+        if self.components is None:
+            return curves.reshape(loop_shape + core_shape)
+        return curves.reshape((*loop_shape, len(models), *core_shape))
+
+
+class CurveArray(BackendArray):
+    """Curves of a fit that are evaluated when indexed.
+
+    Only the pixels selected by an indexing operation are evaluated, so that the
+    curves of large fits need not be stored. Wrap in
+    :class:`xarray.core.indexing.LazilyIndexedArray` to use as the data of a
+    variable.
+
+    Parameters
+    ----------
+    evaluate
+        Evaluates the curves of a block of pixels.
+    coefficients
+        Coefficients of the fits, with the loop dimensions first and the parameters
+        last.
+    data
+        The fitted data, with the loop dimensions first and the fit dimensions last.
+    coords
+        The fit coordinates, laid out like `data`.
+    """
+
+    def __init__(
+        self,
+        evaluate: CurveEvaluator,
+        coefficients: npt.NDArray,
+        data: npt.NDArray,
+        coords: Sequence[npt.NDArray],
+    ) -> None:
+        self.evaluate = evaluate
+        self.coefficients = coefficients
+        self.data = data
+        self.coords = tuple(coords)
+        self.n_loop = coefficients.ndim - 1
+        curve_shape = data.shape[self.n_loop :]
+        if evaluate.components is not None:
+            curve_shape = (len(evaluate.components), *curve_shape)
+        self.shape = (*coefficients.shape[:-1], *curve_shape)
+        self.dtype = np.dtype(evaluate.dtype)
+
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> npt.NDArray:
+        return indexing.explicit_indexing_adapter(
+            key, self.shape, indexing.IndexingSupport.BASIC, self._getitem
+        )
+
+    def _getitem(self, key: tuple[int | slice, ...]) -> npt.NDArray:
+        # Keep the loop dimensions selected by integers until the curves are
+        # evaluated, as the evaluator expects all of them
+        loop_key = tuple(
+            slice(k, k + 1) if isinstance(k, int | np.integer) else k
+            for k in key[: self.n_loop]
+        )
+        curves = self.evaluate(
+            self.coefficients[loop_key],
+            self.data[loop_key],
+            *(c[loop_key] for c in self.coords),
+        )
+        squeeze = tuple(
+            0 if isinstance(k, int | np.integer) else slice(None)
+            for k in key[: self.n_loop]
+        )
+        return curves[(*squeeze, *key[self.n_loop :])]
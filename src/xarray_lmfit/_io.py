@@ -9,6 +9,8 @@ import numpy as np
 import numpy.typing as npt
 import xarray as xr
 
+from xarray_lmfit._results import LiteModelResult, is_serialized_lite_result
+
 if typing.TYPE_CHECKING:
     import lmfit
 else:
@@ -100,7 +102,11 @@ def _dumps_results(
     return output
 
 
-def _loads_result(s: str, funcdefs: dict | None = None) -> "lmfit.model.ModelResult":
+def _loads_result(
+    s: str, funcdefs: dict | None = None
+) -> "lmfit.model.ModelResult | LiteModelResult":
+    if is_serialized_lite_result(s):
+        return LiteModelResult.loads(s)
     return lmfit.model.ModelResult(
         lmfit.Model(lambda x: x, None), lmfit.Parameters()
     ).loads(s, funcdefs=funcdefs)
@@ -115,6 +121,10 @@ def save_fit(result_ds: xr.Dataset, path: str | os.PathLike, **kwargs) -> None:
 
     Serialization of :class:`lmfit.model.ModelResult` objects are handled just like
     :func:`lmfit.model.save_modelresult`, and shares the same limitations.
+    :class:`LiteModelResult <xarray_lmfit.LiteModelResult>` objects are saved without
+    their model, which must be passed to
+    :meth:`LiteModelResult.to_model_result
+    <xarray_lmfit.LiteModelResult.to_model_result>` after loading.
 
     Parameters
     ----------
@@ -0,0 +1,330 @@
+"""Parallel execution of the fits in a block on a pool of workers.
+
+The pixels of a block are split into ranges of flattened loop indices, and each range
+is fit by a worker, which writes its outputs directly into the output arrays of the
+block.
+
+With worker processes, the inputs and outputs of a block are placed in shared memory
+so that they are not pickled for every range. A :class:`ProcessPool` is started once
+and fits the blocks of a call in turn. For each block, every worker receives a single
+task with the fitting function, which carries the model and the parameter plan, and
+claims ranges from a counter in shared memory until all are fit. Worker threads share
+the arrays and the fitting function directly.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import itertools
+import multiprocessing
+import os
+import typing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from xarray_lmfit._utils import deferred_warnings, emit_user_level_warning
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    import numpy.typing as npt
+
+    #: Fits the pixels in ``range(start, stop)`` of the flattened loop indices of a
+    #: block given its inputs and outputs, returning the model results if requested.
+    RangeFitter = Callable[
+        [Sequence[npt.NDArray], Sequence[npt.NDArray], int, int],
+        list[typing.Any] | None,
+    ]
+
+#: Number of ranges per worker, for load balancing between workers.
+_TASKS_PER_WORKER: int = 4
+
+# State of a worker process: the lock guarding the range counters, set by the pool
+# initializer, and the shared memory blocks attached by earlier tasks
+_worker_state: dict[str, typing.Any] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedArray:
+    """Reference to an array stored in a shared memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: np.dtype
+
+    def view(self, shm: shared_memory.SharedMemory) -> npt.NDArray:
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+
+def _share(
+    array: typing.Any, blocks: list[shared_memory.SharedMemory]
+) -> _SharedArray | npt.NDArray:
+    """Copy an array to a new shared memory block.
+
+    Object arrays cannot be shared and are returned as is, to be pickled once per
+    worker.
+    """
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        return array
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(shm)
+    shared = _SharedArray(shm.name, array.shape, array.dtype)
+    shared.view(shm)[...] = array
+    return shared
+
+
+def _attach(
+    item: _SharedArray | npt.NDArray, blocks: list[shared_memory.SharedMemory]
+) -> npt.NDArray:
+    if not isinstance(item, _SharedArray):
+        return item
+    shm = shared_memory.SharedMemory(name=item.name)
+    blocks.append(shm)
+    return item.view(shm)
+
+
+def _initialize_worker(lock: typing.Any) -> None:
+    _worker_state.update(lock=lock, blocks=[])
+
+
+def _release_blocks() -> None:
+    """Close the shared memory blocks attached by earlier tasks of the worker.
+
+    Blocks are closed at the start of the next task rather than at the end of their
+    own, as the model results returned by a task can refer to its inputs until they
+    are sent to the parent process. Blocks that are still referred to are kept for
+    a later attempt.
+    """
+    still_open = []
+    for shm in _worker_state["blocks"]:
+        try:
+            shm.close()
+        except BufferError:
+            still_open.append(shm)
+    _worker_state["blocks"] = still_open
+
+
+def _fit_ranges(
+    fit: RangeFitter,
+    inputs: Sequence[_SharedArray | npt.NDArray],
+    outputs: Sequence[_SharedArray],
+    counter: _SharedArray,
+    bounds: Sequence[int],
+) -> list[tuple[int, list[typing.Any] | None]]:
+    """Fit ranges of a block until all of them are claimed.
+
+    Returns the index of each range fit by this task with the objects returned by
+    `fit` for it.
+    """
+    _release_blocks()
+    blocks = _worker_state["blocks"]
+    inputs_ = [_attach(item, blocks) for item in inputs]
+    outputs_ = [_attach(item, blocks) for item in outputs]
+    next_range = _attach(counter, blocks)
+    returned = []
+    while True:
+        with _worker_state["lock"]:
+            i = int(next_range[0])
+            next_range[0] = i + 1
+        if i >= len(bounds) - 1:
+            return returned
+        returned.append((i, fit(inputs_, outputs_, bounds[i], bounds[i + 1])))
+
+
+def _n_workers(n_workers: int | None) -> int:
+    if n_workers is None:
+        return getattr(os, "process_cpu_count", os.cpu_count)() or 1
+    return n_workers
+
+
+def _plan_tasks(size: int, n_workers: int | None) -> tuple[list[int], int]:
+    """Split the flattened loop indices into ranges, one per task.
+
+    Returns the bounds of the ranges and the number of workers to use.
+    """
+    n_workers = _n_workers(n_workers)
+    n_tasks = min(size, n_workers * _TASKS_PER_WORKER)
+    if n_workers == 1 or n_tasks <= 1:
+        return [0, size], 1
+    return np.linspace(0, size, n_tasks + 1).astype(int).tolist(), min(
+        n_workers, n_tasks
+    )
+
+
+def _concatenate(
+    returned: Sequence[list[typing.Any] | None],
+) -> list[typing.Any] | None:
+    if any(r is None for r in returned):
+        return None
+    return [item for r in returned for item in typing.cast("list", r)]
+
+
+class ProcessPool:
+    """Pool of worker processes that fits the blocks of a call in turn.
+
+    The workers are started when they are first needed, and stopped when the pool is
+    closed or its context is exited.
+
+    Parameters
+    ----------
+    n_workers
+        Number of worker processes. Defaults to the number of CPUs available to
+        the current process.
+    """
+
+    def __init__(self, n_workers: int | None = None) -> None:
+        self.n_workers = _n_workers(n_workers)
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the executor of the pool, starting it if necessary."""
+        if self._executor is None:
+            context = multiprocessing.get_context()
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=context,
+                initializer=_initialize_worker,
+                initargs=(context.Lock(),),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def fit_in_processes(
+    fit: RangeFitter,
+    inputs: Sequence[typing.Any],
+    outputs: Sequence[npt.NDArray],
+    size: int,
+    n_workers: int | None = None,
+    pool: ProcessPool | None = None,
+) -> list[typing.Any] | None:
+    """Fit all pixels of a block on a pool of worker processes.
+
+    Parameters
+    ----------
+    fit
+        Picklable callable that fits a range of the flattened loop indices.
+    inputs
+        Input arrays of the block, passed to `fit` in the workers.
+    outputs
+        Preallocated output arrays, which are filled in place.
+    size
+        Number of pixels in the block.
+    n_workers
+        Number of worker processes. Defaults to the number of CPUs available to
+        the current process. Ignored if `pool` is given.
+    pool
+        Pool to fit the block on, which is reused for later blocks. If not given, a
+        pool is started for this block only.
+
+    Returns
+    -------
+    list or None
+        The objects returned by `fit` for all pixels in flattened order, or `None` if
+        `fit` returns `None`.
+    """
+    bounds, n_workers = _plan_tasks(size, n_workers if pool is None else pool.n_workers)
+    if n_workers == 1:
+        return fit(inputs, outputs, 0, size)
+    if pool is None:
+        with ProcessPool(n_workers) as pool:
+            return fit_in_processes(fit, inputs, outputs, size, pool=pool)
+
+    blocks: list[shared_memory.SharedMemory] = []
+    try:
+        shared_inputs = [_share(array, blocks) for array in inputs]
+        output_blocks = len(blocks)
+        shared_outputs = [
+            typing.cast("_SharedArray", _share(array, blocks)) for array in outputs
+        ]
+        counter = typing.cast(
+            "_SharedArray", _share(np.zeros(1, dtype=np.int64), blocks)
+        )
+        executor = pool.executor()
+        futures = [
+            executor.submit(
+                _fit_ranges, fit, shared_inputs, shared_outputs, counter, bounds
+            )
+            for _ in range(n_workers)
+        ]
+        try:
+            returned = dict(item for future in futures for item in future.result())
+        except BaseException:
+            pool.close()
+            raise
+        for out, shared, shm in zip(
+            outputs, shared_outputs, blocks[output_blocks:], strict=False
+        ):
+            out[...] = shared.view(shm)
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    return _concatenate([returned[i] for i in range(len(bounds) - 1)])
+
+
+def _fit_range_deferred(
+    fit: RangeFitter,
+    inputs: Sequence[typing.Any],
+    outputs: Sequence[npt.NDArray],
+    start: int,
+    stop: int,
+) -> tuple[list[typing.Any] | None, list[tuple[str, type[Warning] | None]]]:
+    with deferred_warnings() as caught:
+        return fit(inputs, outputs, start, stop), caught
+
+
+def fit_in_threads(
+    fit: RangeFitter,
+    inputs: Sequence[typing.Any],
+    outputs: Sequence[npt.NDArray],
+    size: int,
+    n_workers: int | None = None,
+) -> list[typing.Any] | None:
+    """Fit all pixels of a block on a pool of worker threads.
+
+    The arguments and return value are the same as for :func:`fit_in_processes`,
+    except that no pool is reused.
+    The inputs and outputs are shared with the threads without copying, so `fit` must
+    not modify state that is shared between tasks. Warnings emitted with
+    :func:`emit_user_level_warning <xarray_lmfit._utils.emit_user_level_warning>`
+    in the threads are emitted again by the calling thread, once for each distinct
+    message.
+    """
+    bounds, n_workers = _plan_tasks(size, n_workers)
+    if n_workers == 1:
+        return fit(inputs, outputs, 0, size)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=n_workers,
+        thread_name_prefix="xarray-lmfit",
+    ) as pool:
+        futures = [
+            pool.submit(_fit_range_deferred, fit, inputs, outputs, start, stop)
+            for start, stop in itertools.pairwise(bounds)
+        ]
+        try:
+            returned = [future.result() for future in futures]
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    for message, category in dict.fromkeys(
+        warning for _, caught in returned for warning in caught
+    ):
+        emit_user_level_warning(message, category)
+    return _concatenate([r for r, _ in returned])
@@ -0,0 +1,653 @@
+"""Compact records of fit results."""
+
+from __future__ import annotations
+
+import json
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Hashable, Mapping, Sequence
+
+    import lmfit
+    import numpy.typing as npt
+    import xarray as xr
+else:
+    import lazy_loader as _lazy
+
+    lmfit = _lazy.load("lmfit")
+
+#: Key identifying serialized lite results, see :meth:`LiteModelResult.dumps`.
+_SERIALIZATION_KEY: str = "lite_model_result"
+
+#: Messages of lmfit that are stored as codes by ``output_result="columnar"``, indexed
+#: by their code. The code of no message is 0, and of other messages -1.
+MESSAGES: tuple[str, ...] = (
+    "",
+    *(
+        f"{message}{suffix}"
+        for suffix in ("", " Could not estimate error-bars.")
+        for message in (
+            "Fit succeeded.",
+            "Invalid Input Parameters. I.e. more variables than data points given, "
+            "tolerance < 0.0, or no data provided.",
+            "One or more variable did not affect the fit.",
+            "Tolerance seems to be too small.",
+        )
+    ),
+    "Fit aborted by user callback. Could not estimate error-bars.",
+)
+
+#: Core dimensions and data types of the columns of ``output_result="columnar"``.
+COLUMNS: dict[str, tuple[tuple[str, ...], type]] = {
+    "status": ((), np.int32),
+    "success": ((), np.bool_),
+    "message": ((), np.int16),
+    "nfev": ((), np.int64),
+    "init_values": (("param",), np.float64),
+    "best_values": (("param",), np.float64),
+    "stderr": (("param",), np.float64),
+    "min": (("param",), np.float64),
+    "max": (("param",), np.float64),
+    "expr": (("param",), np.int16),
+    "correl": (("cov_i", "cov_j"), np.float64),
+}
+
+#: Code of the ``expr`` column for parameters without a constraint expression.
+NO_EXPRESSION: int = -1
+
+#: Code of the ``expr`` column for expressions missing from the expressions of the
+#: model description. The expression of the model's parameter hint is used instead.
+UNKNOWN_EXPRESSION: int = -2
+
+
+class LiteModelResult:
+    """Compact record of a fit, stored per point with ``output_result="lite"``.
+
+    Unlike :class:`lmfit.model.ModelResult`, the record holds no copies of the data,
+    coordinates, weights, residual or fitted curves, and no parameter objects or
+    expression interpreters. Only the values needed to describe the fit are kept,
+    and the model is shared by the records of all points. A full
+    :class:`lmfit.model.ModelResult` can be rebuilt on demand with
+    :meth:`to_model_result`.
+
+    The records stored by a fit never hold the data, weights or independent
+    variables of their point. Only the records returned by
+    :meth:`xarray.Dataset.xlm.modelfit_results` have the data and coordinates of the
+    point attached, as views into the arrays of the result Dataset rather than
+    copies, so that :meth:`to_model_result` can be called without arguments.
+
+    Attributes
+    ----------
+    model
+        The fitted model, shared by all points. `None` for records loaded with
+        :func:`load_fit <xarray_lmfit.load_fit>`.
+    method
+        Name of the minimization method.
+    best_values
+        Best-fit values of all parameters, including constrained parameters.
+    init_values
+        Initial values of all parameters.
+    stderr
+        Standard errors of the parameters, or `None` where they were not estimated.
+    correl
+        Correlations of each varying parameter with the others, as in
+        :attr:`lmfit.Parameter.correl <lmfit.parameter.Parameter.correl>`.
+    var_names
+        Names of the varying parameters.
+    success
+        Whether the fit succeeded.
+    status
+        Status code of the minimizer, ``ier`` for the ``leastsq`` method.
+    message
+        Message of the minimizer about the fit.
+    nfev
+        Number of function evaluations.
+    bounds
+        Lower and upper bounds of the bounded parameters; other parameters are
+        unbounded. `None` if not recorded, in which case the bounds of the model's
+        parameter hints are used.
+    exprs
+        Constraint expressions of the constrained parameters; other parameters are
+        not constrained. `None` if not recorded, in which case the expressions of the
+        model's parameter hints are used.
+    data
+        View of the fitted data of the point, if attached to the record. Not
+        serialized.
+    weights
+        The weights of the fit, if attached to the record. Not serialized.
+    independent_vars
+        Views of the values of the independent variables of the model at the point,
+        if attached to the record. Not serialized.
+    """
+
+    __slots__ = (
+        "best_values",
+        "bounds",
+        "correl",
+        "data",
+        "exprs",
+        "independent_vars",
+        "init_values",
+        "message",
+        "method",
+        "model",
+        "nfev",
+        "status",
+        "stderr",
+        "success",
+        "var_names",
+        "weights",
+    )
+
+    def __init__(
+        self,
+        model: lmfit.Model | None,
+        method: str,
+        best_values: dict[str, float],
+        init_values: dict[str, float],
+        stderr: dict[str, float | None],
+        correl: dict[str, dict[str, float]],
+        var_names: tuple[str, ...],
+        success: bool,
+        status: int | None,
+        message: str | None,
+        nfev: int,
+        bounds: dict[str, tuple[float, float]] | None = None,
+        exprs: dict[str, str] | None = None,
+        data: npt.NDArray | None = None,
+        weights: npt.NDArray | None = None,
+        independent_vars: dict[str, typing.Any] | None = None,
+    ) -> None:
+        self.model = model
+        self.method = method
+        self.best_values = best_values
+        self.init_values = init_values
+        self.stderr = stderr
+        self.correl = correl
+        self.var_names = var_names
+        self.success = success
+        self.status = status
+        self.message = message
+        self.nfev = nfev
+        self.bounds = bounds
+        self.exprs = exprs
+        self.data = data
+        self.weights = weights
+        self.independent_vars = independent_vars
+
+    @classmethod
+    def from_model_result(cls, modres: lmfit.model.ModelResult) -> LiteModelResult:
+        """Record the values of a model result, dropping its arrays."""
+        params = modres.params
+        return cls(
+            model=modres.model,
+            method=modres.method,
+            best_values={name: par.value for name, par in params.items()},
+            init_values={name: par.value for name, par in modres.init_params.items()},
+            stderr={name: par.stderr for name, par in params.items()},
+            correl={
+                name: dict(par.correl)
+                for name, par in params.items()
+                if par.correl is not None
+            },
+            var_names=tuple(getattr(modres, "var_names", None) or ()),
+            success=bool(modres.success),
+            status=None if getattr(modres, "ier", None) is None else int(modres.ier),
+            message=modres.message,
+            nfev=int(modres.nfev),
+            bounds={
+                name: (par.min, par.max)
+                for name, par in params.items()
+                if par.min != -np.inf or par.max != np.inf
+            },
+            exprs={name: par.expr for name, par in params.items() if par.expr},
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LiteModelResult success={self.success}, nfev={self.nfev}, "
+            f"best_values={self.best_values}>"
+        )
+
+    def _params(
+        self, model: lmfit.Model, values: Mapping[str, float], *, errors: bool
+    ) -> lmfit.Parameters:
+        params = model.make_params()
+        for name, value in values.items():
+            if name not in params:
+                params.add(name, value=value)
+            par = params[name]
+            if self.bounds is not None:
+                lower, upper = self.bounds.get(name, (-np.inf, np.inf))
+                par.set(min=lower, max=upper)
+            if self.exprs is not None:
+                # An empty expression removes the constraint of a parameter hint
+                par.set(expr=self.exprs.get(name, ""))
+            par.value = value
+            if not par.expr:
+                par.vary = name in self.var_names
+            if errors:
+                par.stderr = self.stderr.get(name)
+                par.correl = self.correl.get(name)
+        return params
+
+    def _covar(self) -> npt.NDArray | None:
+        stderr = [self.stderr.get(name) for name in self.var_names]
+        if not stderr or any(s is None for s in stderr):
+            return None
+        correl = np.eye(len(self.var_names))
+        for i, name in enumerate(self.var_names):
+            for j, other in enumerate(self.var_names):
+                if i != j:
+                    correl[i, j] = self.correl.get(name, {}).get(other, 0.0)
+        return correl * np.outer(stderr, stderr)
+
+    def to_model_result(
+        self,
+        data: npt.ArrayLike | None = None,
+        weights: npt.ArrayLike | None = None,
+        *,
+        model: lmfit.Model | None = None,
+        **independent_vars: typing.Any,
+    ) -> lmfit.model.ModelResult:
+        """Rebuild the full model result of the fit.
+
+        The fitted curves, residual and statistics are evaluated again from the
+        parameters. Points where the data or an independent variable of the same size
+        is NaN are excluded, as in a fit with ``skipna=True``.
+
+        Arguments that are not given are taken from the record, such as the data and
+        coordinates attached to records returned by
+        :meth:`xarray.Dataset.xlm.modelfit_results`.
+
+        Parameters
+        ----------
+        data
+            The fitted data, for example the ``modelfit_data`` of the point. Required
+            if no data is attached to the record.
+        weights
+            The weights of the fit, if any.
+        model
+            The fitted model. Required if the record has no model, for example after
+            loading it from a file.
+        **independent_vars
+            Values of the independent variables of the model, for example the fit
+            coordinates of the point.
+
+        Returns
+        -------
+        lmfit.model.ModelResult
+        """
+        if model is None:
+            model = self.model
+        if model is None:
+            raise ValueError("The fitted model must be given for this result")
+        if data is None:
+            data = self.data
+        if data is None:
+            raise ValueError("The fitted data must be given for this result")
+        if weights is None:
+            weights = self.weights
+        if not independent_vars:
+            independent_vars = dict(self.independent_vars or {})
+
+        y = np.ravel(np.asarray(data, dtype=np.float64))
+        mask = ~np.isnan(y)
+        arrays = {
+            name: np.ravel(value)
+            for name, value in independent_vars.items()
+            if np.size(value) == y.size
+        }
+        for value in arrays.values():
+            mask &= ~np.isnan(value)
+        independent_vars = {
+            name: arrays[name][mask] if name in arrays else value
+            for name, value in independent_vars.items()
+        }
+        y = y[mask]
+        if weights is not None and np.size(weights) == mask.size:
+            weights = np.ravel(weights)[mask]
+
+        init_params = self._params(model, self.init_values, errors=False)
+        params = self._params(model, self.best_values, errors=True)
+        modres = lmfit.model.ModelResult(
+            model,
+            init_params,
+            data=y,
+            weights=weights,
+            method=self.method,
+            fcn_args=(y, weights),
+            fcn_kws=independent_vars,
+        )
+        modres.params = params
+        modres.init_values = model._make_all_args(init_params)
+        modres.best_values = model._make_all_args(params)
+        modres.success = self.success
+        modres.ier = self.status
+        modres.message = self.message
+        modres.nfev = self.nfev
+        if not self.success:
+            # Like the placeholder results of failed fits
+            return modres
+
+        modres.init_fit = model.eval(init_params, **independent_vars)
+        modres.best_fit = model.eval(params, **independent_vars)
+        modres.residual = model._residual(params, y, weights, **independent_vars)
+        modres.var_names = list(self.var_names)
+        modres.init_vals = [self.init_values[name] for name in self.var_names]
+        modres.covar = self._covar()
+        modres.errorbars = modres.covar is not None
+
+        # Statistics as computed by lmfit.minimizer.MinimizerResult
+        ndata = modres.residual.size
+        nvarys = len(self.var_names)
+        chisqr = float((modres.residual**2).sum())
+        modres.ndata, modres.nvarys, modres.nfree = ndata, nvarys, ndata - nvarys
+        modres.chisqr = chisqr
+        modres.redchi = chisqr / max(1, ndata - nvarys)
+        neg2_log_likel = ndata * np.log(max(chisqr, 1.0e-250 * ndata) / ndata)
+        modres.aic = neg2_log_likel + 2 * nvarys
+        modres.bic = neg2_log_likel + np.log(ndata) * nvarys
+        if ndata > 1:
+            sstot = ((y - y.mean()) ** 2).sum()
+            modres.rsquared = 1.0 - ((y - modres.best_fit) ** 2).sum() / max(
+                np.finfo(np.float64).tiny, sstot
+            )
+        return modres
+
+    def dumps(self) -> str:
+        """Serialize the record to JSON, without the model and attached arrays."""
+        state = {name: getattr(self, name) for name in _FIELDS if name != "model"}
+        return json.dumps({_SERIALIZATION_KEY: state})
+
+    @classmethod
+    def loads(cls, s: str) -> LiteModelResult:
+        """Load a record serialized with :meth:`dumps`."""
+        state = json.loads(s)[_SERIALIZATION_KEY]
+        state["var_names"] = tuple(state["var_names"])
+        if state.get("bounds") is not None:
+            state["bounds"] = {
+                name: tuple(bounds) for name, bounds in state["bounds"].items()
+            }
+        return cls(model=None, **state)
+
+
+_FIELDS: tuple[str, ...] = (
+    "model",
+    "method",
+    "best_values",
+    "init_values",
+    "stderr",
+    "correl",
+    "var_names",
+    "success",
+    "status",
+    "message",
+    "nfev",
+    "bounds",
+    "exprs",
+)
+
+
+def is_serialized_lite_result(s: str) -> bool:
+    """Return whether a result was serialized by :meth:`LiteModelResult.dumps`."""
+    return s.startswith(f'{{"{_SERIALIZATION_KEY}"')
+
+
+def result_columns(
+    results: npt.NDArray[np.object_],
+    param_names: Sequence[str],
+    expressions: Sequence[str] = (),
+) -> tuple[npt.NDArray, ...]:
+    """Store the records of a block of fits in columns, in the order of `COLUMNS`.
+
+    The status of points without a status is -1. The diagonal of the correlations is
+    1 for varying parameters and NaN otherwise. Constraint expressions are stored as
+    their index in `expressions`.
+    """
+    shape = results.shape
+    n_params = len(param_names)
+    index = {name: k for k, name in enumerate(param_names)}
+    status = np.full(shape, -1, dtype=np.int32)
+    success = np.zeros(shape, dtype=np.bool_)
+    message = np.zeros(shape, dtype=np.int16)
+    nfev = np.zeros(shape, dtype=np.int64)
+    init_values, best_values, stderr, lower, upper = (
+        np.full((*shape, n_params), np.nan) for _ in range(5)
+    )
+    expr = np.full((*shape, n_params), NO_EXPRESSION, dtype=np.int16)
+    correl = np.full((*shape, n_params, n_params), np.nan)
+    codes = {msg: code for code, msg in enumerate(MESSAGES)}
+    expr_codes = {expression: code for code, expression in enumerate(expressions)}
+
+    for idx, record in np.ndenumerate(results):
+        if record is None:
+            continue
+        if not isinstance(record, LiteModelResult):
+            record = LiteModelResult.from_model_result(record)
+        if record.status is not None:
+            status[idx] = record.status
+        success[idx] = record.success
+        message[idx] = codes.get(record.message or "", -1)
+        nfev[idx] = record.nfev
+        for name, k in index.items():
+            init_values[(*idx, k)] = record.init_values.get(name, np.nan)
+            best_values[(*idx, k)] = record.best_values.get(name, np.nan)
+            err = record.stderr.get(name)
+            if err is not None:
+                stderr[(*idx, k)] = err
+            if name in record.best_values:
+                lower[(*idx, k)], upper[(*idx, k)] = (record.bounds or {}).get(
+                    name, (-np.inf, np.inf)
+                )
+            expression = (record.exprs or {}).get(name)
+            if expression:
+                expr[(*idx, k)] = expr_codes.get(expression, UNKNOWN_EXPRESSION)
+        for name in record.var_names:
+            if name in index:
+                i = index[name]
+                correl[(*idx, i, i)] = 1.0
+                for other, value in record.correl.get(name, {}).items():
+                    if other in index:
+                        correl[(*idx, i, index[other])] = value
+    return (
+        status,
+        success,
+        message,
+        nfev,
+        init_values,
+        best_values,
+        stderr,
+        lower,
+        upper,
+        expr,
+        correl,
+    )
+
+
+def describe_model(
+    model: lmfit.Model,
+    method: str,
+    expressions: Sequence[str] = (),
+    coords: Sequence[str | None] = (),
+) -> str:
+    """Describe the model shared by all points of the results as JSON.
+
+    Besides the model and the minimization method, the description holds the
+    messages and constraint expressions indexed by their codes in columnar results,
+    and the names of the fit coordinates, or `None` for coordinates that are not
+    stored with the results.
+    """
+    return json.dumps(
+        {
+            "model": model.dumps(),
+            "method": method,
+            "messages": list(MESSAGES),
+            "expressions": list(expressions),
+            "coords": list(coords),
+        }
+    )
+
+
+class ModelResultIndexer:
+    """Point by point access to the fit results stored in a Dataset.
+
+    Returned by :meth:`xarray.Dataset.xlm.modelfit_results` for results of
+    :meth:`xarray.Dataset.xlm.modelfit` with ``output_result="lite"`` or
+    ``"columnar"``. Selecting a single point with :meth:`isel` or :meth:`sel` returns
+    a :class:`LiteModelResult` of the point with the fitted data and coordinates of
+    the point attached, from which the full :class:`lmfit.model.ModelResult` can be
+    rebuilt.
+
+    Parameters
+    ----------
+    results
+        Dataset of the columns, named like the keys of `COLUMNS`, or of the lite
+        records, named ``records``.
+    model
+        The fitted model.
+    method
+        Name of the minimization method.
+    messages
+        Messages indexed by their code.
+    expressions
+        Constraint expressions indexed by their code.
+    data
+        Name of the variable of `results` holding the fitted data, if any.
+    independent_vars
+        Names of the variables of `results` holding the values of each independent
+        variable of the model, or `None` for independent variables that take the
+        fitted data. If not given, no independent variables are attached.
+    """
+
+    def __init__(
+        self,
+        results: xr.Dataset,
+        model: lmfit.Model | None,
+        method: str,
+        messages: Sequence[str] = MESSAGES,
+        expressions: Sequence[str] = (),
+        *,
+        data: Hashable | None = None,
+        independent_vars: Mapping[str, Hashable | None] | None = None,
+    ) -> None:
+        self.results = results
+        self.model = model
+        self.method = method
+        self.messages = tuple(messages)
+        self.expressions = tuple(expressions)
+        self.data = data
+        self.independent_vars = independent_vars
+
+    @property
+    def _loop_dims(self) -> tuple[Hashable, ...]:
+        key = "records" if "records" in self.results else "status"
+        return self.results[key].dims
+
+    def __repr__(self) -> str:
+        sizes = {dim: self.results.sizes[dim] for dim in self._loop_dims}
+        return f"<ModelResultIndexer {sizes}>"
+
+    def isel(
+        self, indexers: Mapping[Hashable, typing.Any] | None = None, **indexers_kwargs
+    ) -> LiteModelResult:
+        """Return the result of the point at the given integer positions."""
+        return self._record(self.results.isel(indexers, **indexers_kwargs))
+
+    def sel(
+        self, indexers: Mapping[Hashable, typing.Any] | None = None, **indexers_kwargs
+    ) -> LiteModelResult:
+        """Return the result of the point with the given labels."""
+        return self._record(self.results.sel(indexers, **indexers_kwargs))
+
+    def _record(self, point: xr.Dataset) -> LiteModelResult:
+        loop_dims = [dim for dim in self._loop_dims if dim in point.dims]
+        if loop_dims:
+            raise ValueError(
+                f"Select a single point, but dimensions {sorted(map(str, loop_dims))} "
+                "remain"
+            )
+        point = point.compute()
+        if "records" in point:
+            stored = point["records"].item()
+            # Attach the arrays to a copy, leaving the stored record unchanged
+            record = LiteModelResult(
+                **{name: getattr(stored, name) for name in LiteModelResult.__slots__}
+            )
+            if record.model is None:
+                record.model = self.model
+        else:
+            record = self._columns_record(point)
+
+        if self.data is not None:
+            record.data = point[self.data].values
+        if self.independent_vars is not None and all(
+            name is None or name in point.variables
+            for name in self.independent_vars.values()
+        ):
+            record.independent_vars = {
+                var: record.data if name is None else point[name].values
+                for var, name in self.independent_vars.items()
+            }
+        return record
+
+    def _columns_record(self, point: xr.Dataset) -> LiteModelResult:
+        names = [str(name) for name in point["param"].values]
+        correl = point["correl"].values
+        var_names = tuple(
+            name for k, name in enumerate(names) if not np.isnan(correl[k, k])
+        )
+        correlations: dict[str, dict[str, float]] = {}
+        for i, name in enumerate(names):
+            values = {
+                other: correl[i, j].item()
+                for j, other in enumerate(names)
+                if j != i and not np.isnan(correl[i, j])
+            }
+            if values:
+                correlations[name] = values
+        bounds = {
+            name: (lower, upper)
+            for name, lower, upper in zip(
+                names,
+                point["min"].values.tolist(),
+                point["max"].values.tolist(),
+                strict=True,
+            )
+            if not np.isnan(lower) and (lower != -np.inf or upper != np.inf)
+        }
+        hints = self.model.make_params() if self.model is not None else {}
+        exprs: dict[str, str] = {}
+        for name, code in zip(names, point["expr"].values.tolist(), strict=True):
+            if 0 <= code < len(self.expressions):
+                exprs[name] = self.expressions[code]
+            elif code == UNKNOWN_EXPRESSION and name in hints and hints[name].expr:
+                exprs[name] = hints[name].expr
+        code = int(point["message"])
+        status = int(point["status"])
+        return LiteModelResult(
+            model=self.model,
+            method=self.method,
+            best_values=dict(
+                zip(names, point["best_values"].values.tolist(), strict=True)
+            ),
+            init_values=dict(
+                zip(names, point["init_values"].values.tolist(), strict=True)
+            ),
+            stderr={
+                name: None if np.isnan(err) else err
+                for name, err in zip(
+                    names, point["stderr"].values.tolist(), strict=True
+                )
+            },
+            correl=correlations,
+            var_names=var_names,
+            success=bool(point["success"]),
+            status=None if status == -1 else status,
+            message=self.messages[code] if 0 < code < len(self.messages) else None,
+            nfev=int(point["nfev"]),
+            bounds=bounds,
+            exprs=exprs,
+        )
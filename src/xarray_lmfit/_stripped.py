@@ -0,0 +1,77 @@
+"""Model results whose residual and fitted curves are evaluated on demand.
+
+Imported only when stripped results are requested, as defining the classes requires
+importing lmfit.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import lmfit
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable
+
+#: Attributes of a model result that are recomputed from its parameters.
+STRIPPED_ATTRS: tuple[str, ...] = ("best_fit", "init_fit", "residual")
+
+
+class _Recomputed:
+    """Attribute that is computed on first access and then stored as usual."""
+
+    def __init__(self, compute: Callable[[typing.Any], typing.Any]) -> None:
+        self.compute = compute
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: typing.Any, objtype: type | None = None) -> typing.Any:
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            value = obj.__dict__[self.name] = self.compute(obj)
+            return value
+
+    def __set__(self, obj: typing.Any, value: typing.Any) -> None:
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj: typing.Any) -> None:
+        obj.__dict__.pop(self.name, None)
+
+
+class StrippedModelResult(lmfit.model.ModelResult):
+    """Model result that does not store its residual and fitted curves.
+
+    The residual, initial fit and best fit are evaluated from the parameters, the
+    data and the independent variables when first accessed, for example by
+    :meth:`plot <lmfit.model.ModelResult.plot>` or :meth:`dumps
+    <lmfit.model.ModelResult.dumps>`, and stored from then on.
+    """
+
+    best_fit = _Recomputed(lambda r: r.model.eval(params=r.params, **r.userkws))
+    init_fit = _Recomputed(lambda r: r.model.eval(params=r.init_params, **r.userkws))
+    residual = _Recomputed(
+        lambda r: r.model._residual(r.params, r.data, r.weights, **r.userkws)
+    )
+
+
+class _StrippedMinimizerResult(lmfit.minimizer.MinimizerResult):
+    """Minimizer result that shares the residual of its model result."""
+
+    residual = _Recomputed(lambda r: r.model_result.residual)
+
+
+def strip(modres: lmfit.model.ModelResult) -> StrippedModelResult:
+    """Drop the residual and fitted curves of a model result in place."""
+    modres.__class__ = StrippedModelResult
+    for name in STRIPPED_ATTRS:
+        modres.__dict__.pop(name, None)
+    result = getattr(modres, "result", None)
+    if isinstance(result, lmfit.minimizer.MinimizerResult):
+        result.__class__ = _StrippedMinimizerResult
+        result.__dict__.pop("residual", None)
+        result.model_result = modres
+    return typing.cast("StrippedModelResult", modres)
@@ -1,6 +1,8 @@
+import contextlib
 import inspect
 import pathlib
 import sys
+import threading
 import typing
 import warnings
 
@@ -62,12 +64,39 @@ def _find_stack_level() -> int:
     return n
 
 
+# Warnings collected by worker threads, see `deferred_warnings`
+_deferred = threading.local()
+
+
 def emit_user_level_warning(message, category=None) -> None:
-    """Emit a warning at the user level by inspecting the stack trace."""
+    """Emit a warning at the user level by inspecting the stack trace.
+
+    Inside :func:`deferred_warnings`, the warning is collected instead.
+    """
+    collected = getattr(_deferred, "warnings", None)
+    if collected is not None:
+        collected.append((message, category))
+        return None
     stacklevel = _find_stack_level()
     return warnings.warn(message, category=category, stacklevel=stacklevel)
 
 
+@contextlib.contextmanager
+def deferred_warnings() -> typing.Iterator[list[tuple[str, type[Warning] | None]]]:
+    """Collect the warnings emitted by :func:`emit_user_level_warning` in this thread.
+
+    The stack of a worker thread does not reach user code, and the global warning
+    filters cannot be safely modified from several threads. Worker threads therefore
+    collect their warnings so that the calling thread can emit them afterwards.
+    """
+    previous = getattr(_deferred, "warnings", None)
+    _deferred.warnings = collected = []
+    try:
+        yield collected
+    finally:
+        _deferred.warnings = previous
+
+
 USE_QUICK = False
 
 
@@ -0,0 +1,272 @@
+"""Variable projection for models whose amplitudes enter linearly.
+
+A model that is a sum of terms, each linear in some of its parameters, can be fit by
+optimizing only over the remaining nonlinear parameters. For every trial value of the
+nonlinear parameters, the linear parameters are eliminated by a weighted linear
+least-squares solve, which shrinks the search space of the nonlinear optimizer.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import operator
+import typing
+
+import numpy as np
+
+from xarray_lmfit import _batched
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    import lmfit
+    import numpy.typing as npt
+else:
+    import lazy_loader as _lazy
+
+    lmfit = _lazy.load("lmfit")
+
+#: Functions in :mod:`lmfit.lineshapes` that are proportional to ``amplitude``.
+_AMPLITUDE_LINESHAPES: tuple[str, ...] = (
+    "gaussian",
+    "gaussian2d",
+    "lorentzian",
+    "split_lorentzian",
+    "voigt",
+    "pvoigt",
+    "moffat",
+    "pearson4",
+    "pearson7",
+    "breit_wigner",
+    "damped_oscillator",
+    "dho",
+    "logistic",
+    "lognormal",
+    "students_t",
+    "expgaussian",
+    "doniach",
+    "skewed_gaussian",
+    "skewed_voigt",
+    "step",
+    "rectangle",
+    "exponential",
+    "powerlaw",
+    "sine",
+    "expsine",
+)
+
+
+@functools.cache
+def _amplitude_lineshapes() -> frozenset[typing.Callable]:
+    return frozenset(
+        getattr(lmfit.lineshapes, name)
+        for name in _AMPLITUDE_LINESHAPES
+        if hasattr(lmfit.lineshapes, name)
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class Term:
+    """A signed additive term of a model.
+
+    The term is a homogeneous linear function of the arguments named in `linear`.
+    """
+
+    sign: float
+    model: lmfit.Model
+    linear: tuple[str, ...]
+
+
+def additive_terms(model: lmfit.Model, sign: float = 1.0) -> tuple[Term, ...]:
+    """Split a model into signed additive terms.
+
+    Sums and differences of composite models are expanded recursively. Any other
+    composite is kept as a single term without linear parameters.
+    """
+    if isinstance(model, lmfit.model.CompositeModel):
+        if model.op is operator.add:
+            return additive_terms(model.left, sign) + additive_terms(model.right, sign)
+        if model.op is operator.sub:
+            return additive_terms(model.left, sign) + additive_terms(model.right, -sign)
+        return (Term(sign, model, ()),)
+    if _batched.is_linear_model(model):
+        return (Term(sign, model, tuple(model._param_root_names)),)
+    if model.func in _amplitude_lineshapes():
+        return (Term(sign, model, ("amplitude",)),)
+    return (Term(sign, model, ()),)
+
+
+def linear_parameters(
+    model: lmfit.Model, terms: Sequence[Term], params: lmfit.Parameters
+) -> list[str]:
+    """Return the names of the parameters that can be eliminated by projection.
+
+    A parameter qualifies if it enters linearly, varies freely without bounds or a
+    constraint expression, and no other model parameter depends on it.
+    """
+    referenced: set[str] = set()
+    for name in model.param_names:
+        par = params.get(name)
+        if par is not None and par.expr is not None:
+            referenced.update(par._expr_deps)
+    names = []
+    for term in terms:
+        for arg in term.linear:
+            name = f"{term.model.prefix}{arg}"
+            par = params.get(name)
+            if (
+                par is not None
+                and par.vary
+                and par.expr is None
+                and np.isinf(par.min)
+                and np.isinf(par.max)
+                and name not in referenced
+            ):
+                names.append(name)
+    return names
+
+
+def _design(
+    terms: Sequence[Term],
+    linear: Sequence[str],
+    params: lmfit.Parameters,
+    shape: tuple[int, ...],
+    indep_var_kwargs: Mapping[str, typing.Any],
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Evaluate the model as ``offset + design @ coefficients``."""
+    values = params.valuesdict()
+    offset = np.zeros(shape)
+    columns: dict[str, npt.NDArray] = {}
+    for term in terms:
+        args = [arg for arg in term.linear if f"{term.model.prefix}{arg}" in linear]
+        zeros = dict.fromkeys(args, 0.0)
+        if isinstance(term.model, lmfit.model.CompositeModel):
+            funcargs = None
+        else:
+            # Call the function directly, skipping the overhead of Model.eval
+            funcargs = dict(term.model.opts)
+            # Components only take their own independent variables, as in
+            # lmfit.Model.make_funcargs
+            funcargs.update(
+                (name, value)
+                for name, value in indep_var_kwargs.items()
+                if name in term.model.independent_vars
+            )
+            for root in term.model._param_root_names:
+                funcargs[root] = values[f"{term.model.prefix}{root}"]
+
+        def _eval(
+            overrides: dict[str, float],
+            term: Term = term,
+            funcargs: dict[str, typing.Any] | None = funcargs,
+        ) -> npt.NDArray:
+            if funcargs is None:
+                out = term.model.eval(params, **indep_var_kwargs, **overrides)
+            else:
+                out = term.model.func(**(funcargs | overrides))
+            return term.sign * np.broadcast_to(out, shape)
+
+        fixed: npt.NDArray | float = 0.0
+        if not args or len(args) < len(term.linear):
+            # Contribution of the parameters that are not projected out
+            fixed = _eval(zeros)
+            offset += fixed
+        for arg in args:
+            columns[f"{term.model.prefix}{arg}"] = _eval(zeros | {arg: 1.0}) - fixed
+    return offset, np.stack([columns[name] for name in linear], axis=-1)
+
+
+def _project(
+    terms: Sequence[Term],
+    linear: Sequence[str],
+    params: lmfit.Parameters,
+    y: npt.NDArray,
+    weights: npt.NDArray | float | None,
+    indep_var_kwargs: Mapping[str, typing.Any],
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Solve for the linear parameters given the nonlinear ones.
+
+    Returns the coefficients and the weighted residual of the projected model.
+    """
+    offset, design = _design(terms, linear, params, y.shape, indep_var_kwargs)
+    w = np.asarray(1.0 if weights is None else weights)
+    target = w * (y - offset)
+    design = design * w[..., np.newaxis]
+    if not (np.isfinite(design).all() and np.isfinite(target).all()):
+        return np.full(len(linear), np.nan), np.full(y.shape, np.nan)
+    coefficients = np.linalg.lstsq(design, target, rcond=None)[0]
+    return coefficients, design @ coefficients - target
+
+
+def fit(
+    model: lmfit.Model,
+    terms: Sequence[Term],
+    y: npt.NDArray,
+    params: lmfit.Parameters,
+    weights: npt.NDArray | complex | None,
+    indep_var_kwargs: Mapping[str, typing.Any],
+    fit_kwargs: Mapping[str, typing.Any],
+) -> lmfit.model.ModelResult:
+    """Fit a model with variable projection.
+
+    The nonlinear parameters are first optimized with the linear parameters projected
+    out. The full model is then fit with :meth:`lmfit.Model.fit` starting from the
+    projected solution, which converges in a few iterations and yields the usual
+    :class:`lmfit.model.ModelResult` with the covariance of all parameters. The
+    reported number of function evaluations includes both stages.
+    """
+    linear = linear_parameters(model, terms, params)
+    if (
+        not linear
+        or np.iscomplexobj(y)
+        or np.iscomplexobj(weights)
+        or "iter_cb" in fit_kwargs
+    ):
+        return model.fit(
+            y, **indep_var_kwargs, params=params, weights=weights, **fit_kwargs
+        )
+    w = typing.cast("npt.NDArray | float | None", weights)
+
+    # Derived parameters do not affect the residual, so leave them out of the search
+    required = set(model.param_names)
+    for name in model.param_names:
+        if name in params and params[name].expr is not None:
+            required.update(params[name]._expr_deps)
+    source = params.copy()
+    reduced = lmfit.Parameters()
+    reduced.add_many(*(par for name, par in source.items() if name in required))
+    for name in linear:
+        reduced[name].vary = False
+
+    presolve_nfev = 0
+    if any(par.vary for par in reduced.values()):
+
+        def _residual(pars: lmfit.Parameters) -> npt.NDArray:
+            return _project(terms, linear, pars, y, w, indep_var_kwargs)[1]
+
+        presolve = lmfit.minimize(
+            _residual,
+            reduced,
+            method=fit_kwargs.get("method", "leastsq"),
+            max_nfev=fit_kwargs.get("max_nfev"),
+            calc_covar=False,
+            **(fit_kwargs.get("fit_kws") or {}),
+        )
+        presolve_nfev = presolve.nfev
+        reduced = presolve.params
+
+    coefficients = _project(terms, linear, reduced, y, w, indep_var_kwargs)[0]
+    start = params.copy()
+    for name, par in reduced.items():
+        if par.vary:
+            start[name].value = par.value
+    if np.isfinite(coefficients).all():
+        for name, value in zip(linear, coefficients, strict=True):
+            start[name].value = value
+
+    result = model.fit(
+        y, **indep_var_kwargs, params=start, weights=weights, **fit_kwargs
+    )
+    result.nfev += presolve_nfev
+    return result
@@ -5,14 +5,24 @@ from __future__ import annotations
 import contextlib
 import dataclasses
 import functools
+import itertools
+import json
+import math
+import os
+import pickle
+import threading
+import time
 import typing
 from collections.abc import Collection, Hashable, Iterable, Mapping, Sequence
 
 import numpy as np
 import numpy.typing as npt
+import pandas as pd
 import xarray as xr
+from xarray.core import indexing
 from xarray.core.dataarray import _THIS_ARRAY
 
+from xarray_lmfit import _batched, _cache, _curves, _parallel, _results, _varpro
 from xarray_lmfit._utils import (
     XLMDataArrayAccessor,
     XLMDatasetAccessor,
@@ -30,6 +40,41 @@ else:
     lmfit = _lazy.load("lmfit")
 
 
+#: Target duration of each task when choosing chunks automatically, in seconds.
+_AUTO_CHUNK_SECONDS: float = 1.0
+
+#: Number of points that are fit to estimate the cost of a fit.
+_AUTO_CHUNK_SAMPLES: int = 4
+
+#: Maximum number of distinct parameter objects whose parsed parameters are cached per
+#: block when `params` is a DataArray of objects.
+_PARSED_PARAMETERS_CACHE_SIZE: int = 256
+
+#: Names of the output variables of a fit, without the ``modelfit_`` prefix.
+_OUTPUTS: tuple[str, ...] = (
+    "coefficients",
+    "stderr",
+    "covariance",
+    "stats",
+    "data",
+    "best_fit",
+)
+
+#: Names of the outputs computed by the fit kernels, in the order they are returned.
+_FIT_OUTPUTS: tuple[str, ...] = (
+    "coefficients",
+    "stderr",
+    "covariance",
+    "stats",
+    "best_fit",
+)
+
+# Copying lmfit.Parameters evaluates constraint expressions with the asteval
+# interpreter of the source, so caller-supplied Parameters that are shared between
+# pixels must not be copied from several threads at once.
+_SHARED_PARAMETERS_LOCK = threading.Lock()
+
+
 class _ParametersWrapper:
     """Wrapper class to pass lmfit.Parameters through xarray.apply_ufunc.
 
@@ -135,6 +180,45 @@ def _parse_params(
     )
 
 
+def _constraint_expressions(
+    model: lmfit.Model, parameter_inputs: _ParameterInputs
+) -> tuple[str, ...]:
+    """Collect the constraint expressions that the fits can use, in sorted order.
+
+    The expressions of the parameter hints of the model, the parameter template and
+    the supplied parameter attributes are collected, including in-memory arrays of
+    expressions and of :class:`lmfit.Parameters` or dicts. Expressions in dask-backed
+    arrays and in JSON strings are not known before fitting.
+    """
+    plan = parameter_inputs.plan
+    expressions: set[typing.Any] = {par.expr for par in model.make_params().values()}
+    if plan.template is not None:
+        expressions.update(par.expr for par in plan.template.params.values())
+    for _, attrs in (*plan.template_specs, *plan.static_specs):
+        expressions.update(value for attr, value in attrs if attr == "expr")
+    if plan.mode == "broadcast":
+        for (_, attr), array in zip(
+            plan.dynamic_keys, parameter_inputs.arrays, strict=True
+        ):
+            if attr == "expr" and array.chunks is None:
+                expressions.update(array.values.ravel().tolist())
+    elif plan.mode == "object":
+        for array in parameter_inputs.arrays:
+            if array.chunks is not None:
+                continue
+            # Parameters shared between points are only inspected once
+            for item in {id(item): item for item in array.values.flat}.values():
+                if isinstance(item, lmfit.Parameters):
+                    expressions.update(par.expr for par in item.values())
+                elif isinstance(item, Mapping):
+                    expressions.update(
+                        spec.get("expr")
+                        for spec in item.values()
+                        if isinstance(spec, Mapping)
+                    )
+    return tuple(sorted(expr for expr in expressions if isinstance(expr, str) and expr))
+
+
 def _is_missing_parameter_attr(value: typing.Any) -> bool:
     try:
         return bool(np.isnan(value))
@@ -183,6 +267,115 @@ def _materialize_broadcast_params(
     return _ParametersWrapper(params, complete=not guess)
 
 
+class _BroadcastParameters:
+    """Parameters of broadcast mode that are updated in place for each fit.
+
+    :func:`_materialize_broadcast_params` creates new parameters and a new expression
+    interpreter for every fit, and merges them into a copy of the template. Instead,
+    the parameters are created once from the template, and the supplied attributes of
+    each fit are assigned to them. Constraint expressions are parsed once and only
+    evaluated for each fit. The returned parameters are the same as those of
+    :func:`_materialize_broadcast_params`, but are reused for the next fit, so each
+    thread needs its own instance.
+    """
+
+    def __init__(self, plan: _ParameterPlan, *, guess: bool) -> None:
+        if plan.template is None:
+            raise RuntimeError("broadcast parameter template was not initialized")
+        self.plan = plan
+        self.guess = guess
+        self.static_specs = {name: dict(attrs) for name, attrs in plan.static_specs}
+        dynamic_names = {param_name for param_name, _ in plan.dynamic_keys}
+        #: Parameters whose attributes are supplied, in input order
+        self.supplied_names = tuple(
+            name
+            for name in plan.parameter_names
+            if name in self.static_specs or name in dynamic_names
+        )
+        with _SHARED_PARAMETERS_LOCK:
+            params = plan.template.params.copy()
+        params.set(**{name: {} for name in self.supplied_names if name not in params})
+        # Same order as updating the template with the parameters of each fit
+        for name in plan.parameter_names:
+            if name not in plan.base_names and name in params:
+                parameter = dict.pop(params, name)
+                dict.__setitem__(params, name, parameter)
+        self.params = params
+        #: Parsed expressions and the names they depend on
+        self.expressions: dict[str, tuple[typing.Any, list[str]]] = {}
+
+    def __call__(self, values: Sequence[typing.Any]) -> _ParametersWrapper:
+        supplied_specs = {
+            name: dict(attrs) for name, attrs in self.static_specs.items()
+        }
+        for (param_name, attr_name), value in zip(
+            self.plan.dynamic_keys, values, strict=True
+        ):
+            if not _is_missing_parameter_attr(value):
+                supplied_specs.setdefault(param_name, {})[attr_name] = value
+        if len(supplied_specs) != len(self.supplied_names):
+            # Parameters without any supplied attribute are taken from the template
+            # or left out, which changes the parameters
+            return _materialize_broadcast_params(self.plan, values, guess=self.guess)
+
+        for name in self.supplied_names:
+            self._assign(self.params[name], supplied_specs[name])
+        # Keep the values of constrained parameters seen by other expressions current
+        for par in self.params.values():
+            if par.expr is not None:
+                _ = par.value
+        return _ParametersWrapper(self.params, complete=not self.guess)
+
+    def _assign(self, par: lmfit.Parameter, attrs: dict[str, typing.Any]) -> None:
+        """Assign the attributes to a parameter like :func:`lmfit.create_params`."""
+        expr = attrs.pop("expr", None) or None
+        # Start from the defaults of a new parameter
+        par.stderr = par.correl = par.user_data = par.brute_step = None
+        par.min, par.max = -np.inf, np.inf
+        par.set(vary=True, value=-np.inf)
+        par.init_value = -np.inf
+        attrs.setdefault("is_init_value", True)
+        par.set(**attrs)
+        if expr is None:
+            return
+        parsed = self.expressions.get(expr)
+        if parsed is None:
+            par.set(expr=expr)
+            self.expressions[expr] = (par._expr_ast, list(par._expr_deps))
+        else:
+            # Equivalent to setting the expression, without parsing it again
+            par._expr, par._vary = expr, False
+            par._expr_ast, par._expr_deps = parsed[0], list(parsed[1])
+
+
+class _ParsedParameters:
+    """Cache of the initial parameters constructed from the elements of object mode.
+
+    Parameter DataArrays of objects are often tiled from a few presets, so that many
+    pixels share the same JSON string, dict or Parameters. The parameters constructed
+    from each distinct element are cached, with strings identified by their content
+    and other objects by their identity. Only the first
+    `_PARSED_PARAMETERS_CACHE_SIZE` distinct elements are cached. The cached
+    parameters are shared by the fits, so each thread needs its own instance.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[typing.Any, tuple[typing.Any, lmfit.Parameters]] = {}
+
+    @staticmethod
+    def _key(element: typing.Any) -> typing.Any:
+        return ("str", element) if isinstance(element, str) else ("id", id(element))
+
+    def get(self, element: typing.Any) -> lmfit.Parameters | None:
+        entry = self.entries.get(self._key(element))
+        return None if entry is None else entry[1]
+
+    def put(self, element: typing.Any, params: lmfit.Parameters) -> None:
+        if len(self.entries) < _PARSED_PARAMETERS_CACHE_SIZE:
+            # Keep the element alive so that its identity is not reused
+            self.entries[self._key(element)] = (element, params)
+
+
 def _align_parameter_chunks(
     data: xr.DataArray, arrays: Sequence[xr.DataArray]
 ) -> tuple[xr.DataArray, ...]:
@@ -249,9 +442,46 @@ def _make_failed_model_result(
     return modres
 
 
-def _model_fit_wrapper(
-    Y: npt.NDArray,
-    *args,
+def _n_parameter_inputs(parameter_plan: _ParameterPlan) -> int:
+    if parameter_plan.mode == "broadcast":
+        return len(parameter_plan.dynamic_keys)
+    if parameter_plan.mode == "object":
+        return 1
+    return 0
+
+
+@dataclasses.dataclass(frozen=True)
+class _FitContext:
+    """Fitting state shared by every pixel of a block."""
+
+    model: lmfit.Model
+    param_names: Sequence[str]
+    stat_names: Sequence[str]
+    n_coords: int
+    parameter_plan: _ParameterPlan
+    skipna: bool
+    guess: bool
+    errors: typing.Literal["raise", "ignore"]
+    output_result: bool | typing.Literal["lite", "stripped", "columnar"]
+    fit_kwargs: Mapping[str, typing.Any]
+    weights: npt.NDArray | complex | None = None
+    engine: typing.Literal["lmfit", "batched", "linear"] = "lmfit"
+    varpro_terms: tuple[_varpro.Term, ...] | None = None
+    #: Names of the kernel outputs to compute, see `_FIT_OUTPUTS`
+    outputs: Collection[str] = _FIT_OUTPUTS
+    #: Data type of the outputs other than the statistics, which are always float64
+    output_dtype: npt.DTypeLike = np.float64
+    #: Parameters of broadcast mode, updated for each fit
+    broadcast_params: _BroadcastParameters | None = None
+    #: Parameters constructed from the elements of object mode
+    parsed_params: _ParsedParameters | None = None
+
+    @property
+    def n_parameter_inputs(self) -> int:
+        return _n_parameter_inputs(self.parameter_plan)
+
+
+def _make_fit_context(
     model: lmfit.Model,
     param_names: Sequence[str],
     stat_names: Sequence[str],
@@ -260,50 +490,77 @@ def _model_fit_wrapper(
     skipna: bool,
     guess: bool,
     errors: typing.Literal["raise", "ignore"],
-    output_result: bool,
-    model_fit_kwargs: Mapping[str, typing.Any] | None = None,
-):
-    """Top-level wrapper for Model.fit to keep dask graphs picklable."""
-    n_params = len(param_names)
-    n_stats = len(stat_names)
+    output_result: bool | typing.Literal["lite", "stripped", "columnar"],
+    model_fit_kwargs: Mapping[str, typing.Any] | None,
+    has_weight_input: bool,
+    engine: typing.Literal["lmfit", "batched", "linear"] = "lmfit",
+    varpro: bool = False,
+    outputs: Collection[str] = _FIT_OUTPUTS,
+    output_dtype: npt.DTypeLike = np.float64,
+) -> _FitContext:
+    fit_kwargs = dict(model_fit_kwargs) if model_fit_kwargs is not None else {}
+    raw_weights = fit_kwargs.pop("weights", None)
+    return _FitContext(
+        model=model,
+        param_names=param_names,
+        stat_names=stat_names,
+        n_coords=n_coords,
+        parameter_plan=parameter_plan,
+        skipna=skipna,
+        guess=guess,
+        errors=errors,
+        output_result=output_result,
+        fit_kwargs=fit_kwargs,
+        weights=None if has_weight_input else _prepare_weights(raw_weights),
+        engine=engine,
+        varpro_terms=_varpro.additive_terms(model) if varpro else None,
+        outputs=frozenset(outputs),
+        output_dtype=np.dtype(output_dtype),
+        broadcast_params=(
+            _BroadcastParameters(parameter_plan, guess=guess)
+            if parameter_plan.mode == "broadcast"
+            else None
+        ),
+        parsed_params=_ParsedParameters() if parameter_plan.mode == "object" else None,
+    )
 
-    coords__ = args[:n_coords]
-    if parameter_plan.mode == "broadcast":
-        n_parameter_inputs = len(parameter_plan.dynamic_keys)
-    elif parameter_plan.mode == "object":
-        n_parameter_inputs = 1
-    else:
-        n_parameter_inputs = 0
-    parameter_values = args[n_coords : n_coords + n_parameter_inputs]
 
+def _prepare_weights(raw_weights: typing.Any) -> npt.NDArray | complex | None:
+    if raw_weights is None:
+        return None
+    weights_array = np.asarray(raw_weights)
+    if weights_array.ndim == 0:
+        return typing.cast("complex", weights_array.item())
+    return weights_array.ravel()
+
+
+def _resolve_initial_params(
+    ctx: _FitContext, parameter_values: Sequence[typing.Any]
+) -> tuple[lmfit.Parameters, bool]:
+    """Construct the initial parameters of a single fit.
+
+    Returns the parameters and whether they are a shared template that must not be
+    modified in place.
+    """
+    model, parameter_plan, guess = ctx.model, ctx.parameter_plan, ctx.guess
     if parameter_plan.mode == "static":
         if parameter_plan.template is None:
             raise RuntimeError("static parameter template was not initialized")
         init_params_: typing.Any = parameter_plan.template
+    elif ctx.broadcast_params is not None:
+        init_params_ = ctx.broadcast_params(parameter_values)
     elif parameter_plan.mode == "broadcast":
         init_params_ = _materialize_broadcast_params(
             parameter_plan, parameter_values, guess=guess
         )
     else:
         init_params_ = parameter_values[0]
-
-    fit_kwargs = dict(model_fit_kwargs) if model_fit_kwargs is not None else {}
-    weight_arg_index = n_coords + n_parameter_inputs
-    if len(args) > weight_arg_index:
-        fit_kwargs.pop("weights", None)
-        raw_weights = args[weight_arg_index]
-    else:
-        raw_weights = fit_kwargs.pop("weights", None)
-
-    weights_: npt.NDArray | complex | None
-    if raw_weights is None:
-        weights_ = None
-    else:
-        weights_array = np.asarray(raw_weights)
-        if weights_array.ndim == 0:
-            weights_ = typing.cast("complex", weights_array.item())
-        else:
-            weights_ = weights_array.ravel()
+        cached = (
+            None if ctx.parsed_params is None else ctx.parsed_params.get(init_params_)
+        )
+        if cached is not None:
+            # Guessing updates the parameters in place
+            return (cached.copy(), False) if guess else (cached, True)
 
     wrapped_params = (
         init_params_.params if isinstance(init_params_, _ParametersWrapper) else None
@@ -324,7 +581,9 @@ def _model_fit_wrapper(
         other = init_params_.params
 
         if isinstance(other, lmfit.Parameters):
-            initial_params.update(other.copy())
+            with _SHARED_PARAMETERS_LOCK:
+                other = other.copy()
+            initial_params.update(other)
         else:
             # Instance check may fail in multiprocess, so forcibly set class
             # This no longer triggers in CI in python 3.14+, presumably due to
@@ -350,7 +609,9 @@ def _model_fit_wrapper(
         initial_params.update(lmfit.Parameters().loads(init_params_))
 
     elif isinstance(init_params_, lmfit.Parameters):
-        initial_params.update(init_params_.copy())
+        with _SHARED_PARAMETERS_LOCK:
+            init_params_ = init_params_.copy()
+        initial_params.update(init_params_)
 
     elif isinstance(init_params_, Mapping):
         param_specs = {
@@ -359,14 +620,123 @@ def _model_fit_wrapper(
         }
         initial_params.update(lmfit.create_params(**param_specs))
 
-    popt = np.full([n_params], np.nan)
-    perr = np.full([n_params], np.nan)
-    pcov = np.full([n_params, n_params], np.nan)
-    stats = np.full([n_stats], np.nan)
-    best = np.full(Y.shape, np.nan, dtype=np.float64)
+    if ctx.parsed_params is not None:
+        if guess:
+            ctx.parsed_params.put(parameter_values[0], initial_params.copy())
+        else:
+            ctx.parsed_params.put(parameter_values[0], initial_params)
+            uses_shared_template = True
+
+    return initial_params, uses_shared_template
+
+
+def _guess_params(
+    model: lmfit.Model,
+    initial_params: lmfit.Parameters,
+    y: npt.NDArray,
+    indep_var_kwargs: Mapping[str, typing.Any],
+) -> lmfit.Parameters:
+    """Guess initial parameters, letting the supplied parameters take precedence."""
+    if isinstance(model, lmfit.model.CompositeModel):
+        guessed_params = model.make_params()
+        for comp in model.components:
+            with contextlib.suppress(NotImplementedError):
+                guessed_params.update(comp.guess(y, **indep_var_kwargs))
+        # Given parameters must override guessed parameters
+        return guessed_params.update(initial_params)
+
+    try:
+        return model.guess(y, **indep_var_kwargs).update(initial_params)
+    except NotImplementedError:
+        emit_user_level_warning(
+            f"`guess` is not implemented for {model}, using supplied initial parameters"
+        )
+        return model.make_params().update(initial_params)
+
+
+def _independent_vars(
+    model: lmfit.Model, n_coords: int, x: typing.Any, y: typing.Any
+) -> dict[str, typing.Any]:
+    """Map the fit coordinates to the independent variables of the model."""
+    if model.independent_vars is None:
+        raise ValueError("Independent variables not defined in model")
+    if n_coords == 1:
+        indep_var_kwargs = {model.independent_vars[0]: x}
+        if len(model.independent_vars) == 2:
+            # Y-dependent data, like background models
+            indep_var_kwargs[model.independent_vars[1]] = y
+        return indep_var_kwargs
+    return dict(zip(model.independent_vars[:n_coords], x, strict=True))
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedCoords:
+    """Coordinates that are the same for every pixel of a block, prepared once."""
+
+    #: Flattened coordinate, or the flattened coordinates stacked along the first axis
+    x: npt.NDArray
+    #: Points where no coordinate is NaN, or `None` if all points are valid
+    valid: npt.NDArray[np.bool_] | None
+
+
+def _shared_coords(
+    ctx: _FitContext, coords: Sequence[npt.NDArray], loop_ndim: int
+) -> _SharedCoords | None:
+    """Prepare the coordinates of a block once if they do not vary between pixels.
+
+    Coordinates without loop dimensions are broadcast over the block with zero
+    strides, so they are detected without comparing their values.
+    """
+    for c in coords:
+        loop_axes = zip(c.shape[:loop_ndim], c.strides[:loop_ndim], strict=True)
+        if not all(n == 1 or stride == 0 for n, stride in loop_axes):
+            return None
+    first = (0,) * loop_ndim
+    if ctx.n_coords == 1:
+        x = coords[0][first].ravel()
+    else:
+        x = np.vstack([c[first].ravel() for c in coords])
+    valid: npt.NDArray[np.bool_] | None = None
+    if ctx.skipna:
+        valid = ~np.isnan(x) if ctx.n_coords == 1 else ~np.isnan(x).any(axis=0)
+        if valid.all():
+            valid = None
+    return _SharedCoords(x, valid)
+
+
+def _fit_pixel(
+    ctx: _FitContext,
+    Y: npt.NDArray,
+    coords__: Sequence[npt.NDArray],
+    parameter_values: Sequence[typing.Any],
+    weights_: npt.NDArray | complex | None,
+    popt: npt.NDArray | None,
+    perr: npt.NDArray | None,
+    pcov: npt.NDArray | None,
+    stats: npt.NDArray | None,
+    best: npt.NDArray | None,
+    seed: Mapping[str, float] | None = None,
+    shared_coords: _SharedCoords | None = None,
+) -> lmfit.model.ModelResult | None:
+    """Fit a single pixel, writing the numeric outputs into the given arrays.
+
+    The output arrays must be filled with NaN on entry, and outputs that are not
+    computed are `None`. If `seed` is given, the
+    initial values of the varying parameters are taken from it. If `shared_coords`
+    is given, it is used instead of `coords__`. Returns the model result of the fit,
+    or a placeholder result for failed fits if ``ctx.output_result`` is set.
+    """
+    model, param_names, stat_names = ctx.model, ctx.param_names, ctx.stat_names
+    n_coords, skipna, output_result = ctx.n_coords, ctx.skipna, ctx.output_result
+
+    initial_params, uses_shared_template = _resolve_initial_params(
+        ctx, parameter_values
+    )
 
     single_coord = n_coords == 1
-    if single_coord:
+    if shared_coords is not None:
+        x = shared_coords.x
+    elif single_coord:
         x = coords__[0].ravel()
     else:
         x = np.vstack([c.ravel() for c in coords__])
@@ -381,7 +751,10 @@ def _model_fit_wrapper(
     mask: npt.NDArray[np.bool_] | None = None
     if skipna:
         mask = ~np.isnan(y)
-        if single_coord:
+        if shared_coords is not None:
+            if shared_coords.valid is not None:
+                mask &= shared_coords.valid
+        elif single_coord:
             mask &= ~np.isnan(x)
         else:
             mask &= ~np.isnan(x).any(axis=0)
@@ -395,25 +768,13 @@ def _model_fit_wrapper(
                 weights_ = weights_[mask]
 
     x = np.squeeze(x)
-
-    if model.independent_vars is not None:
-        if n_coords == 1:
-            indep_var_kwargs = {model.independent_vars[0]: x}
-            if len(model.independent_vars) == 2:
-                # Y-dependent data, like background models
-                indep_var_kwargs[model.independent_vars[1]] = y
-        else:
-            indep_var_kwargs = dict(
-                zip(model.independent_vars[:n_coords], x, strict=True)
-            )
-    else:
-        raise ValueError("Independent variables not defined in model")
+    indep_var_kwargs = _independent_vars(model, n_coords, x, y)
 
     if skipna and not len(y):
         # No data to fit
         if not output_result:
-            return popt, perr, pcov, stats, best
-        modres = _make_failed_model_result(
+            return None
+        return _make_failed_model_result(
             model,
             initial_params,
             y,
@@ -421,42 +782,41 @@ def _model_fit_wrapper(
             indep_var_kwargs,
             copy_params=uses_shared_template,
         )
-        return popt, perr, pcov, stats, best, modres
-
-    if guess:
-        if isinstance(model, lmfit.model.CompositeModel):
-            guessed_params = model.make_params()
-            for comp in model.components:
-                with contextlib.suppress(NotImplementedError):
-                    guessed_params.update(comp.guess(y, **indep_var_kwargs))
-            # Given parameters must override guessed parameters
-            initial_params = guessed_params.update(initial_params)
 
-        else:
-            try:
-                initial_params = model.guess(y, **indep_var_kwargs).update(
-                    initial_params
-                )
-            except NotImplementedError:
-                emit_user_level_warning(
-                    f"`guess` is not implemented for {model}, "
-                    "using supplied initial parameters"
-                )
-                initial_params = model.make_params().update(initial_params)
+    if ctx.guess:
+        initial_params = _guess_params(model, initial_params, y, indep_var_kwargs)
+    if seed is not None:
+        if uses_shared_template:
+            initial_params = initial_params.copy()
+            uses_shared_template = False
+        for name, par in initial_params.items():
+            if par.vary and par.expr is None and name in seed:
+                par.value = seed[name]
     try:
-        modres = model.fit(
-            y,
-            **indep_var_kwargs,
-            params=initial_params,
-            weights=weights_,
-            **fit_kwargs,
-        )
+        if ctx.varpro_terms is not None:
+            modres = _varpro.fit(
+                model,
+                ctx.varpro_terms,
+                y,
+                initial_params,
+                weights_,
+                indep_var_kwargs,
+                ctx.fit_kwargs,
+            )
+        else:
+            modres = model.fit(
+                y,
+                **indep_var_kwargs,
+                params=initial_params,
+                weights=weights_,
+                **ctx.fit_kwargs,
+            )
     except ValueError:
-        if errors == "raise":
+        if ctx.errors == "raise":
             raise
         if not output_result:
-            return popt, perr, pcov, stats, best
-        modres = _make_failed_model_result(
+            return None
+        return _make_failed_model_result(
             model,
             initial_params,
             y,
@@ -464,56 +824,1103 @@ def _model_fit_wrapper(
             indep_var_kwargs,
             copy_params=uses_shared_template,
         )
-        return popt, perr, pcov, stats, best, modres
-    else:
-        if modres.success:
-            popt_list, perr_list = [], []
-            for name in param_names:
-                if name not in modres.params:
-                    raise ValueError(
-                        f"Parameter '{name}' was not found in the fit results. "
-                        "Check the model and parameter names."
-                    )
-                p: lmfit.model.Parameter = modres.params[name]
-                popt_list.append(p.value if p.value is not None else np.nan)
-                perr_list.append(p.stderr if p.stderr is not None else np.nan)
 
-            popt, perr = np.array(popt_list), np.array(perr_list)
+    if modres.success:
+        for k, name in enumerate(param_names):
+            if name not in modres.params:
+                raise ValueError(
+                    f"Parameter '{name}' was not found in the fit results. "
+                    "Check the model and parameter names."
+                )
+            p: lmfit.model.Parameter = modres.params[name]
+            if popt is not None:
+                popt[k] = p.value if p.value is not None else np.nan
+            if perr is not None:
+                perr[k] = p.stderr if p.stderr is not None else np.nan
+
+        if stats is not None:
+            for k, stat_name in enumerate(stat_names):
+                s = getattr(modres, stat_name)
+                stats[k] = s if s is not None else np.nan
+
+        # Fill in covariance matrix entries, entries for non-varying
+        # parameters are left as NaN
+        if modres.covar is not None:
+            var_names = modres.var_names
+            for vi in range(modres.nvarys):
+                if var_names[vi] not in param_names:
+                    emit_user_level_warning(
+                        f"Parameter '{var_names[vi]}' is a varying "
+                        "parameter, but is not included in the results. "
+                        "Consider providing `param_names` manually."
+                    )
+                elif pcov is not None:
+                    i = param_names.index(var_names[vi])
+                    for vj in range(modres.nvarys):
+                        if var_names[vj] in param_names:
+                            j = param_names.index(var_names[vj])
+                            pcov[i, j] = modres.covar[vi, vj]
+
+        if best is not None:
+            if mask is None:
+                best.flat[:] = modres.best_fit
+            else:
+                best.flat[mask] = modres.best_fit  # type: ignore[index, unused-ignore]
+
+    return modres
+
+
+def _allocate_outputs(
+    ctx: _FitContext, loop_shape: tuple[int, ...], core_shape: tuple[int, ...]
+) -> tuple[npt.NDArray | None, ...]:
+    """Allocate the kernel outputs, in the order of `_FIT_OUTPUTS`.
+
+    Outputs that are not in ``ctx.outputs`` are not allocated and are `None`. The fits
+    are computed in float64 and converted to ``ctx.output_dtype`` when written.
+    """
+    n_params, n_stats = len(ctx.param_names), len(ctx.stat_names)
+    shapes = {
+        "coefficients": (*loop_shape, n_params),
+        "stderr": (*loop_shape, n_params),
+        "covariance": (*loop_shape, n_params, n_params),
+        "stats": (*loop_shape, n_stats),
+        "best_fit": (*loop_shape, *core_shape),
+    }
+    return tuple(
+        np.full(
+            shapes[name],
+            np.nan,
+            dtype=np.float64 if name == "stats" else ctx.output_dtype,
+        )
+        if name in ctx.outputs
+        else None
+        for name in _FIT_OUTPUTS
+    )
+
+
+def _present_outputs(outputs: Sequence[npt.NDArray | None]) -> tuple[npt.NDArray, ...]:
+    """Drop the outputs that are not computed."""
+    return tuple(out for out in outputs if out is not None)
+
+
+def _expand_outputs(
+    ctx: _FitContext, outputs: Sequence[npt.NDArray]
+) -> tuple[npt.NDArray | None, ...]:
+    """Inverse of :func:`_present_outputs` for the kernel outputs of a context."""
+    present = iter(outputs)
+    return tuple(
+        next(present) if name in ctx.outputs else None for name in _FIT_OUTPUTS
+    )
+
+
+_BATCHED_FIT_KWARGS: frozenset[str] = frozenset({"max_nfev", "scale_covar", "fit_kws"})
+_LINEAR_FIT_KWARGS: frozenset[str] = frozenset({"scale_covar"})
+
+
+def _batched_initial_values(
+    ctx: _FitContext, params: lmfit.Parameters, names: Sequence[str]
+) -> tuple[list[float], list[float], list[float], list[bool]]:
+    """Extract the initial values, bounds and vary flags for the vectorized engines."""
+    for name, par in params.items():
+        if name in names:
+            if par.expr is not None:
+                raise ValueError(
+                    f"The {ctx.engine} engine does not support constraint expressions "
+                    f"on model parameters, but parameter '{name}' has expression "
+                    f"'{par.expr}'."
+                )
+            if (
+                ctx.engine == "linear"
+                and par.vary
+                and (np.isfinite(par.min) or np.isfinite(par.max))
+            ):
+                raise ValueError(
+                    "The linear engine does not support bounds on varying "
+                    f"parameters, but parameter '{name}' is bounded."
+                )
+        elif par.vary and par.expr is None:
+            raise ValueError(
+                f"The {ctx.engine} engine can only vary parameters of the model "
+                f"function, but auxiliary parameter '{name}' is set to vary."
+            )
+    missing = [name for name in names if name not in params]
+    blank = [name for name in names if name in params and params[name].value is None]
+    if missing or blank:
+        raise ValueError(
+            "Assign each parameter an initial value.\n"
+            f"Missing parameters: {missing}\nNon initialized parameters: {blank}"
+        )
+    values, lower, upper, vary = [], [], [], []
+    for name in names:
+        par = params[name]
+        values.append(par.value)
+        lower.append(par.min)
+        upper.append(par.max)
+        vary.append(par.vary)
+    return values, lower, upper, vary
+
+
+@dataclasses.dataclass
+class _BatchedBlock:
+    """Flattened inputs of a block for the vectorized engines."""
+
+    ctx: _FitContext
+    y: npt.NDArray
+    xs: list[npt.NDArray]
+    weights: npt.NDArray
+    mask: npt.NDArray
+    fn_names: list[str]
+    p0: npt.NDArray
+    lower: npt.NDArray
+    upper: npt.NDArray
+    vary: npt.NDArray
+    initial: list[lmfit.Parameters]
+
+    @property
+    def has_data(self) -> npt.NDArray:
+        return self.mask.any(axis=-1)
+
+    def independent_vars(self, sel: npt.NDArray) -> dict[str, typing.Any]:
+        ctx = self.ctx
+        x = self.xs[0][sel] if ctx.n_coords == 1 else [x[sel] for x in self.xs]
+        return _independent_vars(ctx.model, ctx.n_coords, x, self.y[sel])
+
+    def evaluate(self, values: npt.NDArray, sel: npt.NDArray) -> npt.NDArray:
+        """Evaluate the model for all model parameters of the selected pixels."""
+        return _batched.batched_eval(
+            self.ctx.model,
+            {name: values[:, j, np.newaxis] for j, name in enumerate(self.fn_names)},
+            self.independent_vars(sel),
+        )
+
+    def groups(self) -> Iterable[tuple[npt.NDArray, npt.NDArray]]:
+        """Yield the pixels with data and the indices of their varying parameters.
+
+        Pixels are grouped by which parameters are varied so that each group can be
+        solved with a fixed number of free parameters.
+        """
+        patterns, inverse = np.unique(self.vary, axis=0, return_inverse=True)
+        has_data = self.has_data
+        for group, pattern in enumerate(patterns):
+            pixels = np.flatnonzero((inverse.ravel() == group) & has_data)
+            if pixels.size:
+                yield pixels, np.flatnonzero(pattern)
+
+
+def _prepare_batched_block(
+    ctx: _FitContext,
+    Y: npt.NDArray,
+    coords: Sequence[npt.NDArray],
+    parameter_values: Sequence[npt.NDArray],
+    weights: npt.NDArray | None,
+    loop_shape: tuple[int, ...],
+    supported_kwargs: Collection[str],
+) -> _BatchedBlock:
+    """Flatten the inputs of a block and gather the initial parameters of each pixel.
+
+    All inputs must already be broadcast over the loop shape of the block.
+    """
+    model, n_coords = ctx.model, ctx.n_coords
+    unsupported = set(ctx.fit_kwargs) - set(supported_kwargs)
+    if unsupported:
+        raise ValueError(
+            f"The {ctx.engine} engine does not support the fit keyword arguments "
+            f"{sorted(unsupported)}."
+        )
+
+    n_pixels = int(np.prod(loop_shape, dtype=np.int64))
+    n_points = int(np.prod(Y.shape[len(loop_shape) :], dtype=np.int64))
+    y = Y.reshape(n_pixels, n_points).astype(np.float64, copy=False)
+    xs = [np.asarray(c, dtype=np.float64).reshape(n_pixels, n_points) for c in coords]
+
+    w: npt.NDArray | complex | None = (
+        ctx.weights if weights is None else weights.reshape(n_pixels, -1)
+    )
+    if isinstance(w, np.ndarray) and w.shape[-1] != n_points:
+        raise ValueError(
+            "weights must be a scalar or have the same size as the data being fit; "
+            f"received {w.shape[-1]} weights for {n_points} data points"
+        )
+    w_arr = np.broadcast_to(
+        np.asarray(1.0 if w is None else w, dtype=np.float64), (n_pixels, n_points)
+    )
+
+    mask = np.ones((n_pixels, n_points), dtype=bool)
+    if ctx.skipna:
+        mask = ~np.isnan(y)
+        for x in xs:
+            mask &= ~np.isnan(x)
+    has_data = mask.any(axis=-1)
+
+    # Gather initial values, bounds and vary flags of the model function parameters.
+    # Parameter hints with expressions are computed from these like other derived
+    # parameters
+    fn_names = _batched.function_param_names(model)
+    p0 = np.empty((n_pixels, len(fn_names)))
+    lower, upper = np.empty_like(p0), np.empty_like(p0)
+    vary = np.empty(p0.shape, dtype=bool)
+    initial: list[lmfit.Parameters] = []
+    shared: lmfit.Parameters | None = None
+    for i, idx in enumerate(np.ndindex(*loop_shape)):
+        if shared is not None:
+            params = shared
+        else:
+            params, is_template = _resolve_initial_params(
+                ctx, [v[idx] for v in parameter_values]
+            )
+            if ctx.guess and has_data[i]:
+                x_i = (
+                    xs[0][i][mask[i]] if n_coords == 1 else [x[i][mask[i]] for x in xs]
+                )
+                params = _guess_params(
+                    model,
+                    params,
+                    y[i][mask[i]],
+                    _independent_vars(model, n_coords, x_i, y[i][mask[i]]),
+                )
+            elif ctx.parameter_plan.mode == "static" and not ctx.guess:
+                shared = params
+            elif is_template and ctx.broadcast_params is not None:
+                # Broadcast parameters are updated in place for the next pixel
+                params = params.copy()
+        p0[i], lower[i], upper[i], vary[i] = _batched_initial_values(
+            ctx, params, fn_names
+        )
+        initial.append(params)
+
+    for name in ctx.param_names:
+        if name not in initial[0]:
+            raise ValueError(
+                f"Parameter '{name}' was not found in the fit results. "
+                "Check the model and parameter names."
+            )
+
+    return _BatchedBlock(
+        ctx=ctx,
+        y=y,
+        xs=xs,
+        weights=w_arr,
+        mask=mask,
+        fn_names=fn_names,
+        p0=p0,
+        lower=lower,
+        upper=upper,
+        vary=vary,
+        initial=initial,
+    )
+
+
+def _store_batched_results(
+    block: _BatchedBlock,
+    pixels: npt.NDArray,
+    vi: npt.NDArray,
+    final: npt.NDArray,
+    covar: npt.NDArray,
+    residual: npt.NDArray,
+    nfev: npt.NDArray,
+    popt: npt.NDArray | None,
+    perr: npt.NDArray | None,
+    pcov: npt.NDArray | None,
+    stats: npt.NDArray | None,
+    best: npt.NDArray | None,
+) -> None:
+    """Compute statistics like lmfit and write the results of successful fits.
+
+    Parameters
+    ----------
+    block
+        The block being fit.
+    pixels
+        Flat indices of the successfully fit pixels.
+    vi
+        Indices of the varying parameters into ``block.fn_names``.
+    final
+        Best-fit values of all model parameters, shape ``(n, n_fn_params)``.
+    covar
+        Unscaled covariance matrices of the varying parameters.
+    residual
+        Weighted residuals at the best fit, zero for masked points.
+    nfev
+        Number of function evaluations of each fit, NaN if not counted.
+    popt, perr, pcov, stats, best
+        Output arrays of the whole block, flattened over the loop dimensions, or
+        `None` for outputs that are not computed.
+    """
+    ctx, fn_names, mask = block.ctx, block.fn_names, block.mask
+    fn_index = {name: j for j, name in enumerate(fn_names)}
+    out_index = {name: k for k, name in enumerate(ctx.param_names)}
+    for j in vi:
+        if fn_names[j] not in out_index:
+            emit_user_level_warning(
+                f"Parameter '{fn_names[j]}' is a varying "
+                "parameter, but is not included in the results. "
+                "Consider providing `param_names` manually."
+            )
+
+    model_values = block.evaluate(final, pixels)
+    n_varys = vi.size
+    ndata = mask[pixels].sum(axis=-1)
+    nfree = ndata - n_varys
+    chisqr = np.einsum("ij,ij->i", residual, residual)
+    redchi = chisqr / np.maximum(1, nfree)
+    with np.errstate(divide="ignore"):
+        neg2_log_likel = ndata * np.log(chisqr / ndata)
+    data = np.where(mask[pixels], block.y[pixels], np.nan)
+    sstot = np.nansum((data - np.nanmean(data, axis=-1, keepdims=True)) ** 2, -1)
+    resid = np.nansum((data - model_values) ** 2, axis=-1)
+    pixel_stats = {
+        "nfev": nfev,
+        "nvarys": np.full(pixels.size, n_varys),
+        "ndata": ndata,
+        "nfree": nfree,
+        "chisqr": chisqr,
+        "redchi": redchi,
+        "aic": neg2_log_likel + 2 * n_varys,
+        "bic": neg2_log_likel + np.log(ndata) * n_varys,
+        "rsquared": np.where(
+            ndata > 1, 1.0 - resid / np.maximum(_batched._TINY, sstot), np.nan
+        ),
+    }
+    if stats is not None:
+        for k, stat_name in enumerate(ctx.stat_names):
+            if stat_name in pixel_stats:
+                stats[pixels, k] = pixel_stats[stat_name]
+
+    if ctx.fit_kwargs.get("scale_covar", True):
+        covar = covar * redchi[:, np.newaxis, np.newaxis]
+    # Like lmfit, fixed parameters have zero uncertainty when errors are estimated
+    has_errorbars = np.isfinite(covar).all(axis=(-2, -1))
+    for name, k in out_index.items():
+        if name in fn_index:
+            if popt is not None:
+                popt[pixels, k] = final[:, fn_index[name]]
+            if perr is not None and fn_index[name] not in vi:
+                perr[pixels, k] = np.where(has_errorbars, 0.0, np.nan)
+    for a, ja in enumerate(vi):
+        if fn_names[ja] not in out_index:
+            continue
+        ka = out_index[fn_names[ja]]
+        if perr is not None:
+            perr[pixels, ka] = np.sqrt(covar[:, a, a])
+        if pcov is not None:
+            for b, jb in enumerate(vi):
+                if fn_names[jb] in out_index:
+                    pcov[pixels, ka, out_index[fn_names[jb]]] = covar[:, a, b]
+
+    derived = [name for name in ctx.param_names if name not in fn_index]
+    if derived and popt is not None:
+        for pixel, values in zip(pixels, final, strict=True):
+            params = block.initial[pixel].copy()
+            for name, value in zip(fn_names, values, strict=True):
+                params[name].value = value
+            for name in derived:
+                popt[pixel, out_index[name]] = params[name].value
+
+    if best is not None:
+        best[pixels] = np.where(mask[pixels], model_values, np.nan)
+
+
+def _batched_fit_block(
+    ctx: _FitContext,
+    Y: npt.NDArray,
+    coords: Sequence[npt.NDArray],
+    parameter_values: Sequence[npt.NDArray],
+    weights: npt.NDArray | None,
+    loop_shape: tuple[int, ...],
+    outputs: tuple[npt.NDArray | None, ...],
+) -> None:
+    """Fit every pixel of a block at once with a vectorized engine.
+
+    All inputs are already broadcast over the loop shape of the block, and the output
+    arrays are filled in place like in :func:`_fit_pixel`.
+    """
+    if ctx.engine == "linear":
+        supported_kwargs: Collection[str] = _LINEAR_FIT_KWARGS
+    else:
+        supported_kwargs = _BATCHED_FIT_KWARGS
+    block = _prepare_batched_block(
+        ctx, Y, coords, parameter_values, weights, loop_shape, supported_kwargs
+    )
+    n_pixels = block.y.shape[0]
+    *fit_outputs, best = outputs
+    outputs = (
+        *(
+            None
+            if out is None
+            else out.reshape(n_pixels, *out.shape[len(loop_shape) :])
+            for out in fit_outputs
+        ),
+        None if best is None else best.reshape(n_pixels, -1),
+    )
+
+    fit_kws = dict(ctx.fit_kwargs.get("fit_kws") or {})
+    for pixels, vi in block.groups():
+        if ctx.engine == "linear":
+            _linear_solve_group(block, pixels, vi, outputs)
+            continue
+
+        def _residual(
+            pv: npt.NDArray,
+            index: npt.NDArray,
+            pixels: npt.NDArray = pixels,
+            vi: npt.NDArray = vi,
+        ) -> npt.NDArray:
+            sel = pixels[index]
+            values = block.p0[sel].copy()
+            values[:, vi] = pv
+            with np.errstate(invalid="ignore"):
+                resid = (block.evaluate(values, sel) - block.y[sel]) * block.weights[
+                    sel
+                ]
+            return np.where(block.mask[sel], resid, 0.0)
+
+        result = _batched.levenberg_marquardt(
+            _residual,
+            block.p0[pixels][:, vi],
+            block.lower[pixels][:, vi],
+            block.upper[pixels][:, vi],
+            max_nfev=ctx.fit_kwargs.get("max_nfev") or 2000 * (vi.size + 1),
+            **{k: v for k, v in fit_kws.items() if k in ("ftol", "xtol")},
+        )
+        if ctx.errors == "raise" and result.aborted.any():
+            raise ValueError(
+                "The model function generated NaN values and the fit aborted! "
+                "Please check your model function and/or set boundaries on "
+                "parameters where applicable."
+            )
+
+        ok = result.success
+        final = block.p0[pixels[ok]].copy()
+        final[:, vi] = result.params[ok]
+        _store_batched_results(
+            block,
+            pixels[ok],
+            vi,
+            final,
+            result.covar[ok],
+            result.residual[ok],
+            result.nfev[ok],
+            *outputs,
+        )
+
+
+def _linear_solve_group(
+    block: _BatchedBlock,
+    pixels: npt.NDArray,
+    vi: npt.NDArray,
+    outputs: tuple[npt.NDArray | None, ...],
+) -> None:
+    """Solve a group of linear least-squares problems in closed form."""
+    fixed = block.p0[pixels].copy()
+    fixed[:, vi] = 0.0
+    offset = block.evaluate(fixed, pixels)
+    columns = []
+    for j in vi:
+        unit = fixed.copy()
+        unit[:, j] = 1.0
+        columns.append(block.evaluate(unit, pixels) - offset)
+    design = np.broadcast_to(
+        np.stack(columns, axis=-1), (*block.y[pixels].shape, vi.size)
+    )
+
+    weights = np.where(block.mask[pixels], block.weights[pixels], 0.0)
+    target = np.where(block.mask[pixels], block.y[pixels] - offset, 0.0) * weights
+    solution, covar = _batched.linear_lstsq(design * weights[..., np.newaxis], target)
+
+    final = block.p0[pixels].copy()
+    final[:, vi] = solution
+    residual = np.einsum("nmk,nk->nm", design, solution) * weights - target
+    _store_batched_results(
+        block,
+        pixels,
+        vi,
+        final,
+        covar,
+        residual,
+        # A closed-form solve has no function evaluations to compare with the
+        # iterative engines
+        np.full(pixels.size, np.nan),
+        *outputs,
+    )
+
+
+def _serpentine(shape: tuple[int, ...]) -> list[tuple[int, ...]]:
+    """Return the indices of an array in boustrophedon order.
+
+    Every index is adjacent to the one before it, except for the first.
+    """
+    if not shape:
+        return [()]
+    inner = _serpentine(shape[1:])
+    return [
+        (i, *j) for i in range(shape[0]) for j in (inner if i % 2 == 0 else inner[::-1])
+    ]
+
+
+def _loop_indices(
+    loop_shape: tuple[int, ...], axes: Sequence[int]
+) -> Iterable[tuple[int, ...]]:
+    """Iterate over the loop indices of a block.
+
+    The loop axes in `axes` are traversed innermost in a serpentine order, so that
+    consecutive pixels are neighbours along these axes.
+    """
+    if not axes:
+        yield from np.ndindex(*loop_shape)
+        return
+    outer_axes = [a for a in range(len(loop_shape)) if a not in axes]
+    inner = _serpentine(tuple(loop_shape[a] for a in axes))
+    idx = [0] * len(loop_shape)
+    for outer in np.ndindex(*(loop_shape[a] for a in outer_axes)):
+        for a, i in zip(outer_axes, outer, strict=True):
+            idx[a] = i
+        for position in inner:
+            for a, i in zip(axes, position, strict=True):
+                idx[a] = i
+            yield tuple(idx)
+
+
+def _warm_start_seed(
+    fitted: npt.NDArray,
+    idx: tuple[int, ...],
+    previous: tuple[int, ...] | None,
+    axes: Sequence[int],
+) -> Mapping[str, float] | None:
+    """Find the parameters of a successfully fitted neighbour of a pixel.
+
+    The previously fitted pixel is preferred if it is a neighbour.
+    """
+    neighbours = [
+        (*idx[:a], idx[a] + step, *idx[a + 1 :])
+        for a in axes
+        for step in (-1, 1)
+        if 0 <= idx[a] + step < fitted.shape[a]
+    ]
+    if previous in neighbours:
+        neighbours.insert(0, previous)
+    for neighbour in neighbours:
+        if fitted[neighbour] is not None:
+            return fitted[neighbour]
+    return None
+
+
+def _pixel_signature(
+    arrays: Iterable[npt.NDArray], parameter_values: Iterable[typing.Any]
+) -> str:
+    """Hash the inputs of a single fit so that identical fits can be detected."""
+    return _cache.content_hash(list(arrays), list(parameter_values))
+
+
+def _plan_signature(parameter_plan: _ParameterPlan) -> tuple:
+    """Describe a parameter plan with objects that can be hashed by content."""
+    template = parameter_plan.template
+    return (
+        parameter_plan.mode,
+        None if template is None else (template.params, template.complete),
+        parameter_plan.template_specs,
+        parameter_plan.static_specs,
+        parameter_plan.dynamic_keys,
+        parameter_plan.parameter_names,
+        parameter_plan.base_names,
+    )
+
+
+def _model_fit_shared_block(*args, **kwargs):
+    """Fit a block whose last input holds the objects shared by all blocks.
+
+    The last input is an object array with a single element, a mapping of keyword
+    arguments to :func:`_model_fit_block`. Passing the model, the fit options and the
+    parameter plan as an input instead of binding them to the wrapper lets dask store
+    them once in the graph as a dependency of every task, so that they are serialized
+    once instead of for every task and data variable. Columnar results store the
+    constraint expressions as their index in the `expressions` keyword argument.
+    """
+    *arrays, shared = args
+    # Without loop dimensions, the element may be passed without its array
+    shared = np.asarray(shared, dtype=object).item()
+    expressions = kwargs.pop("expressions", ())
+    outputs = _model_fit_block(*arrays, **kwargs, **shared)
+    if kwargs["output_result"] == "columnar":
+        # No object arrays leave the block
+        *outputs, results = outputs
+        outputs = (
+            *outputs,
+            *_results.result_columns(results, kwargs["param_names"], expressions),
+        )
+    # apply_ufunc expects a single output to be returned as is
+    return outputs[0] if len(outputs) == 1 else outputs
+
+
+def _model_fit_block(
+    Y: npt.NDArray,
+    *args,
+    n_core_dims: int,
+    n_weight_core_dims: int | None,
+    model: lmfit.Model,
+    param_names: Sequence[str],
+    stat_names: Sequence[str],
+    n_coords: int,
+    parameter_plan: _ParameterPlan,
+    skipna: bool,
+    guess: bool,
+    errors: typing.Literal["raise", "ignore"],
+    output_result: bool | typing.Literal["lite", "stripped", "columnar"],
+    model_fit_kwargs: Mapping[str, typing.Any] | None = None,
+    engine: typing.Literal["lmfit", "batched", "linear"] = "lmfit",
+    varpro: bool = False,
+    warm_start_axes: Sequence[int] = (),
+    deduplicate: bool = False,
+    cache: _cache.FitCache | None = None,
+    executor: typing.Literal["processes", "threads"] | None = None,
+    n_workers: int | None = None,
+    pool: _parallel.ProcessPool | None = None,
+    outputs: Collection[str] = _FIT_OUTPUTS,
+    output_dtype: npt.DTypeLike = np.float64,
+):
+    """Fit every pixel in a block of data.
+
+    Each input carries the loop (preserved) dimensions first, followed by its core
+    dimensions. The loop dimensions are broadcast against each other as in NumPy, and
+    the fitting state is set up once for the whole block. If `warm_start_axes` is
+    given, the block is walked along these loop axes and each fit starts from the
+    result of a successfully fitted neighbour. If `deduplicate` is set, pixels with
+    identical inputs are fit once and share the results. If `cache` is given, the
+    outputs are loaded from it if the block was fit before, and stored in it
+    otherwise. If `executor` is given, the pixels are fit on a pool of `n_workers`
+    processes or threads; worker processes are taken from `pool` if given, so that
+    they are reused between blocks. Only the kernel outputs in `outputs` are computed
+    and returned, in the order of `_FIT_OUTPUTS`, stored as `output_dtype` except for
+    the statistics. Top-level to keep dask graphs picklable.
+    """
+    ctx = _make_fit_context(
+        model,
+        param_names,
+        stat_names,
+        n_coords,
+        parameter_plan,
+        skipna,
+        guess,
+        errors,
+        output_result,
+        model_fit_kwargs,
+        has_weight_input=n_weight_core_dims is not None,
+        engine=engine,
+        varpro=varpro,
+        outputs=outputs,
+        output_dtype=output_dtype,
+    )
+    key: str | None = None
+    if cache is not None:
+        key = cache.key(
+            Y,
+            args,
+            _plan_signature(parameter_plan),
+            param_names,
+            stat_names,
+            n_coords,
+            skipna,
+            guess,
+            errors,
+            output_result,
+            model_fit_kwargs,
+            engine,
+            varpro,
+            warm_start_axes,
+            deduplicate,
+            n_core_dims,
+            n_weight_core_dims,
+            sorted(ctx.outputs),
+            np.dtype(ctx.output_dtype).str,
+        )
+        cached = cache.load(
+            model, key, with_results=ctx.engine == "lmfit" and output_result
+        )
+        if cached is not None:
+            return _present_outputs(cached)
+
+    inputs = (Y, *args)
+    Y, coords, parameter_values, weights = _broadcast_block(
+        ctx, inputs, n_core_dims, n_weight_core_dims
+    )
+    loop_shape = Y.shape[: Y.ndim - n_core_dims]
+    core_shape = Y.shape[Y.ndim - n_core_dims :]
+
+    fit_outputs = _allocate_outputs(ctx, loop_shape, core_shape)
+    if ctx.engine in ("batched", "linear"):
+        _batched_fit_block(
+            ctx, Y, coords, parameter_values, weights, loop_shape, fit_outputs
+        )
+        block_outputs: tuple[npt.NDArray | None, ...] = fit_outputs
+    elif executor is not None:
+        block_outputs = fit_outputs
+        fit_in_pool = (
+            functools.partial(_parallel.fit_in_processes, pool=pool)
+            if executor == "processes"
+            else _parallel.fit_in_threads
+        )
+        fitted = fit_in_pool(
+            functools.partial(
+                _fit_block_range,
+                ctx=ctx,
+                n_core_dims=n_core_dims,
+                n_weight_core_dims=n_weight_core_dims,
+                deduplicate=deduplicate,
+            ),
+            inputs,
+            _present_outputs(fit_outputs),
+            size=math.prod(loop_shape),
+            n_workers=n_workers,
+        )
+        if fitted is not None:
+            results = np.empty(loop_shape, dtype=object)
+            for i, modres in enumerate(fitted):
+                results.flat[i] = modres
+            block_outputs = (*block_outputs, results)
+    else:
+        block_outputs = _fit_block_pixels(
+            ctx,
+            Y,
+            coords,
+            parameter_values,
+            weights,
+            fit_outputs,
+            loop_shape=loop_shape,
+            warm_start_axes=warm_start_axes,
+            deduplicate=deduplicate,
+        )
+
+    if cache is not None:
+        cache.store(model, typing.cast("str", key), block_outputs)
+    return _present_outputs(block_outputs)
+
+
+def _broadcast_block(
+    ctx: _FitContext,
+    inputs: Sequence[typing.Any],
+    n_core_dims: int,
+    n_weight_core_dims: int | None,
+) -> tuple[
+    npt.NDArray, tuple[npt.NDArray, ...], tuple[npt.NDArray, ...], npt.NDArray | None
+]:
+    """Split the inputs of a block and broadcast their loop dimensions.
+
+    Returns the data, coordinates, parameter values and weights of the block.
+    """
+    Y, *args = inputs
+    n_coords, n_parameter_inputs = ctx.n_coords, ctx.n_parameter_inputs
+    coords = args[:n_coords]
+    parameter_values = args[n_coords : n_coords + n_parameter_inputs]
+    weights = (
+        args[n_coords + n_parameter_inputs] if n_weight_core_dims is not None else None
+    )
+
+    loop_shapes = [Y.shape[: Y.ndim - n_core_dims]]
+    loop_shapes.extend(c.shape[: c.ndim - n_core_dims] for c in coords)
+    loop_shapes.extend(np.shape(v) for v in parameter_values)
+    if weights is not None:
+        loop_shapes.append(weights.shape[: weights.ndim - n_weight_core_dims])
+    loop_shape = np.broadcast_shapes(*loop_shapes)
+
+    def _broadcast_loop(a: npt.NDArray, n_core: int) -> npt.NDArray:
+        return np.broadcast_to(a, loop_shape + a.shape[a.ndim - n_core :])
+
+    if weights is not None:
+        weights = _broadcast_loop(weights, typing.cast("int", n_weight_core_dims))
+    return (
+        _broadcast_loop(Y, n_core_dims),
+        tuple(_broadcast_loop(c, n_core_dims) for c in coords),
+        tuple(_broadcast_loop(np.asarray(v), 0) for v in parameter_values),
+        weights,
+    )
+
+
+def _private_context(ctx: _FitContext) -> _FitContext:
+    """Return a copy of a context with its own copy of the parameter template.
+
+    The template of static parameters and the parameters parsed in object mode are
+    passed to every fit without copying, and the parameters of broadcast mode are
+    updated in place, so worker threads must not share them.
+    """
+    parameter_plan = ctx.parameter_plan
+    template = parameter_plan.template
+    if template is not None:
+        with _SHARED_PARAMETERS_LOCK:
+            params = template.params.copy()
+        parameter_plan = dataclasses.replace(
+            parameter_plan,
+            template=_ParametersWrapper(params, complete=template.complete),
+        )
+    broadcast_params = (
+        None
+        if ctx.broadcast_params is None
+        else _BroadcastParameters(parameter_plan, guess=ctx.guess)
+    )
+    return dataclasses.replace(
+        ctx,
+        parameter_plan=parameter_plan,
+        broadcast_params=broadcast_params,
+        parsed_params=None if ctx.parsed_params is None else _ParsedParameters(),
+    )
+
+
+def _fit_block_range(
+    inputs: Sequence[npt.NDArray],
+    outputs: Sequence[npt.NDArray],
+    start: int,
+    stop: int,
+    *,
+    ctx: _FitContext,
+    n_core_dims: int,
+    n_weight_core_dims: int | None,
+    deduplicate: bool,
+) -> list[lmfit.model.ModelResult | None] | None:
+    """Fit a range of the flattened loop indices of a block.
+
+    Used by the workers of the ``"processes"`` and ``"threads"`` engines. Returns the
+    model results of the fitted pixels if requested.
+    """
+    ctx = _private_context(ctx)
+    Y, coords, parameter_values, weights = _broadcast_block(
+        ctx, inputs, n_core_dims, n_weight_core_dims
+    )
+    loop_shape = Y.shape[: Y.ndim - n_core_dims]
+    indices = list(itertools.islice(np.ndindex(*loop_shape), start, stop))
+    fitted = _fit_block_pixels(
+        ctx,
+        Y,
+        coords,
+        parameter_values,
+        weights,
+        _expand_outputs(ctx, outputs),
+        loop_shape=loop_shape,
+        warm_start_axes=(),
+        deduplicate=deduplicate,
+        indices=indices,
+    )
+    if ctx.output_result:
+        return [fitted[5][idx] for idx in indices]
+    return None
+
+
+def _stored_result(
+    ctx: _FitContext, modres: lmfit.model.ModelResult | None
+) -> lmfit.model.ModelResult | _results.LiteModelResult | None:
+    """Return the result of a fit as it is stored in the output."""
+    if modres is None:
+        return None
+    if ctx.output_result in ("lite", "columnar"):
+        return _results.LiteModelResult.from_model_result(modres)
+    if ctx.output_result == "stripped" and modres.success:
+        from xarray_lmfit import _stripped
+
+        return _stripped.strip(modres)
+    return modres
+
+
+def _fit_block_pixels(
+    ctx: _FitContext,
+    Y: npt.NDArray,
+    coords: Sequence[npt.NDArray],
+    parameter_values: Sequence[npt.NDArray],
+    weights: npt.NDArray | None,
+    outputs: tuple[npt.NDArray | None, ...],
+    *,
+    loop_shape: tuple[int, ...],
+    warm_start_axes: Sequence[int],
+    deduplicate: bool,
+    indices: Iterable[tuple[int, ...]] | None = None,
+) -> tuple[npt.NDArray | None, ...]:
+    """Fit the pixels of a broadcast block one by one with lmfit.
+
+    If `indices` is given, only these loop indices are fit.
+    """
+    results = np.empty(loop_shape, dtype=object) if ctx.output_result else None
+
+    # Best-fit values of successful fits, used to seed their neighbours
+    fitted = np.full(loop_shape, None, dtype=object) if warm_start_axes else None
+    previous: tuple[int, ...] | None = None
+    # First pixel with each distinct set of inputs
+    unique: dict[str, tuple[int, ...]] = {}
+    shared_coords = _shared_coords(ctx, coords, len(loop_shape))
+    # Coordinates shared by all pixels need not be compared
+    pixel_coords = () if shared_coords is not None else coords
+    if indices is None:
+        indices = _loop_indices(loop_shape, warm_start_axes)
+    for idx in indices:
+        if deduplicate:
+            signature = _pixel_signature(
+                [Y[idx], *(c[idx] for c in pixel_coords)]
+                + ([] if weights is None else [weights[idx]]),
+                [v[idx] for v in parameter_values],
+            )
+            source = unique.setdefault(signature, idx)
+            if source != idx:
+                for out in _present_outputs(outputs):
+                    out[idx] = out[source]
+                if results is not None:
+                    results[idx] = results[source]
+                continue
+        seed = (
+            None
+            if fitted is None
+            else _warm_start_seed(fitted, idx, previous, warm_start_axes)
+        )
+        modres = _fit_pixel(
+            ctx,
+            Y[idx],
+            [c[idx] for c in coords],
+            [v[idx] for v in parameter_values],
+            ctx.weights if weights is None else _prepare_weights(weights[idx]),
+            *(None if out is None else out[idx] for out in outputs),
+            seed=seed,
+            shared_coords=shared_coords,
+        )
+        if fitted is not None:
+            if modres is not None and modres.success:
+                fitted[idx] = modres.params.valuesdict()
+            previous = idx
+        if results is not None:
+            results[idx] = _stored_result(ctx, modres)
+
+    if results is not None:
+        return (*outputs, results)
+    return outputs
+
 
-            stats = np.array(
-                [
-                    s if s is not None else np.nan
-                    for s in [getattr(modres, s) for s in stat_names]
-                ]
-            )
+def _upsample_coarse(
+    coarse: xr.DataArray, factors: Mapping[Hashable, int], like: xr.Dataset
+) -> xr.DataArray:
+    """Interpolate values on a coarsened grid back to the full resolution grid.
 
-            # Fill in covariance matrix entries, entries for non-varying
-            # parameters are left as NaN
-            if modres.covar is not None:
-                var_names = modres.var_names
-                for vi in range(modres.nvarys):
-                    if var_names[vi] not in param_names:
-                        emit_user_level_warning(
-                            f"Parameter '{var_names[vi]}' is a varying "
-                            "parameter, but is not included in the results. "
-                            "Consider providing `param_names` manually."
-                        )
-                    else:
-                        i = param_names.index(var_names[vi])
-                        for vj in range(modres.nvarys):
-                            if var_names[vj] in param_names:
-                                j = param_names.index(var_names[vj])
-                                pcov[i, j] = modres.covar[vi, vj]
+    Values are interpolated linearly between the centers of the coarse bins and held
+    constant beyond the outermost centers. Where one of the two neighbouring bins is
+    missing, the nearest available value is used.
+    """
+    for dim, factor in factors.items():
+        if dim not in coarse.dims:
+            continue
+        size = like.sizes[dim]
+        starts = np.arange(0, size, factor)
+        centers = (starts + np.minimum(starts + factor, size) - 1) / 2
+        position = np.interp(np.arange(size), centers, np.arange(centers.size))
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, centers.size - 1)
+        frac = xr.DataArray(position - lower, dims=dim)
+
+        coarse = coarse.drop_vars(
+            [name for name, coord in coarse.coords.items() if dim in coord.dims]
+        )
+        lo, hi = coarse.isel({dim: lower}), coarse.isel({dim: upper})
+        nearest = xr.where(frac < 0.5, lo, hi).fillna(lo).fillna(hi)
+        coarse = (lo * (1 - frac) + hi * frac).fillna(nearest)
+        if dim in like.coords:
+            coarse = coarse.assign_coords({dim: like[dim]})
+    return coarse
 
-            if mask is None:
-                best.flat[:] = modres.best_fit
-            else:
-                best.flat[mask] = modres.best_fit  # type: ignore[index, unused-ignore]
 
-    outputs = (popt, perr, pcov, stats, best)
-    if output_result:
-        return (*outputs, modres)
-    return outputs
+#: Name of the temporary dimension of the permuted points when shuffling.
+_SHUFFLE_DIM: str = "__modelfit_shuffled__"
+
+#: Name of the temporary dimension of data variables that are fit together.
+_FUSED_DIM: str = "__modelfit_variable__"
+
+
+def _fusion_groups(
+    data_vars: Mapping[Hashable, xr.DataArray], chunks: bool = True
+) -> list[list[Hashable]]:
+    """Group the data variables that can be fit together in a single pass.
+
+    Data variables with the same dimensions and dtype are grouped together, in order
+    of their first appearance. If `chunks` is set, only dask-backed data variables
+    with the same chunks are grouped, as stacking them is lazy; stacking in-memory
+    data variables would copy them, so each of them forms its own group.
+    """
+    groups: dict[tuple, list[Hashable]] = {}
+    for name, da in data_vars.items():
+        if not chunks:
+            key: tuple = (da.dims, da.dtype)
+        elif da.chunks is not None:
+            key = (da.dims, da.dtype, da.chunks)
+        else:
+            key = (name,)
+        groups.setdefault(key, []).append(name)
+    return list(groups.values())
+
+
+def _low_discrepancy_ranks(n: int) -> npt.NDArray[np.intp]:
+    """Return a permutation of ``range(n)`` that spreads out consecutive values.
+
+    Ranks are assigned in the order of the base 2 van der Corput sequence, so that
+    every contiguous range of the result samples ``range(n)`` almost uniformly.
+    """
+    index = np.arange(n)
+    sequence = np.zeros(n)
+    scale = 1.0
+    while index.any():
+        scale /= 2
+        sequence += (index % 2) * scale
+        index //= 2
+    return np.argsort(np.argsort(sequence, kind="stable"))
+
+
+def _output_prefix(name: Hashable) -> str:
+    """Return the prefix of the output variables for a data variable."""
+    return "" if name is _THIS_ARRAY else f"{name!s}_"
+
+
+def _params_as_specs(params: typing.Any, option: str) -> dict[str, typing.Any]:
+    """Convert the `params` argument to a dict of parameter specifications."""
+    if isinstance(params, xr.DataArray | xr.Dataset | _ParametersWrapper):
+        raise TypeError(
+            f"{option} is not supported when params is given as a DataArray or "
+            "Dataset. Provide params as a dict-like object instead."
+        )
+    if isinstance(params, lmfit.Parameters):
+        return {
+            name: {
+                "value": par.value,
+                "vary": par.vary,
+                "min": par.min,
+                "max": par.max,
+                "expr": par.expr,
+            }
+            for name, par in params.items()
+        }
+    return dict(params) if params is not None else {}
+
+
+def _free_parameters(
+    model: lmfit.Model, specs: Mapping[str, typing.Any], names: Iterable[str]
+) -> list[str]:
+    """Select the parameters among `names` that vary freely in the fit."""
+    model_params = model.make_params()
+    free = []
+    for name in names:
+        spec = specs.get(name)
+        if isinstance(spec, Mapping) and (
+            spec.get("vary", True) is False or spec.get("expr") is not None
+        ):
+            continue
+        if (
+            name in model_params
+            and model_params[name].vary
+            and model_params[name].expr is None
+        ):
+            free.append(name)
+    return free
+
+
+def _with_initial_values(
+    specs: Mapping[str, typing.Any], values: Mapping[str, xr.DataArray]
+) -> dict[str, typing.Any]:
+    """Replace the initial values of parameter specifications with DataArrays."""
+    new_specs = dict(specs)
+    for name, value in values.items():
+        spec = specs.get(name)
+        new_specs[name] = (
+            {**spec, "value": value} if isinstance(spec, Mapping) else {"value": value}
+        )
+    return new_specs
 
 
 @register_xlm_dataset_accessor("modelfit")
@@ -522,30 +1929,59 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
 
     def _define_wrapper(
         self,
-        model: lmfit.Model,
         param_names: list[str],
         stat_names: list[str],
         n_coords: int,
-        parameter_plan: _ParameterPlan,
+        parameter_plan: _ParameterPlan | None,
         skipna: bool,
         guess: bool,
         errors: typing.Literal["raise", "ignore"],
-        output_result: bool,
-        model_fit_kwargs: Mapping[str, typing.Any],
+        output_result: bool | typing.Literal["lite", "stripped", "columnar"],
+        n_core_dims: int,
+        n_weight_core_dims: int | None,
+        engine: typing.Literal["lmfit", "batched", "linear"],
+        varpro: bool,
+        warm_start_axes: Sequence[int],
+        deduplicate: bool,
+        cache: _cache.FitCache | None,
+        executor: typing.Literal["processes", "threads"] | None,
+        n_workers: int | None,
+        pool: _parallel.ProcessPool | None,
+        outputs: Collection[str],
+        output_dtype: npt.DTypeLike,
+        expressions: Sequence[str] = (),
     ):
-        """Define a picklable wrapper for the model fitting."""
+        """Define a picklable block-wise wrapper for the model fitting.
+
+        The model, the fit options and, if given, the parameter plan are not part of
+        the wrapper, but are passed to it as a trailing input holding the objects
+        shared by all data variables; see :func:`_model_fit_shared_block`.
+        """
+        plan = {} if parameter_plan is None else {"parameter_plan": parameter_plan}
+        if expressions:
+            plan["expressions"] = expressions
         return functools.partial(
-            _model_fit_wrapper,
-            model=model,
+            _model_fit_shared_block,
+            n_core_dims=n_core_dims,
+            n_weight_core_dims=n_weight_core_dims,
+            engine=engine,
+            varpro=varpro,
+            warm_start_axes=warm_start_axes,
+            deduplicate=deduplicate,
+            cache=cache,
+            executor=executor,
+            n_workers=n_workers,
+            pool=pool,
+            outputs=outputs,
+            output_dtype=output_dtype,
             param_names=param_names,
             stat_names=stat_names,
             n_coords=n_coords,
-            parameter_plan=parameter_plan,
             skipna=skipna,
             guess=guess,
             errors=errors,
             output_result=output_result,
-            model_fit_kwargs=model_fit_kwargs,
+            **plan,
         )
 
     def _define_output_wrapper(
@@ -556,16 +1992,65 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         coords_,
         param_names: list[str],
         stat_names: list[str],
-        output_result: bool,
+        output_result: bool | typing.Literal["lite", "stripped", "columnar"],
         skipna: bool,
         guess: bool,
         errors: typing.Literal["raise", "ignore"],
         model_fit_kwargs: Mapping[str, typing.Any],
         weight_da: xr.DataArray | None,
+        engine: typing.Literal["lmfit", "batched", "linear"],
+        varpro: bool,
+        warm_start: Sequence[Hashable],
+        deduplicate: bool,
+        cache: _cache.FitCache | None,
+        executor: typing.Literal["processes", "threads"] | None,
+        n_workers: int | None,
+        pool: _parallel.ProcessPool | None = None,
+        outputs: Collection[str] = _OUTPUTS,
+        lazy_best_fit: bool = False,
+        components: bool = False,
+        output_dtype: npt.DTypeLike = np.float64,
     ) -> typing.Callable:
         n_params = len(param_names)
         n_stats = len(stat_names)
         dim_sizes = {dim: self._obj.coords[dim].size for dim in reduce_dims_}
+        lazy_best_fit = lazy_best_fit and "best_fit" in outputs
+        # The lazily evaluated curves are computed from the coefficients
+        fit_outputs = tuple(
+            output
+            for output in _FIT_OUTPUTS
+            if (output in outputs and not (output == "best_fit" and lazy_best_fit))
+            or (output == "coefficients" and (lazy_best_fit or components))
+        )
+        core_dims: dict[str, list[Hashable]] = {
+            "coefficients": ["param"],
+            "stderr": ["param"],
+            "covariance": ["cov_i", "cov_j"],
+            "stats": ["fit_stat"],
+            "best_fit": reduce_dims_,
+        }
+
+        shared = {"model": model, "model_fit_kwargs": model_fit_kwargs}
+        if not isinstance(params, xr.Dataset):
+            shared["parameter_plan"] = params.plan
+        holder = np.empty((), dtype=object)
+        holder[()] = shared
+        shared_inputs: dict[bool, xr.DataArray] = {}
+
+        def _shared_input(args: Sequence[xr.DataArray]) -> xr.DataArray:
+            # Created once for all data variables, so that dask stores the shared
+            # objects in a single key of the graph that every task depends on
+            lazy = any(arg.chunks is not None for arg in args)
+            if lazy not in shared_inputs:
+                if lazy:
+                    import dask.array
+
+                    shared_inputs[lazy] = xr.DataArray(
+                        dask.array.from_array(holder, chunks=(), name=False)
+                    )
+                else:
+                    shared_inputs[lazy] = xr.DataArray(holder)
+            return shared_inputs[lazy]
 
         def _output_wrapper(name, da, out) -> None:
             name = "" if name is _THIS_ARRAY else f"{name!s}_"
@@ -583,18 +2068,6 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
                 )
 
             parameter_arrays = _align_parameter_chunks(da, parameter_inputs.arrays)
-            _wrapper = self._define_wrapper(
-                model=model,
-                param_names=param_names,
-                stat_names=stat_names,
-                n_coords=len(coords_),
-                parameter_plan=parameter_inputs.plan,
-                skipna=skipna,
-                guess=guess,
-                errors=errors,
-                output_result=output_result,
-                model_fit_kwargs=model_fit_kwargs,
-            )
 
             # Positional arguments to wrapper
             args = [da, *coords_, *parameter_arrays]
@@ -605,62 +2078,572 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
             # Core dims for parameters
             input_core_dims.extend([] for _ in parameter_arrays)
 
+            n_weight_core_dims: int | None = None
             if isinstance(weight_da, xr.DataArray):
                 weights = weight_da.broadcast_like(da)
                 args.append(weights)
 
                 # Core dims for weights
                 input_core_dims.append([d for d in reduce_dims_ if d in weights.dims])
+                n_weight_core_dims = len(input_core_dims[-1])
+
+            # The loop dimensions of each block follow the order in `da`
+            loop_dims = [d for d in da.dims if d not in reduce_dims_]
+            warm_start_axes = tuple(
+                loop_dims.index(d) for d in warm_start if d in loop_dims
+            )
+            if len(warm_start) == 1 and warm_start_axes:
+                # Walk the whole dimension within a single block
+                args = [
+                    arg.chunk({warm_start[0]: -1})
+                    if arg.chunks is not None and warm_start[0] in arg.dims
+                    else arg
+                    for arg in args
+                ]
+
+            if executor == "processes" and any(arg.chunks is not None for arg in args):
+                raise ValueError(
+                    'engine="processes" does not support dask-backed inputs. Compute '
+                    'the inputs first, or fit with engine="lmfit" and a dask scheduler.'
+                )
+
+            # Objects shared by all blocks and data variables
+            args.append(_shared_input(args))
+            input_core_dims.append([])
+
+            expressions = (
+                _constraint_expressions(model, parameter_inputs)
+                if output_result == "columnar"
+                else ()
+            )
+
+            _wrapper = self._define_wrapper(
+                param_names=param_names,
+                stat_names=stat_names,
+                n_coords=len(coords_),
+                parameter_plan=(
+                    parameter_inputs.plan if isinstance(params, xr.Dataset) else None
+                ),
+                skipna=skipna,
+                guess=guess,
+                errors=errors,
+                output_result=output_result,
+                n_core_dims=len(reduce_dims_),
+                n_weight_core_dims=n_weight_core_dims,
+                engine=engine,
+                varpro=varpro,
+                warm_start_axes=warm_start_axes,
+                deduplicate=deduplicate,
+                cache=cache,
+                executor=executor,
+                n_workers=n_workers,
+                pool=pool,
+                outputs=fit_outputs,
+                output_dtype=output_dtype,
+                expressions=expressions,
+            )
 
-            output_core_dims: list[list[Hashable]] = [
-                ["param"],
-                ["param"],
-                ["cov_i", "cov_j"],
-                ["fit_stat"],
-                reduce_dims_,
+            output_core_dims = [core_dims[output] for output in fit_outputs]
+            output_dtypes: list[typing.Any] = [
+                np.float64 if output == "stats" else output_dtype
+                for output in fit_outputs
             ]
-            output_dtypes: list[typing.Any] = [np.float64] * 5
-            if output_result:
+            if output_result == "columnar":
+                for column_dims, column_dtype in _results.COLUMNS.values():
+                    output_core_dims.append(list(column_dims))
+                    output_dtypes.append(column_dtype)
+            elif output_result:
                 output_core_dims.append([])
                 output_dtypes.append(lmfit.model.ModelResult)
 
-            outputs = xr.apply_ufunc(
-                _wrapper,
-                *args,
-                vectorize=True,
-                dask="parallelized",
-                input_core_dims=input_core_dims,
-                output_core_dims=output_core_dims,
-                dask_gufunc_kwargs={
-                    "output_sizes": {
-                        "param": n_params,
-                        "fit_stat": n_stats,
-                        "cov_i": n_params,
-                        "cov_j": n_params,
-                    }
-                    | dim_sizes
+            output_sizes = {
+                "param": n_params,
+                "fit_stat": n_stats,
+                "cov_i": n_params,
+                "cov_j": n_params,
+            } | dim_sizes
+            output_dims = {dim for dims in output_core_dims for dim in dims}
+
+            fitted: tuple[xr.DataArray, ...] = ()
+            if output_core_dims:
+                fitted = xr.apply_ufunc(
+                    _wrapper,
+                    *args,
+                    dask="parallelized",
+                    input_core_dims=input_core_dims,
+                    output_core_dims=output_core_dims,
+                    dask_gufunc_kwargs={
+                        "output_sizes": {
+                            dim: size
+                            for dim, size in output_sizes.items()
+                            if dim in output_dims
+                        }
+                    },
+                    output_dtypes=output_dtypes,
+                    exclude_dims=set(reduce_dims_),
+                )
+                if len(output_core_dims) == 1:
+                    fitted = (typing.cast("xr.DataArray", fitted),)
+
+            if output_result in ("lite", "columnar"):
+                # Fit coordinates that are not stored with the results are unnamed
+                out[name + "modelfit_model"] = xr.DataArray(
+                    _results.describe_model(
+                        model,
+                        model_fit_kwargs.get("method", "leastsq"),
+                        expressions,
+                        [
+                            str(coord.name) if coord.name in self._obj.coords else None
+                            for coord in coords_
+                        ],
+                    )
+                )
+            if output_result == "columnar":
+                columns = fitted[-len(_results.COLUMNS) :]
+                fitted = fitted[: -len(_results.COLUMNS)]
+                for column, values in zip(_results.COLUMNS, columns, strict=True):
+                    out[f"{name}modelfit_result_{column}"] = values
+            elif output_result:
+                out[name + "modelfit_results"] = fitted[-1]
+
+            fitted_outputs = dict(zip(fit_outputs, fitted, strict=False))
+            curves: dict[str, xr.DataArray] = {}
+            if lazy_best_fit or components:
+                evaluate = functools.partial(
+                    _curves.CurveEvaluator,
+                    model=model,
+                    param_names=param_names,
+                    independent_vars=functools.partial(
+                        _independent_vars, model, len(coords_)
+                    ),
+                    n_core_dims=len(reduce_dims_),
+                    skipna=skipna,
+                    vectorized=engine != "lmfit",
+                    dtype=output_dtype,
+                )
+                if lazy_best_fit:
+                    curves["best_fit"] = _curve_array(
+                        evaluate(), fitted_outputs["coefficients"], da
+                    )
+                if components:
+                    curves["components"] = _curve_array(
+                        evaluate(components=model.components),
+                        fitted_outputs["coefficients"],
+                        da,
+                    )
+                for curve in curves.values():
+                    curve.attrs = fitted[0].attrs.copy()
+
+            for output in _OUTPUTS:
+                if output in fitted_outputs and output in outputs:
+                    out[f"{name}modelfit_{output}"] = fitted_outputs[output]
+                elif output in curves:
+                    out[f"{name}modelfit_{output}"] = curves[output]
+                elif output == "data" and output in outputs:
+                    data_dims = [dim for dim in da.dims if dim not in reduce_dims_]
+                    data_dims.extend(dim for dim in reduce_dims_ if dim in da.dims)
+                    data = da.transpose(*data_dims).astype(output_dtype, copy=False)
+                    data.attrs = fitted[0].attrs.copy() if fitted else da.attrs.copy()
+                    out[name + "modelfit_data"] = data
+            if "components" in curves:
+                out[name + "modelfit_components"] = curves["components"]
+
+        def _curve_array(
+            evaluate: _curves.CurveEvaluator,
+            coefficients: xr.DataArray,
+            da: xr.DataArray,
+        ) -> xr.DataArray:
+            # Curves evaluated from the coefficients when they are accessed, laid out
+            # like the best fit with the components before the fit dimensions
+            loop_dims = list(coefficients.dims[:-1])
+            curve_dims = list(reduce_dims_)
+            if evaluate.components is not None:
+                curve_dims.insert(0, "component")
+            if coefficients.chunks is not None:
+                return xr.apply_ufunc(
+                    evaluate,
+                    coefficients,
+                    da,
+                    *coords_,
+                    dask="parallelized",
+                    input_core_dims=[["param"], *([reduce_dims_] * (len(coords_) + 1))],
+                    output_core_dims=[curve_dims],
+                    dask_gufunc_kwargs={
+                        "output_sizes": dim_sizes
+                        | (
+                            {}
+                            if evaluate.components is None
+                            else {"component": len(evaluate.components)}
+                        )
+                    },
+                    output_dtypes=[output_dtype],
+                    exclude_dims=set(reduce_dims_),
+                )
+
+            # Lay out the inputs like the blocks of apply_ufunc, broadcasting the loop
+            # dimensions without copying
+            template = coefficients.isel(param=0, drop=True)
+
+            def _layout(obj: xr.DataArray) -> npt.NDArray:
+                obj = obj.broadcast_like(template)
+                return np.asarray(obj.transpose(*loop_dims, *reduce_dims_).data)
+
+            backend = _curves.CurveArray(
+                evaluate,
+                coefficients.transpose(*loop_dims, "param").values,
+                _layout(da),
+                [_layout(coord) for coord in coords_],
+            )
+            return xr.DataArray(
+                xr.Variable(
+                    [*loop_dims, *curve_dims], indexing.LazilyIndexedArray(backend)
+                ),
+                coords=template.coords,
+            )
+
+        return _output_wrapper
+
+    def _fit_dims(self, fit_kwargs: Mapping[str, typing.Any]) -> set[Hashable]:
+        """Find the dimensions that are reduced by the fit."""
+        coords = fit_kwargs["coords"]
+        if isinstance(coords, str | xr.DataArray) or not isinstance(coords, Iterable):
+            coords = [coords]
+        reduce_dims = fit_kwargs.get("reduce_dims") or []
+        if isinstance(reduce_dims, str) or not isinstance(reduce_dims, Iterable):
+            reduce_dims = [reduce_dims]
+        fit_dims = set(reduce_dims)
+        for coord in coords:
+            fit_dims.update(
+                (self._obj[coord] if isinstance(coord, str) else coord).dims
+            )
+        return fit_dims
+
+    def _coarse_to_fine(
+        self,
+        coarsen: Mapping[Hashable, int],
+        return_coarse: bool,
+        params: typing.Any,
+        fit_kwargs: dict[str, typing.Any],
+    ) -> xr.Dataset | tuple[xr.Dataset, xr.Dataset]:
+        """Fit a coarsened copy of the data, then refine at full resolution."""
+        unexpected = set(coarsen) - set(self._obj.dims)
+        if unexpected:
+            raise ValueError(
+                f"coarsen contains dimensions {tuple(unexpected)} that are not "
+                "dimensions of the calling object"
+            )
+        if any(int(factor) < 1 for factor in coarsen.values()):
+            raise ValueError("coarsen factors must be positive integers")
+
+        fit_dims = self._fit_dims(fit_kwargs)
+        if fit_dims & set(coarsen):
+            raise ValueError(
+                "coarsen can only be applied to preserved dimensions, but got "
+                f"{tuple(fit_dims & set(coarsen))}"
+            )
+
+        params = _params_as_specs(params, "coarsen")
+
+        def _coarsen(obj: typing.Any) -> typing.Any:
+            if not isinstance(obj, xr.DataArray | xr.Dataset):
+                return obj
+            windows = {d: int(f) for d, f in coarsen.items() if d in obj.dims}
+            if not windows:
+                return obj
+            return obj.coarsen(windows, boundary="pad").mean()
+
+        coarse_kwargs = fit_kwargs | {
+            "params": {
+                name: {k: _coarsen(v) for k, v in spec.items()}
+                if isinstance(spec, Mapping)
+                else _coarsen(spec)
+                for name, spec in params.items()
+            }
+        }
+        if "weights" in coarse_kwargs:
+            coarse_kwargs["weights"] = _coarsen(coarse_kwargs["weights"])
+        if fit_kwargs.get("outputs") is not None:
+            # The coarse coefficients initialize the full resolution fit
+            selected = fit_kwargs["outputs"]
+            if isinstance(selected, str):
+                selected = [selected]
+            coarse_kwargs["outputs"] = [*selected, "coefficients"]
+        coarse = _coarsen(self._obj).xlm.modelfit(**coarse_kwargs)
+
+        # Only free parameters are initialized from the coarse fit
+        seeded = _free_parameters(fit_kwargs["model"], params, coarse.param.values)
+
+        fine = []
+        for var_name in self._obj.data_vars:
+            coefficients = coarse[f"{_output_prefix(var_name)}modelfit_coefficients"]
+            fine_params = _with_initial_values(
+                params,
+                {
+                    name: _upsample_coarse(
+                        coefficients.sel(param=name, drop=True), coarsen, self._obj
+                    )
+                    for name in seeded
                 },
-                output_dtypes=output_dtypes,
-                exclude_dims=set(reduce_dims_),
             )
-            popt, perr, pcov, stats, best = outputs[:5]
+            fine.append(
+                self._obj[[var_name]].xlm.modelfit(
+                    **(fit_kwargs | {"params": fine_params})
+                )
+            )
+        result = xr.merge(fine, combine_attrs="override")
+
+        if return_coarse:
+            return result, coarse
+        return result
+
+    def _shuffled(
+        self,
+        shuffle: typing.Literal["random", "variance"],
+        params: typing.Any,
+        fit_kwargs: dict[str, typing.Any],
+    ) -> xr.Dataset:
+        """Fit the points along the preserved dimensions in a permuted order."""
+        if shuffle not in ("random", "variance"):
+            raise ValueError('shuffle must be "random", "variance" or None')
+        if fit_kwargs.get("warm_start") is not None:
+            raise ValueError("shuffle cannot be combined with warm_start")
+
+        fit_dims = self._fit_dims(fit_kwargs)
+        preserved = [d for d in self._obj.dims if d not in fit_dims]
+        if not preserved:
+            return self._obj.xlm.modelfit(
+                **(fit_kwargs | {"params": params, "shuffle": None})
+            )
+        shape = tuple(self._obj.sizes[d] for d in preserved)
+        n_points = math.prod(shape)
 
-            if output_result:
-                out[name + "modelfit_results"] = outputs[5]
+        if shuffle == "random":
+            order = np.random.default_rng(0).permutation(n_points)
+        else:
+            # Estimate the cost of each point, where flat or empty points are cheap
+            cost = xr.DataArray(0.0)
+            for da in self._obj.data_vars.values():
+                variance = da.var([d for d in da.dims if d in fit_dims], skipna=True)
+                cost = cost + variance.fillna(0.0)
+            cost = cost.expand_dims(
+                {d: self._obj.sizes[d] for d in preserved if d not in cost.dims}
+            ).transpose(*preserved)
+            # Spread the points sorted by cost so that any contiguous range of the
+            # permuted points has a similar total cost
+            ranked = np.argsort(-cost.values.ravel(), kind="stable")
+            order = ranked[_low_discrepancy_ranks(n_points)]
+
+        pixel_indexers = {
+            d: xr.DataArray(i, dims=_SHUFFLE_DIM)
+            for d, i in zip(preserved, np.unravel_index(order, shape), strict=True)
+        }
 
-            data_dims = [dim for dim in da.dims if dim not in reduce_dims_]
-            data_dims.extend(dim for dim in reduce_dims_ if dim in da.dims)
-            data = da.transpose(*data_dims).astype(np.float64, copy=False)
-            data.attrs = popt.attrs.copy()
+        def _permute(obj: typing.Any) -> typing.Any:
+            if isinstance(obj, lmfit.Parameters):
+                # The same for every point
+                return obj
+            if isinstance(obj, Mapping) and not isinstance(obj, xr.Dataset):
+                return {k: _permute(v) for k, v in obj.items()}
+            if not isinstance(obj, xr.DataArray | xr.Dataset):
+                return obj
+            # Coordinates along the preserved dimensions are restored afterwards
+            obj = obj.drop_vars(
+                [k for k, c in obj.coords.items() if set(c.dims) & set(preserved)]
+            )
+            indexers = {d: i for d, i in pixel_indexers.items() if d in obj.dims}
+            return obj.isel(indexers) if indexers else obj
 
-            out[name + "modelfit_coefficients"] = popt
-            out[name + "modelfit_stderr"] = perr
-            out[name + "modelfit_covariance"] = pcov
-            out[name + "modelfit_stats"] = stats
-            out[name + "modelfit_data"] = data
-            out[name + "modelfit_best_fit"] = best
+        permuted = _permute(self._obj)
+        chunksizes = self._obj.chunksizes
+        if chunksizes and preserved:
+            n_chunks = math.prod(len(chunksizes.get(d, (0,))) for d in preserved)
+            permuted = permuted.chunk({_SHUFFLE_DIM: math.ceil(n_points / n_chunks)})
 
-        return _output_wrapper
+        coords = fit_kwargs["coords"]
+        if isinstance(coords, str | xr.DataArray) or not isinstance(coords, Iterable):
+            coords = [coords]
+        coords = list(coords)
+        permuted_kwargs = fit_kwargs | {
+            "coords": [_permute(c) for c in coords],
+            "params": _permute(params),
+            "shuffle": None,
+        }
+        if "weights" in fit_kwargs:
+            permuted_kwargs["weights"] = _permute(fit_kwargs["weights"])
+        fitted = permuted.xlm.modelfit(**permuted_kwargs)
+
+        # Restore the original order and unstack the points
+        restored = typing.cast("xr.Dataset", fitted).isel(
+            {_SHUFFLE_DIM: np.argsort(order)}
+        )
+        restored = restored.assign_coords(
+            xr.Coordinates.from_pandas_multiindex(
+                pd.MultiIndex.from_arrays(
+                    np.unravel_index(np.arange(n_points), shape), names=preserved
+                ),
+                _SHUFFLE_DIM,
+            )
+        ).unstack(_SHUFFLE_DIM)
+        restored = restored.drop_vars(preserved)
+
+        def _inputs(name: Hashable, da: xr.DataArray) -> Iterable[typing.Any]:
+            # Arguments broadcast by apply_ufunc when fitting a data variable
+            yield da
+            yield from coords
+            if isinstance(params, xr.Dataset):
+                yield params.get(name)
+            elif isinstance(params, Mapping):
+                for spec in params.values():
+                    yield from spec.values() if isinstance(spec, Mapping) else [spec]
+            else:
+                yield params
+            yield fit_kwargs.get("weights")
+
+        # Without shuffling, the outputs of a data variable only have the preserved
+        # dimensions of the inputs it is fit with, in order of appearance, and the
+        # fitted data keeps the dimensions of the data variable
+        output_dims: dict[str, tuple[list[Hashable], list[Hashable]]] = {}
+        for name, da in self._obj.data_vars.items():
+            dims = [
+                d
+                for arg in _inputs(name, da)
+                if isinstance(arg, xr.DataArray)
+                for d in arg.dims
+                if d in preserved
+            ]
+            output_dims[_output_prefix(name)] = (
+                list(dict.fromkeys(dims)),
+                [d for d in da.dims if d in preserved],
+            )
+        for name, var in list(restored.data_vars.items()):
+            prefix = max(
+                (p for p in output_dims if str(name).startswith(f"{p}modelfit_")),
+                key=len,
+            )
+            loop_dims, data_dims = output_dims[prefix]
+            dims = data_dims if str(name) == f"{prefix}modelfit_data" else loop_dims
+            var = var.isel({d: 0 for d in preserved if d not in dims}, drop=True)
+            restored[name] = var.transpose(*dims, ...)
+        restored = restored.assign_coords(
+            {k: c for k, c in self._obj.coords.items() if set(c.dims) & set(preserved)}
+        )
+        restored.attrs = typing.cast("xr.Dataset", fitted).attrs
+        return restored
+
+    def _auto_chunks(
+        self,
+        preserved_dims: Sequence[Hashable],
+        wrapper_kwargs: dict[str, typing.Any],
+        n_variables: int = 1,
+    ) -> dict[Hashable, tuple[int, ...]]:
+        """Choose the chunks of the preserved dimensions from the cost of a few fits.
+
+        A few points of the first data variable spread along the preserved dimensions
+        are fit to measure the time and output memory of a single fit, including the
+        best fit and :class:`lmfit.model.ModelResult` objects. The preserved
+        dimensions are then chunked so that each task takes about
+        `_AUTO_CHUNK_SECONDS`, its outputs fit in the dask ``array.chunk-size``, and
+        there are at least as many tasks as CPUs. Each task fits `n_variables` data
+        variables that are fused together.
+        """
+        try:
+            import dask
+            import dask.array
+            import dask.utils
+        except ImportError as e:
+            raise RuntimeError(
+                "chunks='auto' requires the 'dask' package. "
+                "Install with: pip install dask"
+            ) from e
+
+        shape = {dim: self._obj.sizes[dim] for dim in preserved_dims}
+        n_points = math.prod(shape.values())
+        if n_points == 0:
+            return {dim: (size,) for dim, size in shape.items()}
+
+        # Sample points spread along the longest preserved dimension
+        longest = max(shape, key=shape.__getitem__, default=None)
+        indexers: dict[Hashable, typing.Any] = {dim: [0] for dim in shape}
+        if longest is not None:
+            indexers[longest] = np.unique(
+                np.linspace(0, shape[longest] - 1, _AUTO_CHUNK_SAMPLES).astype(int)
+            )
+
+        def _sample(obj: typing.Any, indexers: Mapping[Hashable, typing.Any]):
+            if not isinstance(obj, xr.DataArray | xr.Dataset):
+                return obj
+            return obj.isel(
+                {dim: i for dim, i in indexers.items() if dim in obj.dims}
+            ).compute()
+
+        def _fit_sample(indexers: Mapping[Hashable, typing.Any]) -> xr.Dataset:
+            params = wrapper_kwargs["params"]
+            if isinstance(params, _ParameterInputs):
+                params = dataclasses.replace(
+                    params,
+                    arrays=tuple(_sample(array, indexers) for array in params.arrays),
+                )
+            else:
+                params = _sample(params, indexers)
+            name, da = next(iter(self._obj.data_vars.items()))
+            sampled = typing.cast("xr.DataArray", _sample(da, indexers))
+            output_wrapper = ModelFitDatasetAccessor(
+                sampled.to_dataset(name=name)
+            )._define_output_wrapper(
+                **(
+                    wrapper_kwargs
+                    | {
+                        "params": params,
+                        "coords_": [
+                            _sample(c, indexers) for c in wrapper_kwargs["coords_"]
+                        ],
+                        "weight_da": _sample(wrapper_kwargs["weight_da"], indexers),
+                        "warm_start": [],
+                        "deduplicate": False,
+                        "cache": None,
+                        "executor": None,
+                        "n_workers": None,
+                        "pool": None,
+                    }
+                )
+            )
+            out = xr.Dataset()
+            output_wrapper(name, sampled, out)
+            return out
+
+        # The first fit includes one-time setup costs, so it is not timed
+        _fit_sample({dim: [0] for dim in shape})
+        start = time.perf_counter()
+        out = _fit_sample(indexers)
+        elapsed = time.perf_counter() - start
+
+        n_sampled = math.prod(len(i) for i in indexers.values())
+        elapsed *= n_variables
+        nbytes = sum(
+            var.nbytes for var in out.data_vars.values() if var.dtype != object
+        )
+        for var in out.data_vars.values():
+            if var.dtype == object:
+                nbytes += len(pickle.dumps(var.values))
+        nbytes *= n_variables
+
+        target_bytes = dask.utils.parse_bytes(dask.config.get("array.chunk-size"))
+        n_cpus = getattr(os, "process_cpu_count", os.cpu_count)() or 1
+        points_per_task = max(
+            1,
+            min(
+                _AUTO_CHUNK_SECONDS * n_sampled / max(elapsed, 1e-9),
+                target_bytes * n_sampled / max(nbytes, 1),
+                math.ceil(n_points / n_cpus),
+            ),
+        )
+        chunks = dask.array.core.normalize_chunks(
+            tuple("auto" for _ in shape),
+            shape=tuple(shape.values()),
+            limit=int(points_per_task) * 8,
+            dtype=np.float64,
+        )
+        return dict(zip(shape, chunks, strict=True))
 
     def __call__(
         self,
@@ -677,10 +2660,26 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         guess: bool = False,
         errors: typing.Literal["raise", "ignore"] = "raise",
         progress: bool = False,
-        output_result: bool = True,
+        output_result: bool | typing.Literal["lite", "stripped", "columnar"] = True,
         param_names: list[str] | None = None,
+        engine: typing.Literal[
+            "lmfit", "batched", "linear", "processes", "threads"
+        ] = "lmfit",
+        varpro: bool = False,
+        warm_start: Hashable | Sequence[Hashable] | None = None,
+        coarsen: Mapping[Hashable, int] | None = None,
+        return_coarse: bool = False,
+        deduplicate: bool = False,
+        cache: _cache.FitCache | str | os.PathLike | None = None,
+        n_workers: int | None = None,
+        chunks: typing.Literal["auto"] | None = None,
+        shuffle: typing.Literal["random", "variance"] | None = None,
+        outputs: str | Collection[str] | None = None,
+        lazy_best_fit: bool = False,
+        components: bool = False,
+        output_dtype: npt.DTypeLike = np.float64,
         **kwargs,
-    ) -> xr.Dataset:
+    ) -> xr.Dataset | tuple[xr.Dataset, xr.Dataset]:
         """Curve fitting optimization for arbitrary models.
 
         Wraps :meth:`lmfit.Model.fit <lmfit.model.Model.fit>` with
@@ -740,17 +2739,187 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
             will be NaN.
         progress : bool, default: `False`
             Whether to show a progress bar for fitting over data variables. Only useful
-            if there are multiple data variables to fit. Requires the ``tqdm`` package
-            to be installed.
-        output_result : bool, default: `True`
+            if there are multiple data variables to fit. Dask-backed data variables
+            with the same dimensions, dtype and chunks are fit together in a single
+            pass unless `params` is a Dataset, so the progress bar counts groups of
+            such variables.
+            Requires the ``tqdm`` package to be installed.
+        output_result : bool, "stripped", "lite" or "columnar", default: `True`
             Whether to include the full :class:`lmfit.model.ModelResult` object in the
             output dataset. If `True`, the result will be stored in a variable named
-            `[var]_modelfit_results`.
+            `[var]_modelfit_results`. If ``"stripped"``, the residual, initial fit and
+            best fit of successful fits are dropped from the results, which cuts their
+            memory and the cost of transferring them between dask workers; they are
+            evaluated again from the parameters when accessed, for example by
+            :meth:`plot <lmfit.model.ModelResult.plot>` or :meth:`dumps
+            <lmfit.model.ModelResult.dumps>`. If ``"lite"``, a compact
+            :class:`LiteModelResult <xarray_lmfit.LiteModelResult>` is stored instead,
+            which holds the parameter values, bounds, errors, correlations and the
+            status of the fit but no arrays, and can rebuild the full result on
+            demand. If ``"columnar"``, the contents of the lite results are stored as
+            numeric `[var]_modelfit_result_*` variables instead of an object array,
+            which can be saved to any format and computed without pickling. Both
+            store a single `[var]_modelfit_model` description of the model, and are
+            read back point by point with ``Dataset.xlm.modelfit_results``.
         param_names : list of str, optional
             List of parameter names to include in the output dataset. If not provided,
             defaults to :attr:`lmfit.Model.param_names <lmfit.model.Model.param_names>`
             (after calling :meth:`lmfit.Model.make_params
             <lmfit.model.Model.make_params>`).
+        engine : {"lmfit", "batched", "linear", "processes", "threads"}, optional
+            The fitting engine. Defaults to ``"lmfit"``.
+
+            - ``"lmfit"`` fits each point separately with :meth:`lmfit.Model.fit
+              <lmfit.model.Model.fit>`.
+
+            - ``"batched"`` fits all points of a block at once with a vectorized
+              Levenberg-Marquardt least-squares solver, which is much faster when
+              fitting many small curves. The model function must broadcast over a
+              leading batch axis of the parameters, which holds for most lineshapes
+              from :mod:`lmfit.models`. Parameters may have bounds, but model
+              parameters may not have constraint expressions. Only the ``max_nfev``,
+              ``scale_covar`` and ``fit_kws`` (``ftol`` and ``xtol``) keyword
+              arguments are supported, and `output_result` must be `False`. Standard
+              errors of derived parameters are not computed.
+
+            - ``"linear"`` solves models that are linear in their parameters in closed
+              form with a single vectorized weighted least-squares solve per block.
+              Supported models are :class:`lmfit.models.ConstantModel`,
+              :class:`lmfit.models.LinearModel`, :class:`lmfit.models.QuadraticModel`,
+              :class:`lmfit.models.PolynomialModel` and sums or differences of these.
+              Varying parameters may not have bounds, only the ``scale_covar`` keyword
+              argument is supported, and `output_result` must be `False`. The
+              ``nfev`` statistic is NaN, as no function evaluations are counted.
+
+            - ``"processes"`` fits each point with :meth:`lmfit.Model.fit
+              <lmfit.model.Model.fit>` like ``"lmfit"``, but distributes the points of
+              each chunk over a pool of `n_workers` processes without requiring dask.
+              The data, coordinates and outputs are placed in shared memory instead
+              of being copied to each task, and the model and parameters are sent to
+              each worker once per data variable. The worker processes are started
+              once and reused for all data variables. Only supports NumPy-backed
+              inputs, and cannot be combined with `warm_start` or ``chunks="auto"``.
+
+            - ``"threads"`` is like ``"processes"``, but uses a pool of `n_workers`
+              threads in the current process that share the model and arrays without
+              copying. This avoids the startup and pickling costs of processes, but
+              only speeds up fitting if the model function spends most of its time in
+              code that releases the GIL, such as large NumPy or SciPy operations.
+        varpro : bool, default: `False`
+            Whether to fit with variable projection. Parameters that enter the model
+            linearly, such as the amplitudes of peaks from :mod:`lmfit.models` and the
+            coefficients of polynomial models in a sum of components, are eliminated
+            by linear least squares so that the optimizer only searches over the
+            remaining nonlinear parameters. The projected solution is then refined
+            with :meth:`lmfit.Model.fit <lmfit.model.Model.fit>` to obtain the full
+            results and covariance matrix. Linear parameters with bounds or
+            constraint expressions, or that other parameters depend on, are optimized
+            as usual. Only supported with the ``"lmfit"``, ``"processes"`` and
+            ``"threads"`` engines.
+        warm_start : Hashable or Sequence of Hashable, optional
+            Preserved dimension(s) along which to propagate the fit results, which
+            speeds up fitting slowly varying data such as temperature series or
+            spatial maps. Each fit starts from the best-fit values of an already
+            fitted neighbouring point along these dimensions, or from the initial
+            parameters if no neighbour has been fitted successfully.
+
+            - If a single dimension is given, the fits are performed in order along
+              it, each starting from the previous one. The dimension is rechunked into
+              a single chunk so that it can be walked sequentially, while other
+              dimensions are still fit in parallel.
+
+            - If multiple dimensions are given, each chunk is traversed in a
+              serpentine order over these dimensions so that consecutive fits are
+              neighbours. Chunks are fit independently, so larger chunks along these
+              dimensions trade parallelism for more warm starts.
+
+            Only supported with the ``"lmfit"`` engine.
+        coarsen : dict of Hashable to int, optional
+            Coarse-to-fine fitting. If given, the data is first binned along the given
+            preserved dimensions by the corresponding integer factors and fit at the
+            coarse resolution. The coarse best-fit values of the free parameters are
+            then interpolated back to the full resolution and used as the initial
+            values of the full resolution fit, which reduces the number of iterations
+            for large, noisy maps. Coarse fits that fail are filled from neighbouring
+            bins, or fall back to the initial parameters. `params` must be given as a
+            dict-like object or :class:`lmfit.Parameters
+            <lmfit.parameter.Parameters>`, and DataArrays in it are binned along with
+            the data.
+        return_coarse : bool, default: `False`
+            If `True` and `coarsen` is given, return a tuple of the full resolution
+            and the coarse resolution results.
+        deduplicate : bool, default: `False`
+            Whether to fit points with identical inputs only once. Within each chunk,
+            the data, coordinates, weights and parameters of every point are hashed,
+            and the results of the first fit are copied to all points with the same
+            inputs. The :class:`lmfit.model.ModelResult` objects of such points are
+            shared by reference. Useful for data with many identical points, such as
+            masked or padded regions. With the ``"processes"`` and ``"threads"``
+            engines, only points fit by the same task are compared. Only supported
+            with the ``"lmfit"``, ``"processes"`` and ``"threads"`` engines, and
+            cannot be combined with `warm_start`.
+        cache : FitCache, str or path-like, optional
+            A :class:`FitCache <xarray_lmfit.FitCache>` or a path to a cache directory
+            in which to store the fit results of each chunk. When the same fit is run
+            again, chunks with unchanged inputs are loaded from the cache instead of
+            being refit.
+        n_workers : int, optional
+            Number of workers for the ``"processes"`` and ``"threads"`` engines.
+            Defaults to the number of CPUs available to the current process.
+        chunks : "auto", optional
+            If ``"auto"``, rechunk the preserved dimensions with dask before fitting,
+            choosing the chunk sizes from the measured cost of fitting a few points of
+            the first data variable. The chunks are chosen so that each task takes
+            about a second, the outputs of each task including the best fit and
+            :class:`lmfit.model.ModelResult` objects fit within the dask
+            ``array.chunk-size`` configuration, and there are at least as many tasks
+            as CPUs. The chosen chunks are stored as a JSON string in the
+            ``modelfit_chunks`` attribute of the result. Requires dask.
+        shuffle : {"random", "variance"}, optional
+            Balance the cost of the tasks when the cost of a fit varies across the
+            preserved dimensions. The points along the preserved dimensions are
+            permuted into a single temporary dimension, fit, and restored to their
+            original order, so the result is the same as without shuffling. The
+            temporary dimension has as many chunks as the data had along the
+            preserved dimensions.
+
+            - ``"random"`` permutes the points randomly with a fixed seed.
+
+            - ``"variance"`` estimates the cost of each point by the variance of the
+              data along the fit dimensions, summed over all data variables, and
+              interleaves the points so that every chunk receives a similar share of
+              costly and cheap points.
+
+            Cannot be combined with `warm_start`.
+        outputs : str or sequence of str, optional
+            Names of the output variables to compute, without the ``modelfit_``
+            prefix: any of ``"coefficients"``, ``"stderr"``, ``"covariance"``,
+            ``"stats"``, ``"data"`` and ``"best_fit"``. The other variables are
+            neither allocated nor filled, which saves memory for large fits where the
+            best fit or the covariance matrices are not needed. If not provided, all
+            variables are included. Whether the :class:`lmfit.model.ModelResult`
+            objects are included is controlled separately by `output_result`.
+        lazy_best_fit : bool, default: `False`
+            If `True`, the best fit is not computed with the fit but evaluated from
+            the coefficients when it is accessed, so that it takes no memory. For
+            in-memory data, only the pixels selected by indexing are evaluated; for
+            dask arrays, the best fit is a dask array evaluated chunk by chunk. The
+            values are the same as without this option, but are evaluated again on
+            every access; call :meth:`xarray.Dataset.load` to keep them.
+            `param_names` must then include every parameter of the model.
+        components : bool, default: `False`
+            If `True`, include the curve of each component of a
+            :class:`lmfit.CompositeModel <lmfit.model.CompositeModel>` along a
+            ``component`` dimension labeled like
+            :meth:`lmfit.Model.eval_components <lmfit.model.Model.eval_components>`,
+            evaluated lazily from the coefficients like with `lazy_best_fit`.
+        output_dtype : data-type, default: `numpy.float64`
+            Floating point type in which the coefficients, standard errors,
+            covariances, data and best fit are stored. The fits are always computed in
+            double precision and converted when stored, so ``numpy.float32`` halves the
+            memory of the results at the cost of precision. The statistics are always
+            stored as ``numpy.float64``. If the data is already of this type, it is
+            included in the results without a copy.
         **kwargs : optional
             Additional keyword arguments to passed to :meth:`lmfit.Model.fit
             <lmfit.model.Model.fit>`.
@@ -762,11 +2931,31 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         Returns
         -------
         xarray.Dataset
-            A single dataset which contains:
+            A single dataset which contains the variables below, restricted to
+            `outputs` if given. If `return_coarse` is `True`, a tuple of this dataset
+            and the corresponding dataset for the coarse fit is returned instead.
 
             [var]_modelfit_results
-                The full :class:`lmfit.model.ModelResult` object from the fit. Only
-                included if `output_result` is `True`.
+                The full :class:`lmfit.model.ModelResult` object from the fit, or a
+                :class:`LiteModelResult <xarray_lmfit.LiteModelResult>` if
+                `output_result` is ``"lite"``. Only included if `output_result` is
+                `True`, ``"stripped"`` or ``"lite"``.
+            [var]_modelfit_result_*
+                The contents of the fit results as numeric arrays: ``status``,
+                ``success``, ``message`` and ``nfev`` of each fit, where message codes
+                index the ``"messages"`` of `[var]_modelfit_model` and are -1 for
+                other messages, and ``init_values``, ``best_values``, ``stderr``,
+                ``min``, ``max``, ``expr`` and ``correl`` of the parameters as reported
+                by lmfit. Expression codes index the ``"expressions"`` of
+                `[var]_modelfit_model`, and are -1 for parameters without a
+                constraint and -2 for expressions that are not known before fitting,
+                such as those in JSON strings, for which the expression of the
+                model's parameter hint is used. Only included if `output_result` is
+                ``"columnar"``.
+            [var]_modelfit_model
+                A JSON description of the model, fit method and fit coordinates shared
+                by all fits. Only included if `output_result` is ``"lite"`` or
+                ``"columnar"``.
             [var]_modelfit_coefficients
                 The coefficients of the best fit.
             [var]_modelfit_stderr
@@ -782,6 +2971,9 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
                 Data used for the fit.
             [var]_modelfit_best_fit
                 The best fit data of the fit.
+            [var]_modelfit_components
+                The curves of the components of the model. Only included if
+                `components` is `True`.
 
         See Also
         --------
@@ -796,6 +2988,35 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         """
         # Implementation analogous to xarray.Dataset.curve_fit
 
+        if coarsen or shuffle is not None:
+            fit_kwargs = {
+                "coords": coords,
+                "model": model,
+                "reduce_dims": reduce_dims,
+                "skipna": skipna,
+                "guess": guess,
+                "errors": errors,
+                "progress": progress,
+                "output_result": output_result,
+                "param_names": param_names,
+                "engine": engine,
+                "varpro": varpro,
+                "warm_start": warm_start,
+                "deduplicate": deduplicate,
+                "cache": cache,
+                "n_workers": n_workers,
+                "chunks": chunks,
+                "shuffle": shuffle,
+                "outputs": outputs,
+                "lazy_best_fit": lazy_best_fit,
+                "components": components,
+                "output_dtype": output_dtype,
+                **kwargs,
+            }
+            if coarsen:
+                return self._coarse_to_fine(coarsen, return_coarse, params, fit_kwargs)
+            return self._shuffled(shuffle, params, fit_kwargs)
+
         if params is None:
             params = lmfit.create_params()
 
@@ -896,6 +3117,89 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         if errors not in ["raise", "ignore"]:
             raise ValueError('errors must be either "raise" or "ignore"')
 
+        if output_result not in (True, False, "stripped", "lite", "columnar"):
+            raise ValueError(
+                'output_result must be True, False, "stripped", "lite" or "columnar"'
+            )
+
+        if engine not in ["lmfit", "batched", "linear", "processes", "threads"]:
+            raise ValueError(
+                'engine must be one of "lmfit", "batched", "linear", "processes" or '
+                '"threads"'
+            )
+        executor: typing.Literal["processes", "threads"] | None = None
+        if engine in ("processes", "threads"):
+            # Fit with lmfit, distributing the points over a pool of workers
+            executor, engine = engine, "lmfit"
+        if n_workers is not None:
+            if executor is None:
+                raise ValueError(
+                    'n_workers is only supported with engine="processes" or "threads"'
+                )
+            if n_workers < 1:
+                raise ValueError("n_workers must be a positive integer")
+        if engine != "lmfit" and output_result:
+            raise ValueError(
+                f"The {engine} engine does not create lmfit.model.ModelResult "
+                "objects. Pass output_result=False."
+            )
+        if varpro and engine != "lmfit":
+            raise ValueError(
+                'varpro is only supported with engine="lmfit", "processes" or "threads"'
+            )
+        if engine == "linear" and not _batched.is_linear_model(model):
+            raise ValueError(
+                f"The linear engine requires a model that is linear in its "
+                f"parameters, but got {model}. Supported models are ConstantModel, "
+                "LinearModel, QuadraticModel, PolynomialModel and sums or "
+                "differences of these."
+            )
+
+        warm_start_: list[Hashable]
+        if warm_start is None:
+            warm_start_ = []
+        elif isinstance(warm_start, str) or not isinstance(warm_start, Iterable):
+            warm_start_ = [warm_start]
+        else:
+            warm_start_ = list(warm_start)
+        if warm_start_:
+            unexpected = [d for d in warm_start_ if d not in preserved_dims]
+            if unexpected:
+                raise ValueError(
+                    f"warm_start must only contain preserved dimensions "
+                    f"{preserved_dims}, but got {unexpected}"
+                )
+            if engine != "lmfit" or executor is not None:
+                raise ValueError('warm_start is only supported with engine="lmfit"')
+        if deduplicate:
+            if engine != "lmfit":
+                raise ValueError(
+                    'deduplicate is only supported with engine="lmfit", "processes" or '
+                    '"threads"'
+                )
+            if warm_start_:
+                raise ValueError("deduplicate cannot be combined with warm_start")
+        if cache is not None and not isinstance(cache, _cache.FitCache):
+            cache = _cache.FitCache(cache)
+        if chunks not in (None, "auto"):
+            raise ValueError('chunks must be "auto" or None')
+        if chunks == "auto" and executor == "processes":
+            raise ValueError('chunks="auto" cannot be combined with engine="processes"')
+        output_dtype_ = np.dtype(output_dtype)
+        if output_dtype_.kind != "f":
+            raise ValueError(
+                f"output_dtype must be a floating point type, but got {output_dtype_}"
+            )
+        if outputs is None:
+            outputs = _OUTPUTS
+        elif isinstance(outputs, str):
+            outputs = [outputs]
+        unknown = [output for output in outputs if output not in _OUTPUTS]
+        if unknown:
+            raise ValueError(
+                f"Unknown outputs {unknown}; outputs must be chosen from {_OUTPUTS}"
+            )
+
         # Broadcast all coords with each other
         coords_ = xr.broadcast(*coords_)
         coords_ = [
@@ -909,6 +3213,13 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
 
             # Get the parameter names (assume no expressions)
             param_names = model.param_names
+        if lazy_best_fit or components:
+            missing = [name for name in model.param_names if name not in param_names]
+            if missing:
+                raise ValueError(
+                    "lazy_best_fit and components evaluate the model from the "
+                    f"coefficients, but param_names is missing {missing}"
+                )
 
         # Define the statistics to extract from the fit result
         stat_names = [
@@ -928,22 +3239,57 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
         if isinstance(model_fit_kwargs.get("weights"), xr.DataArray):
             weight_da = typing.cast("xr.DataArray", model_fit_kwargs.pop("weights"))
 
-        _output_wrapper = self._define_output_wrapper(
-            model=model,
-            params=params,
-            reduce_dims_=reduce_dims_,
-            coords_=coords_,
-            param_names=param_names,
-            stat_names=stat_names,
-            output_result=output_result,
-            skipna=skipna,
-            guess=guess,
-            errors=errors,
-            model_fit_kwargs=model_fit_kwargs,
-            weight_da=weight_da,
-        )
+        # Worker processes are started once and fit all blocks of the call
+        pool = _parallel.ProcessPool(n_workers) if executor == "processes" else None
+        wrapper_kwargs: dict[str, typing.Any] = {
+            "model": model,
+            "params": params,
+            "reduce_dims_": reduce_dims_,
+            "coords_": coords_,
+            "param_names": param_names,
+            "stat_names": stat_names,
+            "output_result": output_result,
+            "skipna": skipna,
+            "guess": guess,
+            "errors": errors,
+            "model_fit_kwargs": model_fit_kwargs,
+            "weight_da": weight_da,
+            "engine": engine,
+            "varpro": varpro,
+            "warm_start": warm_start_,
+            "deduplicate": deduplicate,
+            "cache": cache,
+            "executor": executor,
+            "n_workers": n_workers,
+            "pool": pool,
+            "outputs": tuple(output for output in _OUTPUTS if output in outputs),
+            "lazy_best_fit": lazy_best_fit,
+            "components": components,
+            "output_dtype": output_dtype_,
+        }
+        _output_wrapper = self._define_output_wrapper(**wrapper_kwargs)
         result = xr.Dataset()
 
+        data_vars = self._obj.data_vars
+        fuse = not isinstance(params, xr.Dataset)
+        chunking: dict[Hashable, tuple[int, ...]] | None = None
+        if chunks == "auto":
+            preserved = [d for d in self._obj.dims if d in preserved_dims]
+            # Rechunking gives data variables with the same dimensions the same
+            # chunks, so they are fused into the same tasks
+            n_fused = max(
+                (len(names) for names in _fusion_groups(data_vars, chunks=False)),
+                default=1,
+            )
+            chunking = self._auto_chunks(
+                preserved, wrapper_kwargs, n_variables=n_fused if fuse else 1
+            )
+            data_vars = self._obj.chunk(
+                chunking | {d: -1 for d in reduce_dims_ if d in self._obj.dims}
+            ).data_vars
+
+        groups = _fusion_groups(data_vars) if fuse else [[name] for name in data_vars]
+
         if progress:
             try:
                 import tqdm.auto as tqdm
@@ -952,27 +3298,56 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
                     "progress bars require the 'tqdm' package. "
                     "Install with: pip install tqdm"
                 ) from e
-            var_items_iter = tqdm.tqdm(
-                self._obj.data_vars.items(),
-                desc="Fitting",
-                total=len(self._obj.data_vars),
-            )
+            groups_iter = tqdm.tqdm(groups, desc="Fitting", total=len(groups))
         else:
-            var_items_iter = self._obj.data_vars.items()
-
-        for name, da in var_items_iter:
-            _output_wrapper(name, da, result)
-
+            groups_iter = groups
+
+        fitted: dict[Hashable, xr.Dataset] = {}
+        with pool if pool is not None else contextlib.nullcontext():
+            for names in groups_iter:
+                out = xr.Dataset()
+                if len(names) == 1:
+                    _output_wrapper(names[0], data_vars[names[0]], out)
+                    fitted[names[0]] = out
+                    continue
+
+                # Stack the data variables along a temporary dimension and fit them in
+                # a single pass, then split the outputs back into each variable
+                fused = xr.Variable.concat(
+                    [data_vars[name].variable for name in names], dim=_FUSED_DIM
+                )
+                fused_da = xr.DataArray(fused, coords=data_vars[names[0]].coords)
+                if fused.chunks is not None:
+                    fused_da = fused_da.chunk({_FUSED_DIM: -1})
+                _output_wrapper(_THIS_ARRAY, fused_da, out)
+                for i, name in enumerate(names):
+                    fitted[name] = xr.Dataset()
+                    for key, var in out.data_vars.items():
+                        # The model description is shared by the fused variables
+                        split = (
+                            var.isel({_FUSED_DIM: i}) if _FUSED_DIM in var.dims else var
+                        )
+                        split.attrs = data_vars[name].attrs.copy()
+                        fitted[name][f"{name!s}_{key!s}"] = split
+
+        for name in data_vars:
+            result.update(fitted[name])
+
+        result_coords = {
+            "param": param_names,
+            "fit_stat": stat_names,
+            "cov_i": param_names,
+            "cov_j": param_names,
+            "component": _curves.component_names(model.components),
+        } | {dim: self._obj.coords[dim] for dim in reduce_dims_}
         result = result.assign_coords(
-            {
-                "param": param_names,
-                "fit_stat": stat_names,
-                "cov_i": param_names,
-                "cov_j": param_names,
-            }
-            | {dim: self._obj.coords[dim] for dim in reduce_dims_}
+            {dim: coord for dim, coord in result_coords.items() if dim in result.dims}
         )
         result.attrs = self._obj.attrs.copy()
+        if chunking is not None:
+            result.attrs["modelfit_chunks"] = json.dumps(
+                {str(dim): list(sizes) for dim, sizes in chunking.items()}
+            )
 
         return result
 
@@ -981,7 +3356,7 @@ class ModelFitDatasetAccessor(XLMDatasetAccessor):
 class ModelFitDataArrayAccessor(XLMDataArrayAccessor):
     """`xarray.DataArray.modelfit` accessor for fitting lmfit models."""
 
-    def __call__(self, *args, **kwargs) -> xr.Dataset:
+    def __call__(self, *args, **kwargs) -> xr.Dataset | tuple[xr.Dataset, xr.Dataset]:
         return self._obj.to_dataset(name=_THIS_ARRAY).xlm.modelfit(*args, **kwargs)
 
     __call__.__doc__ = (
@@ -990,3 +3365,227 @@ class ModelFitDataArrayAccessor(XLMDataArrayAccessor):
         .replace("Dataset.polyfit", "DataArray.polyfit")
         .replace("[var]_", "")
     )
+
+
+@register_xlm_dataset_accessor("modelfit_update")
+class ModelFitUpdateDatasetAccessor(XLMDatasetAccessor):
+    """`xarray.Dataset.modelfit_update` accessor for extending fit results."""
+
+    def __call__(
+        self,
+        previous: xr.Dataset,
+        dim: Hashable,
+        coords: str | xr.DataArray | Iterable[str | xr.DataArray],
+        model: lmfit.Model,
+        params: lmfit.Parameters
+        | dict[str, float | dict[str, typing.Any]]
+        | xr.DataArray
+        | xr.Dataset
+        | None = None,
+        warm_start: bool = False,
+        **kwargs,
+    ) -> xr.Dataset:
+        """Extend the results of a previous fit with data appended along a dimension.
+
+        Only the data along `dim` that is not present in `previous` is fit, and the
+        results are concatenated to `previous`. The cost of an update therefore
+        scales with the size of the new data rather than the total size.
+
+        Parameters
+        ----------
+        previous : xarray.Dataset
+            Results of a previous fit of the same model, as returned by
+            :meth:`xarray.Dataset.xlm.modelfit`.
+        dim : Hashable
+            Preserved dimension along which the data was appended. If it has an index
+            in both the calling object and `previous`, the labels that are not in
+            `previous` are fit. Otherwise, the data beyond the length of `previous`
+            along `dim` is fit.
+        coords : Hashable, xarray.DataArray, or Sequence of Hashable or xarray.DataArray
+            Independent coordinate(s) over which to perform the curve fitting. See
+            :meth:`xarray.Dataset.xlm.modelfit`.
+        model : lmfit.Model
+            The model used to obtain `previous`.
+        params : lmfit.Parameters, dict-like, DataArray or Dataset, optional
+            Initial parameters of the fit. See :meth:`xarray.Dataset.xlm.modelfit`.
+        warm_start : bool, default: `False`
+            If `True`, the fit of the first new slab starts from the best-fit values of
+            the last slab of `previous`, and each subsequent slab starts from the one
+            before it. `params` must then be given as a dict-like object or
+            :class:`lmfit.Parameters <lmfit.parameter.Parameters>`.
+        **kwargs : optional
+            Additional keyword arguments passed to :meth:`xarray.Dataset.xlm.modelfit`.
+            These should match the arguments used to obtain `previous`.
+
+        Returns
+        -------
+        xarray.Dataset
+            `previous` concatenated with the results for the new data along `dim`,
+            including the ``modelfit_results`` variables if present.
+
+        """
+        if dim not in self._obj.dims or dim not in previous.dims:
+            raise ValueError(
+                f"Dimension {dim!r} must be present in both the data and the "
+                "previous results"
+            )
+        if kwargs.get("return_coarse"):
+            raise ValueError("return_coarse is not supported by modelfit_update")
+
+        if dim in self._obj.indexes and dim in previous.indexes:
+            is_new = ~self._obj.indexes[dim].isin(previous.indexes[dim])
+            new = self._obj.isel({dim: np.flatnonzero(is_new)})
+        else:
+            new = self._obj.isel({dim: slice(previous.sizes[dim], None)})
+        var_names = [name for name, var in new.data_vars.items() if dim in var.dims]
+        if new.sizes[dim] == 0 or not var_names:
+            return previous.copy()
+
+        if warm_start:
+            specs = _params_as_specs(params, "warm_start")
+            parts = []
+            for var_name in var_names:
+                last = previous[
+                    f"{_output_prefix(var_name)}modelfit_coefficients"
+                ].isel({dim: -1}, drop=True)
+                initial = _with_initial_values(
+                    specs,
+                    {
+                        name: last.sel(param=name, drop=True)
+                        for name in _free_parameters(model, specs, last.param.values)
+                    },
+                )
+                parts.append(
+                    new[[var_name]].xlm.modelfit(
+                        coords, model, params=initial, warm_start=dim, **kwargs
+                    )
+                )
+            fitted = xr.merge(parts, combine_attrs="override")
+        else:
+            fitted = new[var_names].xlm.modelfit(coords, model, params=params, **kwargs)
+
+        along = [name for name, var in fitted.data_vars.items() if dim in var.dims]
+        existing = previous[along]
+        if fitted[along].chunks:
+            # Dask cannot infer chunk sizes for eager object arrays
+            existing = existing.chunk(dict.fromkeys(existing.dims, -1))
+        updated = xr.concat(
+            [existing, fitted[along]],
+            dim=dim,
+            data_vars="minimal",
+            coords="minimal",
+            compat="override",
+            join="outer",
+            combine_attrs="override",
+        )
+        return xr.merge(
+            [previous.drop_vars(along), updated],
+            compat="override",
+            join="outer",
+            combine_attrs="override",
+        )
+
+
+@register_xlm_dataarray_accessor("modelfit_update")
+class ModelFitUpdateDataArrayAccessor(XLMDataArrayAccessor):
+    """`xarray.DataArray.modelfit_update` accessor for extending fit results."""
+
+    def __call__(self, *args, **kwargs) -> xr.Dataset:
+        return self._obj.to_dataset(name=_THIS_ARRAY).xlm.modelfit_update(
+            *args, **kwargs
+        )
+
+    __call__.__doc__ = (
+        str(ModelFitUpdateDatasetAccessor.__call__.__doc__)
+        .replace("Dataset.xlm.modelfit", "DataArray.xlm.modelfit")
+        .replace("``modelfit_results`` variables", "``modelfit_results`` variable")
+    )
+
+
+@register_xlm_dataset_accessor("modelfit_results")
+class ModelFitResultsDatasetAccessor(XLMDatasetAccessor):
+    """`xarray.Dataset.modelfit_results` accessor for reading compact fit results."""
+
+    def __call__(
+        self,
+        var: Hashable | None = None,
+        model: lmfit.Model | None = None,
+        funcdefs: dict | None = None,
+    ) -> _results.ModelResultIndexer:
+        """Access the results of a fit with ``output_result="lite"`` or ``"columnar"``.
+
+        The fitted data and coordinates of each point are taken from the
+        `[var]_modelfit_data` variable and the coordinates of the Dataset, so that
+        the full :class:`lmfit.model.ModelResult` of a point can be rebuilt without
+        arguments, for example with
+        ``result.xlm.modelfit_results(var).isel(x=0).to_model_result()``. Weights
+        are not stored with the results, and must be passed to :meth:`to_model_result
+        <xarray_lmfit.LiteModelResult.to_model_result>` if the fit was weighted.
+
+        Parameters
+        ----------
+        var
+            Name of the fitted data variable. Omit for the results of
+            :meth:`xarray.DataArray.xlm.modelfit`.
+        model
+            The fitted model. If not given, the model is loaded from the description
+            stored with the results, like :func:`lmfit.model.load_model`.
+        funcdefs : dict, optional
+            Dictionary of functions to use when loading the model. See
+            :func:`lmfit.model.load_model` for more information.
+
+        Returns
+        -------
+        ModelResultIndexer
+            An object whose ``isel`` and ``sel`` methods return the
+            :class:`LiteModelResult <xarray_lmfit.LiteModelResult>` of a single
+            point, from which the full :class:`lmfit.model.ModelResult` can be
+            rebuilt with :meth:`to_model_result
+            <xarray_lmfit.LiteModelResult.to_model_result>`.
+        """
+        prefix = "" if var is None else _output_prefix(var)
+        if prefix + "modelfit_model" not in self._obj.data_vars:
+            raise ValueError(
+                "No lite or columnar results found for "
+                f"{'the data' if var is None else var}. "
+                'Fit with output_result="lite" or "columnar" to store them.'
+            )
+        description = json.loads(
+            str(self._obj[prefix + "modelfit_model"].values.item())
+        )
+        if model is None:
+            model = lmfit.Model(lambda x: x).loads(
+                description["model"], funcdefs=funcdefs
+            )
+        if prefix + "modelfit_results" in self._obj.data_vars:
+            results = xr.Dataset({"records": self._obj[prefix + "modelfit_results"]})
+        else:
+            results = xr.Dataset(
+                {
+                    column: self._obj[f"{prefix}modelfit_result_{column}"]
+                    for column in _results.COLUMNS
+                }
+            )
+
+        data = None
+        if prefix + "modelfit_data" in self._obj.data_vars:
+            data = "data"
+            results["data"] = self._obj[prefix + "modelfit_data"]
+        # Map the independent variables to the names of the fit coordinates, with
+        # `None` standing for the fitted data
+        coords = description.get("coords", [])
+        independent_vars: dict[str, Hashable | None] | None = None
+        if coords and all(name in self._obj.coords for name in coords):
+            results = results.assign_coords({name: self._obj[name] for name in coords})
+            independent_vars = _independent_vars(
+                model, len(coords), coords[0] if len(coords) == 1 else coords, None
+            )
+        return _results.ModelResultIndexer(
+            results,
+            model,
+            description["method"],
+            description["messages"],
+            description.get("expressions", ()),
+            data=data,
+            independent_vars=independent_vars,
+        )
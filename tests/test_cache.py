@@ -0,0 +1,108 @@
+import lmfit
+import numpy as np
+import pytest
+import xarray as xr
+
+import xarray_lmfit  # noqa: F401
+from xarray_lmfit import FitCache
+
+
+def _gaussians(n: int = 8) -> xr.DataArray:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(0)
+    center = rng.uniform(-1, 1, n)
+    values = np.exp(-((x - center[:, None]) ** 2)) + rng.normal(0, 0.01, (n, x.size))
+    return xr.DataArray(values, dims=("y", "x"), coords={"x": x}).chunk({"y": 2})
+
+
+@pytest.fixture
+def count_fits(monkeypatch):
+    calls = {"n": 0}
+    model_fit = lmfit.Model.fit
+
+    def _counting_fit(self, *args, **kwargs):
+        calls["n"] += 1
+        return model_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(lmfit.Model, "fit", _counting_fit)
+    return calls
+
+
+@pytest.mark.parametrize("output_result", [True, False])
+def test_cache_hits(tmp_path, count_fits, output_result: bool) -> None:
+    da = _gaussians()
+    model = lmfit.models.GaussianModel()
+    params = {"center": 0.0, "sigma": 1.0, "amplitude": 1.0}
+
+    def _fit(data: xr.DataArray) -> xr.Dataset:
+        return data.xlm.modelfit(
+            "x",
+            model=model,
+            params=params,
+            output_result=output_result,
+            cache=tmp_path,
+        ).compute()
+
+    expected = _fit(da)
+    assert count_fits["n"] == 8
+    assert len(FitCache(tmp_path)) == 4
+
+    cached = _fit(da)
+    assert count_fits["n"] == 8
+    xr.testing.assert_identical(
+        cached.drop_vars("modelfit_results", errors="ignore"),
+        expected.drop_vars("modelfit_results", errors="ignore"),
+    )
+    if output_result:
+        assert cached.modelfit_results[0].item().params == (
+            expected.modelfit_results[0].item().params
+        )
+
+    # Only the changed chunk is refit
+    changed = da.copy(deep=True)
+    changed[5] = changed[5] * 2
+    _fit(changed)
+    assert count_fits["n"] == 10
+
+    # Changing the model or the fit options invalidates the entries
+    da.xlm.modelfit(
+        "x",
+        model=lmfit.models.GaussianModel(prefix="g_"),
+        params={f"g_{k}": v for k, v in params.items()},
+        output_result=output_result,
+        cache=tmp_path,
+    ).compute()
+    assert count_fits["n"] == 18
+    da.xlm.modelfit(
+        "x",
+        model=model,
+        params=params,
+        output_result=output_result,
+        cache=tmp_path,
+        max_nfev=50,
+    ).compute()
+    assert count_fits["n"] == 26
+
+
+def test_cache_eviction_and_clear(tmp_path) -> None:
+    da = _gaussians()
+    model = lmfit.models.GaussianModel()
+    cache = FitCache(tmp_path)
+    da.xlm.modelfit("x", model=model, output_result=False, cache=cache).compute()
+    assert len(cache) == 4
+    largest = max(entry.stat().st_size for entry in tmp_path.glob("*/*.npz"))
+
+    cache.evict(cache.size - 1)
+    assert len(cache) == 3
+
+    capped = FitCache(tmp_path, max_size=largest)
+    da.xlm.modelfit("x", model=model, output_result=False, cache=capped).compute()
+    assert len(capped) == 1
+
+    other = lmfit.models.LorentzianModel()
+    da.xlm.modelfit("x", model=other, output_result=False, cache=cache).compute()
+    assert len(cache) == 5
+    cache.clear(model)
+    assert len(cache) == 4
+    cache.clear()
+    assert len(cache) == 0
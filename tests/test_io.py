@@ -203,3 +203,46 @@ def test_ds_io() -> None:
             loaded_ds.drop_vars([f"{i}_modelfit_results" for i in range(3)]),
             result_ds.drop_vars([f"{i}_modelfit_results" for i in range(3)]),
         )
+
+
+def test_lite_results_io(tmp_path) -> None:
+    x = np.linspace(0, 10, 50)
+    y = np.stack([2.0 * x + 1.0, np.full_like(x, np.nan)])
+    y_arr = xr.DataArray(y, dims=("fit", "x"), coords={"fit": [0, 1], "x": x})
+
+    model = lmfit.models.LinearModel()
+    result_ds = y_arr.xlm.modelfit(
+        "x",
+        model=model,
+        params=model.make_params(slope=1.0, intercept=0.0),
+        output_result="lite",
+    )
+
+    path = tmp_path / "lite.nc"
+    save_fit(result_ds, path)
+    loaded_ds = load_fit(path)
+    for i in range(2):
+        loaded = loaded_ds["modelfit_results"][i].item()
+        expected = result_ds["modelfit_results"][i].item()
+        assert loaded.model is None
+        for name in (
+            "best_values",
+            "init_values",
+            "stderr",
+            "var_names",
+            "success",
+            "bounds",
+            "exprs",
+        ):
+            assert getattr(loaded, name) == getattr(expected, name)
+    xr.testing.assert_identical(
+        loaded_ds.drop_vars("modelfit_results"),
+        result_ds.drop_vars("modelfit_results"),
+    )
+
+    with pytest.raises(ValueError, match="fitted model must be given"):
+        loaded.to_model_result(y[0], x=x)
+    rebuilt = (
+        loaded_ds["modelfit_results"][0].item().to_model_result(y[0], x=x, model=model)
+    )
+    np.testing.assert_allclose(rebuilt.best_fit, y[0])
@@ -1,3 +1,7 @@
+import concurrent.futures
+import json
+import os
+import pickle
 import re
 
 import lmfit
@@ -5,7 +9,7 @@ import numpy as np
 import pytest
 import xarray as xr
 
-import xarray_lmfit  # noqa: F401
+import xarray_lmfit
 
 
 def lorentzian(x, amplitude, center, sigma):
@@ -278,6 +282,60 @@ def test_da_modelfit_skipna_multiple_coords() -> None:
     )
 
 
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_da_modelfit_shared_coords(use_dask: bool, monkeypatch) -> None:
+    def plane(x, z, slope_x, slope_z, intercept):
+        return slope_x * x + slope_z * z + intercept
+
+    x = np.arange(6, dtype=float)
+    z = np.array([0.0, 2.0, 1.0, 4.0, 3.0, 1.0])
+    slopes = xr.DataArray([1.0, 2.0, 3.0, 4.0], dims="curve")
+    da = plane(
+        xr.DataArray(x, dims="point"), xr.DataArray(z, dims="point"), slopes, -0.5, 1.0
+    )
+    da[1, 0] = np.nan
+    x_coord = xr.DataArray(x, dims="point")
+    z_coord = xr.DataArray(z, dims="point")
+    x_coord[2] = np.nan
+    z_coord[4] = np.nan
+    if use_dask:
+        da = da.chunk(curve=2)
+
+    shared = []
+    shared_coords = xarray_lmfit.modelfit._shared_coords
+
+    def capture_shared_coords(*args, **kwargs):
+        shared.append(shared_coords(*args, **kwargs))
+        return shared[-1]
+
+    monkeypatch.setattr(xarray_lmfit.modelfit, "_shared_coords", capture_shared_coords)
+
+    def _fit(coords: list[xr.DataArray]) -> xr.Dataset:
+        return da.xlm.modelfit(
+            coords=coords,
+            model=lmfit.Model(plane, independent_vars=["x", "z"]),
+            reduce_dims="point",
+            params={"slope_x": 0.0, "slope_z": 0.0, "intercept": 0.0},
+            output_result=False,
+        ).compute()
+
+    fit = _fit([x_coord, z_coord])
+    assert shared
+    assert all(s is not None for s in shared)
+
+    # Coordinates that vary along the preserved dimension are prepared per pixel
+    shared.clear()
+    expected = _fit([c.expand_dims(curve=4).copy() for c in (x_coord, z_coord)])
+    assert all(s is None for s in shared)
+
+    xr.testing.assert_identical(fit, expected)
+    np.testing.assert_allclose(
+        fit.modelfit_coefficients.sel(param="slope_x"), slopes, rtol=1e-7
+    )
+    assert np.isnan(fit.modelfit_best_fit[:, [2, 4]]).all()
+    assert np.isnan(fit.modelfit_best_fit[1, 0])
+
+
 @pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
 def test_da_modelfit_without_model_results(
     use_dask: bool, monkeypatch: pytest.MonkeyPatch
@@ -592,6 +650,65 @@ def test_modelfit_params(use_dask: bool, progress: bool) -> None:
     np.testing.assert_allclose(fit.modelfit_coefficients, expected, atol=1e-8)
 
 
+@pytest.mark.parametrize("guess", [False, True], ids=["no_guess", "guess"])
+@pytest.mark.parametrize("kind", ["json", "dict", "parameters"])
+def test_modelfit_tiled_object_params(kind: str, guess: bool, monkeypatch) -> None:
+    x = np.linspace(-3, 3, 31)
+    centers = np.tile([-1.0, 0.0, 1.0], 4)
+    da = xr.DataArray(
+        np.exp(-((x - centers[:, None]) ** 2)),
+        dims=("fit", "x"),
+        coords={"x": x},
+    )
+    model = lmfit.models.GaussianModel()
+    presets = [
+        model.make_params(center=c, sigma={"value": 1.5, "min": 0.1}, amplitude=1.0)
+        for c in (-0.8, 0.2, 0.8)
+    ]
+    if kind == "json":
+        elements = [p.dumps() for p in presets]
+    elif kind == "dict":
+        elements = [
+            {
+                name: {"value": p[name].value, "min": p[name].min}
+                for name in ("amplitude", "center", "sigma")
+            }
+            for p in presets
+        ]
+    else:
+        elements = presets
+    specs = np.empty(centers.size, dtype=object)
+    for i in range(specs.size):
+        specs[i] = elements[i % 3]
+
+    loads = lmfit.Parameters.loads
+    n_loads = 0
+
+    def counting_loads(self, s, *args, **kwargs):
+        nonlocal n_loads
+        n_loads += 1
+        return loads(self, s, *args, **kwargs)
+
+    monkeypatch.setattr(lmfit.Parameters, "loads", counting_loads)
+    fit = da.xlm.modelfit(
+        "x", model=model, params=xr.DataArray(specs, dims="fit"), guess=guess
+    )
+    if kind == "json":
+        assert n_loads == len(presets)
+
+    for i in range(centers.size):
+        expected = da.isel(fit=i).xlm.modelfit(
+            "x", model=model, params=presets[i % 3], guess=guess
+        )
+        xr.testing.assert_allclose(
+            fit.modelfit_coefficients.isel(fit=i), expected.modelfit_coefficients
+        )
+        init_params = fit.modelfit_results[i].item().init_params
+        assert init_params["sigma"].min == 0.1
+    # Each fit has its own initial parameters
+    assert len({id(r.init_params) for r in fit.modelfit_results.values}) == 12
+
+
 @pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
 def test_modelfit_dataarray_dict_params(use_dask: bool) -> None:
     x = np.arange(5.0)
@@ -856,6 +973,63 @@ def test_modelfit_broadcast_auxiliary_expression_parameter() -> None:
     assert "is_init_value" not in params["intercept"]
 
 
+@pytest.mark.parametrize("engine", ["lmfit", "threads"])
+def test_modelfit_broadcast_params_reused_between_fits(engine) -> None:
+    x = np.arange(6.0)
+    slopes, intercepts = [1.0, 2.0, 3.0, 4.0], [0.5, 1.0, 1.5, 2.0]
+    da = xr.DataArray(
+        np.stack([linear(x, a, b) for a, b in zip(slopes, intercepts, strict=True)]),
+        dims=("fit", "x"),
+        coords={"fit": np.arange(4), "x": x},
+    )
+    specs = {
+        "slope": {"value": [1.5, 1.5, 2.5, 3.5], "min": [0.0, np.nan, 0.0, 0.0]},
+        "intercept": {"value": [0.0, 0.7, 1.5, 1.0], "vary": [True, False, True, True]},
+        "offset": {"value": [0.1, 0.2, 0.3, 0.4], "expr": ["", "", "slope / 4", ""]},
+    }
+    params = {
+        name: {
+            attr: xr.DataArray(values, dims="fit", coords={"fit": da.fit})
+            for attr, values in attrs.items()
+        }
+        for name, attrs in specs.items()
+    }
+    fit = da.xlm.modelfit(
+        "x",
+        model=lmfit.Model(linear),
+        params=params,
+        param_names=["slope", "intercept", "offset"],
+        output_result=engine == "lmfit",
+        engine=engine,
+    )
+
+    for i in range(da.sizes["fit"]):
+        pixel_params = {
+            name: {
+                attr: values[i]
+                for attr, values in attrs.items()
+                if not (isinstance(values[i], float) and np.isnan(values[i]))
+            }
+            for name, attrs in specs.items()
+        }
+        expected = da.isel(fit=i).xlm.modelfit(
+            "x",
+            model=lmfit.Model(linear),
+            params=pixel_params,
+            param_names=["slope", "intercept", "offset"],
+        )
+        xr.testing.assert_allclose(
+            fit.modelfit_coefficients.isel(fit=i), expected.modelfit_coefficients
+        )
+        if engine == "lmfit":
+            result = fit.modelfit_results[i].item()
+            for name, par in expected.modelfit_results.item().init_params.items():
+                assert result.init_params[name].min == par.min
+                assert result.init_params[name].vary == par.vary
+                assert result.init_params[name].expr == par.expr
+                assert result.init_params[name].value == pytest.approx(par.value)
+
+
 def test_modelfit_broadcast_params_across_dimensions() -> None:
     x = np.arange(5.0)
     slopes = xr.DataArray([1.0, 2.0], dims="row").chunk({"row": 1})
@@ -1148,3 +1322,1220 @@ def test_modelfit_parallel_dask(use_client: bool, single_param: bool) -> None:
     finally:
         if use_client:
             client.shutdown()
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_fits_whole_blocks(
+    use_dask: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import xarray_lmfit.modelfit
+
+    block_shapes = []
+    model_fit_block = xarray_lmfit.modelfit._model_fit_block
+
+    def capture_block(Y, *args, **kwargs):
+        block_shapes.append(Y.shape)
+        return model_fit_block(Y, *args, **kwargs)
+
+    monkeypatch.setattr(xarray_lmfit.modelfit, "_model_fit_block", capture_block)
+
+    x = np.arange(5.0)
+    slopes = np.arange(1.0, 7.0).reshape(2, 3)
+    da = xr.DataArray(
+        slopes[..., np.newaxis] * x + 1.0,
+        dims=("row", "column", "x"),
+        coords={"x": x},
+    )
+    if use_dask:
+        da = da.chunk({"row": 1, "column": -1})
+    intercept = xr.DataArray([0.0, 0.5, 1.0], dims="column")
+
+    fit = da.xlm.modelfit(
+        "x",
+        model=lmfit.Model(linear),
+        params={"slope": 1.0, "intercept": intercept},
+        output_result=False,
+    ).compute()
+
+    assert block_shapes == ([(1, 3, 5)] * 2 if use_dask else [(2, 3, 5)])
+    np.testing.assert_allclose(fit.modelfit_coefficients.sel(param="slope"), slopes)
+    np.testing.assert_allclose(fit.modelfit_best_fit, da)
+
+
+def test_modelfit_shares_model_in_graph() -> None:
+    x = np.arange(5.0)
+    slopes = np.arange(1.0, 9.0)
+    ds = xr.Dataset(
+        {
+            "a": (("y", "x"), slopes[:, np.newaxis] * x + 1.0),
+            "b": (("y", "x"), -slopes[:, np.newaxis] * x),
+        },
+        coords={"x": x},
+    ).chunk(y=2)
+    model = lmfit.Model(linear)
+    fit_kwargs = {"model": model, "params": {"slope": 1.0, "intercept": 0.0}}
+
+    fit = ds.xlm.modelfit("x", output_result=False, **fit_kwargs)
+
+    # The model is stored in a single key shared by the tasks of both variables
+    holders = [
+        key
+        for key, value in dict(fit.__dask_graph__()).items()
+        if isinstance(value, np.ndarray)
+        and value.dtype.hasobject
+        and isinstance(value.item(), dict)
+        and value.item().get("model") is model
+    ]
+    assert len(holders) == 1
+
+    expected = ds.compute().xlm.modelfit("x", output_result=False, **fit_kwargs)
+    xr.testing.assert_allclose(fit.compute(), expected)
+    np.testing.assert_allclose(fit.a_modelfit_coefficients.sel(param="slope"), slopes)
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_fuses_data_variables(
+    use_dask: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    block_shapes = []
+    model_fit_block = xarray_lmfit.modelfit._model_fit_block
+
+    def capture_block(Y, *args, **kwargs):
+        block_shapes.append(Y.shape)
+        return model_fit_block(Y, *args, **kwargs)
+
+    x = np.arange(5.0)
+    slopes = np.arange(1.0, 5.0)
+    ds = xr.Dataset(
+        {
+            "a": (("y", "x"), slopes[:, np.newaxis] * x + 1.0, {"units": "a"}),
+            "c": ("x", 3.0 * x),
+            "b": (("y", "x"), -slopes[:, np.newaxis] * x, {"units": "b"}),
+        },
+        coords={"x": x, "y": np.arange(4), "label": ("y", list("pqrs"))},
+    )
+    if use_dask:
+        ds = ds.chunk(y=2)
+    fit_kwargs = {
+        "model": lmfit.Model(linear),
+        "params": {"slope": 1.0, "intercept": 0.0},
+    }
+    expected = xr.merge(
+        [ds[[name]].xlm.modelfit("x", **fit_kwargs).compute() for name in ds],
+        compat="override",
+    )
+
+    monkeypatch.setattr(xarray_lmfit.modelfit, "_model_fit_block", capture_block)
+    fit = ds.xlm.modelfit("x", **fit_kwargs).compute()
+
+    # Dask-backed variables with the same dimensions are fit together, in-memory
+    # variables are fit one by one instead of being copied into a stacked array
+    assert sorted(block_shapes) == (
+        [(2, 2, 5), (2, 2, 5), (5,)] if use_dask else [(4, 5), (4, 5), (5,)]
+    )
+    assert list(fit.data_vars) == list(expected.data_vars)
+    xr.testing.assert_identical(
+        fit.drop_vars(
+            ["a_modelfit_results", "b_modelfit_results", "c_modelfit_results"]
+        ),
+        expected.drop_vars(
+            ["a_modelfit_results", "b_modelfit_results", "c_modelfit_results"]
+        ),
+    )
+    assert fit.b_modelfit_results[1].item().params["slope"].value == pytest.approx(
+        -slopes[1]
+    )
+
+
+def _noisy_gaussians(n: int = 12) -> xr.DataArray:
+    x = np.linspace(-3, 3, 60)
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-0.5, 0.5, n)
+    values = (
+        lmfit.lineshapes.gaussian(x, 3.0, centers[:, np.newaxis], 0.6)
+        + 0.5
+        + rng.normal(0, 0.02, (n, x.size))
+    )
+    return xr.DataArray(values, dims=("fit", "x"), coords={"x": x})
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_batched_engine_matches_lmfit(use_dask: bool) -> None:
+    da = _noisy_gaussians()
+    da[0, :5] = np.nan
+    da[1] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 5})
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+    params = {
+        "amplitude": 2.0,
+        "center": xr.DataArray(np.zeros(da.sizes["fit"]), dims="fit"),
+        "sigma": {"value": 1.0, "min": 0.0},
+        "c": 0.0,
+    }
+
+    expected = da.xlm.modelfit(
+        "x", model=model, params=params, output_result=False
+    ).compute()
+    batched = da.xlm.modelfit(
+        "x", model=model, params=params, output_result=False, engine="batched"
+    ).compute()
+
+    for var in ("coefficients", "stderr", "covariance", "best_fit"):
+        np.testing.assert_allclose(
+            batched[f"modelfit_{var}"],
+            expected[f"modelfit_{var}"],
+            rtol=1e-4,
+            atol=1e-6,
+        )
+    for stat in ("nvarys", "ndata", "nfree", "chisqr", "redchi", "aic", "rsquared"):
+        np.testing.assert_allclose(
+            batched.modelfit_stats.sel(fit_stat=stat),
+            expected.modelfit_stats.sel(fit_stat=stat),
+            rtol=1e-4,
+        )
+    assert np.isnan(batched.modelfit_coefficients[1]).all()
+
+
+@pytest.mark.parametrize(
+    "model_class", [lmfit.models.GaussianModel, lmfit.models.LorentzianModel]
+)
+def test_modelfit_batched_engine_expression_hints(model_class) -> None:
+    da = _noisy_gaussians(4) - 0.5
+    # The fwhm and height hints are derived from the function parameters
+    model = model_class()
+    params = {"amplitude": 2.0, "center": 0.0, "sigma": 0.8}
+    expected = da.xlm.modelfit("x", model=model, params=params, output_result=False)
+    batched = da.xlm.modelfit(
+        "x", model=model, params=params, output_result=False, engine="batched"
+    )
+    assert list(batched.param.values) == list(expected.param.values)
+    np.testing.assert_allclose(
+        batched.modelfit_coefficients, expected.modelfit_coefficients, rtol=1e-4
+    )
+    np.testing.assert_allclose(
+        batched.modelfit_stderr.sel(param=["amplitude", "center", "sigma"]),
+        expected.modelfit_stderr.sel(param=["amplitude", "center", "sigma"]),
+        rtol=1e-4,
+    )
+
+
+def test_modelfit_batched_engine_fixed_parameters() -> None:
+    da = _noisy_gaussians(4)
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+
+    fit = da.xlm.modelfit(
+        "x",
+        model=model,
+        params={
+            "amplitude": 2.0,
+            "center": 0.0,
+            "sigma": {"value": 0.6, "vary": False},
+            "c": 0.0,
+        },
+        output_result=False,
+        engine="batched",
+    )
+
+    np.testing.assert_allclose(fit.modelfit_coefficients.sel(param="sigma"), 0.6)
+    np.testing.assert_allclose(fit.modelfit_stderr.sel(param="sigma"), 0.0)
+    np.testing.assert_allclose(fit.modelfit_stats.sel(fit_stat="nvarys"), 3)
+    np.testing.assert_allclose(
+        fit.modelfit_coefficients.sel(param="amplitude"), 3.0, rtol=2e-2
+    )
+
+
+def test_modelfit_batched_engine_rejects_unsupported() -> None:
+    da = _noisy_gaussians(2)
+    model = lmfit.models.GaussianModel()
+
+    with pytest.raises(ValueError, match="Pass output_result=False"):
+        da.xlm.modelfit("x", model=model, engine="batched")
+
+    with pytest.raises(ValueError, match="does not support constraint expressions"):
+        da.xlm.modelfit(
+            "x",
+            model=model,
+            params={"amplitude": 1.0, "sigma": {"expr": "amplitude / 2"}},
+            output_result=False,
+            engine="batched",
+        )
+
+    with pytest.raises(ValueError, match="does not support the fit keyword"):
+        da.xlm.modelfit(
+            "x", model=model, method="nelder", output_result=False, engine="batched"
+        )
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+@pytest.mark.parametrize(
+    ("model", "params"),
+    [
+        (lmfit.models.LinearModel(), {"slope": 0.0, "intercept": 0.0}),
+        (lmfit.models.PolynomialModel(degree=3), {f"c{i}": 0.0 for i in range(4)}),
+        (
+            lmfit.models.QuadraticModel() - lmfit.models.LinearModel(prefix="l_"),
+            {
+                "a": 0.0,
+                "b": 0.0,
+                "c": 0.0,
+                "l_slope": {"value": 0.5, "vary": False},
+                "l_intercept": {"value": 0.1, "vary": False},
+            },
+        ),
+    ],
+    ids=["linear", "polynomial", "composite"],
+)
+def test_modelfit_linear_engine_matches_lmfit(
+    use_dask: bool, model: lmfit.Model, params: dict
+) -> None:
+    x = np.linspace(-2, 2, 25)
+    rng = np.random.default_rng(1)
+    coeffs = rng.normal(size=(6, 4))
+    values = np.polynomial.polynomial.polyval(x, coeffs.T) + rng.normal(
+        0, 0.05, (6, x.size)
+    )
+    da = xr.DataArray(values, dims=("fit", "x"), coords={"x": x})
+    da[0, 3] = np.nan
+    da[1] = np.nan
+    weights = xr.DataArray(rng.uniform(0.5, 2.0, x.size), dims="x")
+    if use_dask:
+        da = da.chunk({"fit": 3})
+
+    expected = da.xlm.modelfit(
+        "x", model=model, params=params, weights=weights, output_result=False
+    ).compute()
+    linear = da.xlm.modelfit(
+        "x",
+        model=model,
+        params=params,
+        weights=weights,
+        output_result=False,
+        engine="linear",
+    ).compute()
+
+    for var in ("coefficients", "stderr", "covariance", "best_fit"):
+        np.testing.assert_allclose(
+            linear[f"modelfit_{var}"],
+            expected[f"modelfit_{var}"],
+            rtol=1e-5,
+            atol=1e-8,
+        )
+    for stat in ("nvarys", "ndata", "chisqr", "redchi", "aic", "bic", "rsquared"):
+        np.testing.assert_allclose(
+            linear.modelfit_stats.sel(fit_stat=stat),
+            expected.modelfit_stats.sel(fit_stat=stat),
+            rtol=1e-6,
+        )
+    # Function evaluations are not counted by the closed-form solve
+    assert linear.modelfit_stats.sel(fit_stat="nfev").isnull().all()
+
+
+def test_modelfit_linear_engine_rejects_unsupported() -> None:
+    x = np.arange(5.0)
+    da = xr.DataArray(linear(x, 2.0, 1.0), dims="x", coords={"x": x})
+
+    with pytest.raises(ValueError, match="requires a model that is linear"):
+        da.xlm.modelfit(
+            "x", model=lmfit.Model(linear), output_result=False, engine="linear"
+        )
+
+    with pytest.raises(ValueError, match="does not support bounds"):
+        da.xlm.modelfit(
+            "x",
+            model=lmfit.models.LinearModel(),
+            params={"slope": {"value": 1.0, "min": 0.0}, "intercept": 0.0},
+            output_result=False,
+            engine="linear",
+        )
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_varpro_matches_lmfit(use_dask: bool) -> None:
+    x = np.linspace(-5, 5, 120)
+    rng = np.random.default_rng(2)
+    amplitude = rng.uniform(1.0, 3.0, 6)
+    values = (
+        amplitude[:, None] * np.exp(-((x + 1.0) ** 2) / 0.5)
+        + 2.0 * np.exp(-((x - 1.5) ** 2) / 0.8)
+        + 0.1 * x
+        + 0.3
+        + rng.normal(0, 0.02, (6, x.size))
+    )
+    da = xr.DataArray(values, dims=("fit", "x"), coords={"x": x})
+    da[0, 5] = np.nan
+    da[1] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 3})
+
+    model = (
+        lmfit.models.GaussianModel(prefix="a_")
+        + lmfit.models.GaussianModel(prefix="b_")
+        - lmfit.models.LinearModel()
+    )
+    params = {
+        "a_center": -0.8,
+        "a_sigma": 0.5,
+        "a_amplitude": 2.0,
+        "b_center": 1.4,
+        "b_sigma": 0.6,
+        # Bounded amplitudes are left to the optimizer
+        "b_amplitude": {"value": 3.0, "min": 0.0},
+        "slope": 0.0,
+        "intercept": 0.0,
+    }
+    expected = da.xlm.modelfit("x", model=model, params=params).compute()
+    result = da.xlm.modelfit("x", model=model, params=params, varpro=True).compute()
+
+    for var in ("coefficients", "stderr", "covariance", "best_fit"):
+        np.testing.assert_allclose(
+            result[f"modelfit_{var}"], expected[f"modelfit_{var}"], rtol=1e-4
+        )
+    assert (
+        result.modelfit_stats.sel(fit_stat="nfev")[2:]
+        < expected.modelfit_stats.sel(fit_stat="nfev")[2:]
+    ).all()
+    assert isinstance(result.modelfit_results[0].item(), lmfit.model.ModelResult)
+    assert "a_height" in result.modelfit_results[0].item().params
+
+    with pytest.raises(ValueError, match="only supported with"):
+        da.xlm.modelfit(
+            "x",
+            model=model,
+            params=params,
+            varpro=True,
+            engine="batched",
+            output_result=False,
+        )
+
+
+def _data_dependent_background(x, y, offset=0.0, scale=0.0):
+    return offset + scale * np.cumsum(y) / y.size + 0.0 * x
+
+
+def test_modelfit_varpro_independent_vars() -> None:
+    x = np.linspace(-5, 5, 80)
+    rng = np.random.default_rng(4)
+    center = rng.uniform(-1, 1, 4)
+    values = (
+        2.0 * np.exp(-((x - center[:, None]) ** 2) / 0.5)
+        + 0.2
+        + rng.normal(0, 0.02, (4, x.size))
+    )
+    da = xr.DataArray(values, dims=("fit", "x"), coords={"x": x})
+
+    # The background takes the data as a second independent variable, which the
+    # Gaussian does not accept
+    model = (
+        lmfit.Model(_data_dependent_background, independent_vars=["x", "y"])
+        + lmfit.models.GaussianModel()
+    )
+    params = {
+        "offset": 0.0,
+        "scale": 0.0,
+        "center": 0.0,
+        "sigma": 0.6,
+        "amplitude": 1.0,
+    }
+    expected = da.xlm.modelfit("x", model=model, params=params)
+    result = da.xlm.modelfit("x", model=model, params=params, varpro=True)
+    assert result.modelfit_results[0].item().success
+    np.testing.assert_allclose(
+        result.modelfit_coefficients, expected.modelfit_coefficients, rtol=1e-4
+    )
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_warm_start(use_dask: bool) -> None:
+    x = np.linspace(-10, 10, 101)
+    temperature = np.arange(40)
+    center = np.linspace(-6, 6, temperature.size)
+    rng = np.random.default_rng(3)
+    values = np.exp(-((x - center[:, None]) ** 2) / 0.5)
+    values = np.stack([values, 2 * values]) + rng.normal(0, 0.01, (2, 40, x.size))
+    da = xr.DataArray(
+        values,
+        dims=("channel", "temperature", "x"),
+        coords={"x": x, "temperature": temperature},
+    )
+    da[0, 10] = np.nan
+    if use_dask:
+        da = da.chunk({"channel": 1, "temperature": 10})
+
+    model = lmfit.models.GaussianModel()
+    params = {"center": -6.0, "sigma": 0.5, "amplitude": 1.0}
+    cold = da.xlm.modelfit(
+        "x", model=model, params=params, output_result=False
+    ).compute()
+    warm = da.xlm.modelfit(
+        "x",
+        model=model,
+        params=params,
+        output_result=False,
+        warm_start="temperature",
+    ).compute()
+
+    fitted_center = warm.modelfit_coefficients.sel(param="center")
+    np.testing.assert_allclose(fitted_center[1], center, atol=1e-2)
+    np.testing.assert_allclose(fitted_center[0, :10], center[:10], atol=1e-2)
+    assert (
+        warm.modelfit_stats.sel(fit_stat="nfev").sum()
+        < cold.modelfit_stats.sel(fit_stat="nfev").sum()
+    )
+    # The fit after the missing pixel starts from the initial parameters again
+    assert np.isnan(warm.modelfit_coefficients[0, 10]).all()
+
+    with pytest.raises(ValueError, match="only contain preserved dimensions"):
+        da.xlm.modelfit("x", model=model, warm_start="x")
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_warm_start_map(use_dask: bool) -> None:
+    x = np.linspace(-10, 10, 101)
+    center = 0.2 * (np.arange(12)[:, None] + np.arange(10)[None, :]) - 2
+    rng = np.random.default_rng(4)
+    values = np.exp(-((x - center[..., None]) ** 2) / 0.5)
+    values = values + rng.normal(0, 0.01, values.shape)
+    da = xr.DataArray(values, dims=("u", "v", "x"), coords={"x": x})
+    if use_dask:
+        da = da.chunk({"u": 6, "v": 5})
+
+    model = lmfit.models.GaussianModel()
+    params = {"center": -2.0, "sigma": 0.5, "amplitude": 1.0}
+    cold = da.xlm.modelfit(
+        "x", model=model, params=params, output_result=False
+    ).compute()
+    warm = da.xlm.modelfit(
+        "x", model=model, params=params, warm_start=["u", "v"]
+    ).compute()
+
+    # Same output schema as without warm starts, with all data variables and results
+    assert set(warm.data_vars) == set(cold.data_vars) | {"modelfit_results"}
+    np.testing.assert_allclose(
+        warm.modelfit_coefficients.sel(param="center"), center, atol=5e-2
+    )
+    assert (
+        warm.modelfit_stats.sel(fit_stat="nfev").sum()
+        < cold.modelfit_stats.sel(fit_stat="nfev").sum()
+    )
+    # Chunks are not merged when warm starting along multiple dimensions
+    if use_dask:
+        lazy = da.xlm.modelfit("x", model=model, warm_start=["u", "v"])
+        assert lazy.modelfit_coefficients.chunks[:2] == da.chunks[:2]
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_coarsen(use_dask: bool) -> None:
+    x = np.linspace(-10, 10, 81)
+    center = np.add.outer(np.linspace(-2, 2, 12), np.linspace(-1, 1, 6))
+    rng = np.random.default_rng(5)
+    values = np.exp(-((x - center[..., None]) ** 2) / 0.5)
+    values = values + rng.normal(0, 0.1, values.shape)
+    ds = xr.Dataset(
+        {
+            "a": (("u", "v", "x"), values),
+            "b": (("u", "v", "x"), 2 * values),
+        },
+        coords={"x": x, "u": np.arange(12) * 0.5},
+    )
+    if use_dask:
+        ds = ds.chunk({"u": 6})
+
+    model = lmfit.models.GaussianModel()
+    params = {
+        "center": 0.0,
+        "sigma": {"value": 2.0, "min": 0.0},
+        "amplitude": xr.DataArray(np.ones(12), dims="u"),
+    }
+    direct = ds.xlm.modelfit(
+        "x", model=model, params=params, output_result=False
+    ).compute()
+    fine, coarse = ds.xlm.modelfit(
+        "x",
+        model=model,
+        params=params,
+        output_result=False,
+        coarsen={"u": 4, "v": 2},
+        return_coarse=True,
+    )
+    fine, coarse = fine.compute(), coarse.compute()
+
+    assert set(fine.data_vars) == set(direct.data_vars)
+    assert dict(coarse.sizes) == {
+        "u": 3,
+        "v": 3,
+        "x": 81,
+        "param": 5,
+        "cov_i": 5,
+        "cov_j": 5,
+        "fit_stat": 9,
+    }
+    xr.testing.assert_identical(fine.u, ds.u)
+    for var in ("a", "b"):
+        np.testing.assert_allclose(
+            fine[f"{var}_modelfit_coefficients"].sel(param="center"),
+            center,
+            atol=0.2,
+        )
+        assert (
+            fine[f"{var}_modelfit_stats"].sel(fit_stat="nfev").sum()
+            < direct[f"{var}_modelfit_stats"].sel(fit_stat="nfev").sum()
+        )
+
+    with pytest.raises(ValueError, match="only be applied to preserved dimensions"):
+        ds.xlm.modelfit("x", model=model, coarsen={"x": 2})
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_deduplicate(use_dask: bool, monkeypatch) -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(6)
+    values = np.zeros((4, 6, x.size))
+    values[:2, :3] = np.exp(-(x**2)) + rng.normal(0, 0.01, (2, 3, x.size))
+    values[3] = np.exp(-((x - 1) ** 2))
+    da = xr.DataArray(values, dims=("u", "v", "x"), coords={"x": x})
+    amplitude = xr.DataArray([1.0, 1.0, 1.0, 1.0, 2.0, 2.0], dims="v")
+    if use_dask:
+        da = da.chunk({"u": 2})
+
+    model = lmfit.models.GaussianModel()
+    params = {"amplitude": amplitude, "center": 0.0, "sigma": 1.0}
+    expected = da.xlm.modelfit("x", model=model, params=params).compute()
+
+    n_fits = 0
+    model_fit = lmfit.Model.fit
+
+    def _counting_fit(self, *args, **kwargs):
+        nonlocal n_fits
+        n_fits += 1
+        return model_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(lmfit.Model, "fit", _counting_fit)
+    result = da.xlm.modelfit(
+        "x", model=model, params=params, deduplicate=True
+    ).compute()
+
+    # Noisy pixels are unique, zero pixels differ only by initial amplitude
+    assert n_fits == (12 if use_dask else 10)
+    xr.testing.assert_identical(
+        result.drop_vars("modelfit_results"), expected.drop_vars("modelfit_results")
+    )
+    results = result.modelfit_results.values
+    assert results[3, 0] is results[3, 3]
+    assert results[3, 4] is results[3, 5]
+    assert results[3, 3] is not results[3, 4]
+
+    with pytest.raises(ValueError, match="cannot be combined"):
+        da.xlm.modelfit("x", model=model, deduplicate=True, warm_start="u")
+
+
+@pytest.mark.parametrize("engine", ["processes", "threads"])
+@pytest.mark.parametrize("output_result", [True, False])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_pool_engines(use_dask: bool, output_result: bool, engine) -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(8)
+    center = rng.uniform(-1, 1, (4, 3))
+    values = np.exp(-((x - center[..., None]) ** 2)) + rng.normal(0, 0.01, (4, 3, 41))
+    da = xr.DataArray(values, dims=("u", "v", "x"), coords={"x": x})
+    weights = xr.DataArray(np.linspace(1, 2, 4), dims="u")
+    if use_dask:
+        da = da.chunk({"u": 2})
+
+    model = lmfit.models.GaussianModel()
+    object_params = xr.DataArray(
+        [{"center": c, "sigma": 1.0, "amplitude": 1.0} for c in [-0.5, 0.0, 0.5]],
+        dims="v",
+    )
+    for params in (
+        {"center": xr.DataArray([-0.5, 0.0, 0.5], dims="v"), "sigma": 1.0},
+        object_params,
+    ):
+        kwargs = {"params": params, "weights": weights, "output_result": output_result}
+        if use_dask and engine == "processes":
+            with pytest.raises(ValueError, match="dask-backed inputs"):
+                da.xlm.modelfit("x", model=model, engine=engine, **kwargs)
+            continue
+        expected = da.xlm.modelfit("x", model=model, **kwargs).compute()
+        result = da.xlm.modelfit(
+            "x", model=model, engine=engine, n_workers=2, **kwargs
+        ).compute()
+        if output_result:
+            for actual, desired in zip(
+                result.modelfit_results.values.flat,
+                expected.modelfit_results.values.flat,
+                strict=True,
+            ):
+                assert actual.params == desired.params
+            result = result.drop_vars("modelfit_results")
+            expected = expected.drop_vars("modelfit_results")
+        xr.testing.assert_identical(result, expected)
+
+    with pytest.raises(ValueError, match="n_workers is only supported"):
+        da.xlm.modelfit("x", model=model, n_workers=2)
+    with pytest.raises(ValueError, match="positive"):
+        da.xlm.modelfit("x", model=model, engine=engine, n_workers=0)
+    with pytest.raises(ValueError, match="warm_start is only supported"):
+        da.xlm.modelfit("x", model=model, engine=engine, warm_start="u")
+
+
+def test_modelfit_processes_reuse_pool(monkeypatch) -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(11)
+    ds = xr.Dataset(
+        {
+            "a": (("u", "x"), np.exp(-(x**2)) + rng.normal(0, 0.01, (4, 41))),
+            "b": (("v", "x"), np.exp(-(x**2)) + rng.normal(0, 0.01, (6, 41))),
+        },
+        coords={"x": x},
+    )
+    model = lmfit.models.GaussianModel()
+    params = {"center": 0.0, "sigma": 1.0, "amplitude": 1.0}
+    expected = ds.xlm.modelfit("x", model=model, params=params, output_result=False)
+
+    started = []
+
+    class _Executor(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs) -> None:
+            started.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _Executor)
+    result = ds.xlm.modelfit(
+        "x",
+        model=model,
+        params=params,
+        output_result=False,
+        engine="processes",
+        n_workers=2,
+    )
+    xr.testing.assert_identical(result, expected)
+    # Both data variables are fit on the same worker processes
+    assert len(started) == 1
+
+    with pytest.raises(ValueError, match="cannot be combined"):
+        ds.xlm.modelfit("x", model=model, engine="processes", chunks="auto")
+
+
+def test_modelfit_threads_shared_state() -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(9)
+    center = rng.uniform(-1, 1, 16)
+    da = xr.DataArray(
+        np.exp(-((x - center[:, None]) ** 2)) + rng.normal(0, 0.01, (16, 41)),
+        dims=("u", "x"),
+        coords={"x": x},
+    )
+    model = lmfit.models.GaussianModel()
+
+    # Static template with a constraint expression, and per-point Parameters that
+    # are shared between points
+    params = model.make_params(center=0.0, sigma=1.0, amplitude=1.0)
+    params.add("width", expr="2 * sigma")
+    shared = np.empty(16, dtype=object)
+    for i in range(shared.size):
+        shared[i] = params
+    for p in (params, xr.DataArray(shared, dims="u")):
+        expected = da.xlm.modelfit("x", model=model, params=p)
+        result = da.xlm.modelfit("x", model=model, params=p, engine="threads")
+        xr.testing.assert_identical(
+            result.drop_vars("modelfit_results"),
+            expected.drop_vars("modelfit_results"),
+        )
+    assert params["width"].value == 2.0
+
+    # Warnings from worker threads are emitted in the calling thread
+    with pytest.warns(UserWarning, match="not included in the results") as record:
+        da.xlm.modelfit(
+            "x",
+            model=model,
+            params=params,
+            param_names=["center"],
+            engine="threads",
+            n_workers=4,
+        )
+    assert sum("not included" in str(w.message) for w in record) == 2
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_auto_chunks(use_dask: bool, monkeypatch) -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(10)
+    center = rng.uniform(-1, 1, (6, 5))
+    values = np.exp(-((x - center[..., None]) ** 2)) + rng.normal(0, 0.01, (6, 5, 41))
+    da = xr.DataArray(values, dims=("u", "v", "x"), coords={"x": x})
+    if use_dask:
+        da = da.chunk({"u": 1})
+    model = lmfit.models.GaussianModel()
+    params = {"center": xr.DataArray(np.zeros(5), dims="v"), "sigma": 1.0}
+    expected = da.xlm.modelfit("x", model=model, params=params).compute()
+
+    result = da.xlm.modelfit("x", model=model, params=params, chunks="auto")
+    chunks = json.loads(result.attrs["modelfit_chunks"])
+    assert {dim: sum(sizes) for dim, sizes in chunks.items()} == {"u": 6, "v": 5}
+    assert result.modelfit_coefficients.chunksizes["u"] == tuple(chunks["u"])
+    xr.testing.assert_identical(
+        result.compute().drop_vars("modelfit_results"),
+        expected.drop_vars("modelfit_results").assign_attrs(result.attrs),
+    )
+
+    # Cheap fits are grouped into as few tasks as the CPUs allow, expensive fits
+    # are split into single points
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    monkeypatch.delattr(os, "process_cpu_count", raising=False)
+    result = da.xlm.modelfit("x", model=model, params=params, chunks="auto")
+    assert json.loads(result.attrs["modelfit_chunks"]) == {"u": [6], "v": [5]}
+    monkeypatch.setattr("xarray_lmfit.modelfit._AUTO_CHUNK_SECONDS", 1e-9)
+    result = da.xlm.modelfit(
+        "x", model=model, params=params, chunks="auto", output_result=False
+    )
+    assert json.loads(result.attrs["modelfit_chunks"]) == {"u": [1] * 6, "v": [1] * 5}
+
+    with pytest.raises(ValueError, match="chunks must be"):
+        da.xlm.modelfit("x", model=model, chunks=4)
+
+
+@pytest.mark.parametrize("shuffle", ["random", "variance"])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_shuffle(use_dask: bool, shuffle) -> None:
+    x = np.linspace(-5, 5, 41)
+    rng = np.random.default_rng(11)
+    center = rng.uniform(-1, 1, (5, 4))
+    values = np.exp(-((x - center[..., None]) ** 2)) + rng.normal(0, 0.01, (5, 4, 41))
+    values[:3, :2] = 0.0
+    ds = xr.Dataset(
+        {
+            "a": (("u", "v", "x"), values),
+            "b": (("v", "x"), values[0] * 2),
+        },
+        coords={
+            "x": x,
+            "u": [5, 3, 4, 1, 2],
+            "v": list("dcba"),
+            "label": ("u", ["p", "q", "r", "s", "t"]),
+        },
+        attrs={"sample": "test"},
+    )
+    if use_dask:
+        ds = ds.chunk({"u": 2, "v": 2})
+
+    model = lmfit.models.GaussianModel()
+    kwargs = {
+        "model": model,
+        "params": {
+            "center": xr.DataArray([-0.5, 0.0, 0.5, 0.0], dims="v"),
+            "sigma": 1.0,
+        },
+        "weights": xr.DataArray(np.linspace(1, 2, 5), dims="u"),
+        "errors": "ignore",
+    }
+    expected = ds.xlm.modelfit("x", **kwargs).compute()
+    result = ds.xlm.modelfit("x", shuffle=shuffle, **kwargs)
+    if use_dask:
+        assert result.a_modelfit_coefficients.chunks is not None
+    result = result.compute()
+
+    for var in ("a", "b"):
+        for actual, desired in zip(
+            result[f"{var}_modelfit_results"].values.flat,
+            expected[f"{var}_modelfit_results"].values.flat,
+            strict=True,
+        ):
+            assert actual.params == desired.params
+    xr.testing.assert_identical(
+        result.drop_vars(["a_modelfit_results", "b_modelfit_results"]),
+        expected.drop_vars(["a_modelfit_results", "b_modelfit_results"]),
+    )
+
+    # Parameters given as lmfit.Parameters are the same for every point
+    kwargs["params"] = model.make_params(center=0.0, sigma=1.0, amplitude=1.0)
+    expected = ds.xlm.modelfit("x", output_result=False, **kwargs).compute()
+    result = ds.xlm.modelfit("x", shuffle=shuffle, output_result=False, **kwargs)
+    xr.testing.assert_identical(result.compute(), expected)
+
+    with pytest.raises(ValueError, match="shuffle must be"):
+        ds.xlm.modelfit("x", model=model, shuffle="sorted")
+    with pytest.raises(ValueError, match="cannot be combined with warm_start"):
+        ds.xlm.modelfit("x", model=model, shuffle=shuffle, warm_start="u")
+
+
+@pytest.mark.parametrize("engine", ["lmfit", "batched", "threads"])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_outputs(use_dask: bool, engine, tmp_path) -> None:
+    da = _noisy_gaussians()
+    da[1] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 5})
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+    params = {"amplitude": 2.0, "center": 0.0, "sigma": {"value": 1.0, "min": 0.0}}
+    fit_kwargs = {
+        "model": model,
+        "params": params,
+        "output_result": False,
+        "engine": engine,
+    }
+    expected = da.xlm.modelfit("x", **fit_kwargs).compute()
+
+    for outputs in (["stats", "coefficients"], "best_fit", ["data"]):
+        for _ in range(2):
+            # The second fit is loaded from the cache
+            result = da.xlm.modelfit(
+                "x", outputs=outputs, cache=tmp_path, **fit_kwargs
+            ).compute()
+            selected = [outputs] if isinstance(outputs, str) else outputs
+            names = [f"modelfit_{output}" for output in xarray_lmfit.modelfit._OUTPUTS]
+            assert list(result.data_vars) == [
+                name for name in names if name.removeprefix("modelfit_") in selected
+            ]
+            xr.testing.assert_identical(result, expected[list(result.data_vars)])
+
+    coarse = da.xlm.modelfit(
+        "x", outputs="stats", coarsen={"fit": 2}, **fit_kwargs
+    ).compute()
+    assert list(coarse.data_vars) == ["modelfit_stats"]
+
+    with pytest.raises(ValueError, match="Unknown outputs"):
+        da.xlm.modelfit("x", outputs=["coefficient"], **fit_kwargs)
+
+
+@pytest.mark.parametrize("engine", ["lmfit", "batched"])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_lazy_curves(use_dask: bool, engine, monkeypatch) -> None:
+    da = _noisy_gaussians()
+    da[0, :5] = np.nan
+    da[1] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 5})
+    model = lmfit.models.GaussianModel(prefix="g_") + lmfit.models.ConstantModel()
+    fit_kwargs = {
+        "model": model,
+        "params": {"g_amplitude": 2.0, "g_center": 0.0, "g_sigma": 1.0, "c": 0.0},
+        "output_result": False,
+        "engine": engine,
+    }
+    expected = da.xlm.modelfit("x", **fit_kwargs).compute()
+    result = da.xlm.modelfit("x", lazy_best_fit=True, components=True, **fit_kwargs)
+
+    best_fit = result.modelfit_best_fit
+    if use_dask:
+        assert best_fit.chunks is not None
+    else:
+        assert isinstance(best_fit.variable._data, xr.core.indexing.LazilyIndexedArray)
+        # Only the accessed pixels are evaluated
+        calls: list[lmfit.Model] = []
+        batched_eval = xarray_lmfit._batched.batched_eval
+        monkeypatch.setattr(
+            xarray_lmfit._batched,
+            "batched_eval",
+            lambda *args: calls.append(args[0]) or batched_eval(*args),
+        )
+        best_fit.isel(fit=3, x=slice(10, 20)).load()
+        assert sum(evaluated is model for evaluated in calls) == 1
+        monkeypatch.undo()
+
+    xr.testing.assert_allclose(best_fit.compute(), expected.modelfit_best_fit)
+    assert list(result.component.values) == ["g_", "constant"]
+    assert result.modelfit_components.dims == ("fit", "component", "x")
+    xr.testing.assert_allclose(
+        result.modelfit_components.sum("component", skipna=False).compute(),
+        expected.modelfit_best_fit,
+    )
+    xr.testing.assert_identical(
+        result.drop_vars(["modelfit_best_fit", "modelfit_components", "component"]),
+        expected.drop_vars("modelfit_best_fit"),
+    )
+
+    selected = da.xlm.modelfit(
+        "x", outputs="best_fit", lazy_best_fit=True, **fit_kwargs
+    )
+    assert list(selected.data_vars) == ["modelfit_best_fit"]
+
+    with pytest.raises(ValueError, match="param_names is missing"):
+        da.xlm.modelfit("x", param_names=["g_center"], components=True, **fit_kwargs)
+
+
+@pytest.mark.parametrize("engine", ["lmfit", "batched", "threads"])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_output_dtype(use_dask: bool, engine) -> None:
+    da = _noisy_gaussians().astype(np.float32)
+    data = da
+    if use_dask:
+        da = da.chunk({"fit": 5})
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+    fit_kwargs = {
+        "model": model,
+        "params": {"amplitude": 2.0, "center": 0.0, "sigma": 1.0},
+        "output_result": False,
+        "engine": engine,
+    }
+    expected = da.xlm.modelfit("x", **fit_kwargs).compute()
+    result = da.xlm.modelfit("x", output_dtype=np.float32, **fit_kwargs)
+    for name, var in result.data_vars.items():
+        assert var.dtype == (np.float64 if name == "modelfit_stats" else np.float32)
+    if not use_dask:
+        # The data is not copied
+        assert np.shares_memory(result.modelfit_data.values, data.values)
+    xr.testing.assert_allclose(result.compute(), expected, rtol=1e-5, atol=1e-6)
+
+    lazy = da.xlm.modelfit(
+        "x", output_dtype="float32", lazy_best_fit=True, **fit_kwargs
+    )
+    assert lazy.modelfit_best_fit.dtype == np.float32
+    xr.testing.assert_allclose(
+        lazy.modelfit_best_fit.compute(), result.modelfit_best_fit.compute()
+    )
+
+    with pytest.raises(ValueError, match="output_dtype must be a floating point"):
+        da.xlm.modelfit("x", output_dtype=int, **fit_kwargs)
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_stripped_results(use_dask: bool) -> None:
+    da = _noisy_gaussians(4)
+    da[1, :5] = np.nan
+    da[2] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 2})
+    model = lmfit.models.GaussianModel()
+    params = {"amplitude": 2.0, "center": 0.0, "sigma": 1.0}
+    expected = da.xlm.modelfit("x", model=model, params=params).compute()
+    result = da.xlm.modelfit(
+        "x", model=model, params=params, output_result="stripped"
+    ).compute()
+    xr.testing.assert_identical(
+        result.drop_vars("modelfit_results"),
+        expected.drop_vars("modelfit_results"),
+    )
+
+    for i in range(da.sizes["fit"]):
+        stripped = result.modelfit_results[i].item()
+        full = expected.modelfit_results[i].item()
+        assert isinstance(stripped, lmfit.model.ModelResult)
+        assert stripped.success == full.success
+        if not full.success:
+            continue
+        assert len(pickle.dumps(stripped)) < len(pickle.dumps(full))
+        stripped = pickle.loads(pickle.dumps(stripped))
+        assert "best_fit" not in vars(stripped)
+        # Rehydrated on access
+        np.testing.assert_array_equal(stripped.best_fit, full.best_fit)
+        np.testing.assert_array_equal(stripped.init_fit, full.init_fit)
+        np.testing.assert_allclose(stripped.residual, full.residual)
+        np.testing.assert_allclose(stripped.result.residual, full.result.residual)
+        assert stripped.dumps() == full.dumps()
+
+
+@pytest.mark.parametrize(
+    ("use_dask", "engine"),
+    [(True, "lmfit"), (False, "lmfit"), (False, "processes")],
+    ids=["dask", "no_dask", "processes"],
+)
+def test_modelfit_lite_results(use_dask: bool, engine) -> None:
+    da = _noisy_gaussians(4)
+    da[1, :5] = np.nan
+    da[2] = np.nan
+    if use_dask:
+        da = da.chunk({"fit": 2})
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+    params = {
+        "amplitude": 2.0,
+        "center": {"value": 0.0, "min": -1.0, "max": 1.0},
+        "sigma": 1.0,
+        "c": 0.5,
+    }
+    expected = da.xlm.modelfit("x", model=model, params=params).compute()
+    result = da.xlm.modelfit(
+        "x", model=model, params=params, output_result="lite", engine=engine
+    ).compute()
+    xr.testing.assert_identical(
+        result.drop_vars(["modelfit_results", "modelfit_model"]),
+        expected.drop_vars("modelfit_results"),
+    )
+
+    for i in range(da.sizes["fit"]):
+        lite = result.modelfit_results[i].item()
+        full = expected.modelfit_results[i].item()
+        assert isinstance(lite, xarray_lmfit.LiteModelResult)
+        assert not hasattr(lite, "__dict__")
+        assert lite.success == full.success
+        assert lite.best_values == full.params.valuesdict()
+
+        # The data and coordinates of the point are attached by the accessor
+        record = result.xlm.modelfit_results().isel(fit=i)
+        rebuilt = record.to_model_result()
+        assert lite.data is None
+        assert np.shares_memory(record.data, result.modelfit_data.values)
+        assert np.shares_memory(record.independent_vars["x"], result.x.values)
+        assert rebuilt.success == full.success
+        # Bounds and constraints of the fit are restored
+        for name, par in full.params.items():
+            assert rebuilt.params[name].min == par.min
+            assert rebuilt.params[name].max == par.max
+            assert rebuilt.params[name].expr == par.expr
+        assert rebuilt.params["center"].min == -1.0
+        if not full.success:
+            continue
+        np.testing.assert_allclose(rebuilt.best_fit, full.best_fit)
+        np.testing.assert_allclose(
+            lite.to_model_result(result.modelfit_data[i], x=result.x).best_fit,
+            full.best_fit,
+        )
+        np.testing.assert_allclose(rebuilt.covar, full.covar)
+        for stat in ("nfev", "ndata", "nvarys", "chisqr", "redchi", "aic", "bic"):
+            assert getattr(rebuilt, stat) == pytest.approx(getattr(full, stat))
+        for name, par in full.params.items():
+            assert rebuilt.params[name].stderr == pytest.approx(par.stderr)
+
+    with pytest.raises(ValueError, match="fitted data must be given"):
+        lite.to_model_result(x=result.x)
+    with pytest.raises(ValueError, match="output_result must be"):
+        da.xlm.modelfit("x", model=model, params=params, output_result="full")
+
+
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no_dask"])
+def test_modelfit_columnar_results(use_dask: bool, tmp_path) -> None:
+    da = _noisy_gaussians(4)
+    da[1, :5] = np.nan
+    da[2] = np.nan
+    ds = xr.Dataset({"a": da, "b": da * 2})
+    if use_dask:
+        ds = ds.chunk({"fit": 2})
+    model = lmfit.models.GaussianModel() + lmfit.models.ConstantModel()
+    params = {
+        "amplitude": 2.0,
+        "center": {"value": 0.0, "min": -1.0, "max": 1.0},
+        "sigma": 1.0,
+        "c": {"expr": "0.25 * amplitude"},
+    }
+    expected = ds.xlm.modelfit(
+        "x", model=model, params=params, output_result="lite"
+    ).compute()
+    result = ds.xlm.modelfit("x", model=model, params=params, output_result="columnar")
+    assert not any(var.dtype == object for var in result.data_vars.values())
+    result = result.compute()
+    descriptions = ["a_modelfit_model", "b_modelfit_model"]
+    xr.testing.assert_identical(
+        result[
+            [name for name in result.data_vars if "modelfit_result" not in name]
+        ].drop_vars(descriptions),
+        expected.drop_vars(["a_modelfit_results", "b_modelfit_results", *descriptions]),
+    )
+
+    path = tmp_path / "columnar.nc"
+    xarray_lmfit.save_fit(result, path)
+    loaded = xarray_lmfit.load_fit(path)
+
+    for name in ("a", "b"):
+        for i in range(ds.sizes["fit"]):
+            lite = expected[f"{name}_modelfit_results"][i].item()
+            for indexer in (
+                result.xlm.modelfit_results(name),
+                loaded.xlm.modelfit_results(name),
+            ):
+                record = indexer.isel(fit=i)
+                assert record.success == lite.success
+                assert record.status == lite.status
+                assert record.message == lite.message
+                assert record.nfev == lite.nfev
+                assert record.var_names == lite.var_names
+                # Parameters derived from the model's hints are not stored
+                for field in ("best_values", "init_values", "stderr"):
+                    expected_values = getattr(lite, field)
+                    assert getattr(record, field) == {
+                        k: expected_values[k] for k in result.param.values
+                    }
+                assert record.correl == lite.correl
+                assert record.bounds == {
+                    k: v for k, v in lite.bounds.items() if k in result.param.values
+                }
+                assert record.bounds["center"] == (-1.0, 1.0)
+                assert record.exprs == {"c": "0.25 * amplitude"}
+
+            # The data and coordinates are read from the Dataset
+            rebuilt = loaded.xlm.modelfit_results(name).isel(fit=i).to_model_result()
+            full = lite.to_model_result(result[f"{name}_modelfit_data"][i], x=result.x)
+            assert rebuilt.params["center"].min == -1.0
+            assert rebuilt.params["c"].expr == "0.25 * amplitude"
+            if lite.success:
+                np.testing.assert_allclose(rebuilt.best_fit, full.best_fit)
+
+        record = result.xlm.modelfit_results(name, model=model).sel(fit=0)
+        assert record.model is model
+
+    with pytest.raises(ValueError, match="Select a single point"):
+        result.xlm.modelfit_results("a").isel(fit=slice(2))
+    with pytest.raises(ValueError, match="No lite or columnar results"):
+        ds.xlm.modelfit("x", model=model, params=params).xlm.modelfit_results("a")
+
+
+def test_low_discrepancy_ranks() -> None:
+    ranks = xarray_lmfit.modelfit._low_discrepancy_ranks(64)
+    np.testing.assert_array_equal(np.sort(ranks), np.arange(64))
+    # Every contiguous range of 8 points has one point from each eighth of the ranks
+    for start in range(0, 64, 8):
+        assert set(ranks[start : start + 8] // 8) == set(range(8))
+
+
+@pytest.mark.parametrize("warm_start", [False, True], ids=["cold", "warm"])
+@pytest.mark.parametrize("use_dask", [True, False], ids=["dask", "no-dask"])
+def test_modelfit_update(use_dask: bool, warm_start: bool, monkeypatch) -> None:
+    x = np.linspace(-10, 10, 81)
+    time = np.arange(12) * 0.5
+    center = np.linspace(-3, 3, time.size)
+    rng = np.random.default_rng(7)
+    values = np.exp(-((x - center[:, None, None]) ** 2) / 0.5) * np.array([1.0, 2.0])[
+        None, :, None
+    ] + rng.normal(0, 0.01, (time.size, 2, x.size))
+    da = xr.DataArray(
+        values,
+        dims=("time", "channel", "x"),
+        coords={"x": x, "time": time},
+    )
+    if use_dask:
+        da = da.chunk({"time": 4})
+
+    model = lmfit.models.GaussianModel()
+    params = {"center": -3.0, "sigma": 0.5, "amplitude": 1.0}
+    kwargs = {"warm_start": "time"} if warm_start else {}
+    previous = (
+        da.isel(time=slice(8))
+        .xlm.modelfit("x", model=model, params=params, **kwargs)
+        .compute()
+    )
+    full = da.xlm.modelfit("x", model=model, params=params, **kwargs).compute()
+
+    n_fits = 0
+    model_fit = lmfit.Model.fit
+
+    def _counting_fit(self, *args, **kwargs):
+        nonlocal n_fits
+        n_fits += 1
+        return model_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(lmfit.Model, "fit", _counting_fit)
+    updated = da.xlm.modelfit_update(
+        previous, "time", "x", model, params=params, warm_start=warm_start
+    ).compute()
+    assert n_fits == 4 * 2
+
+    assert updated.sizes["time"] == 12
+    xr.testing.assert_identical(updated.time, da.time)
+    assert isinstance(updated.modelfit_results[-1, 0].item(), lmfit.model.ModelResult)
+    xr.testing.assert_equal(updated.modelfit_data.transpose(*da.dims), da.compute())
+    if warm_start:
+        # Continues from the last fit of the previous results
+        np.testing.assert_allclose(
+            updated.modelfit_coefficients.sel(param="center"),
+            np.broadcast_to(center[:, None], (12, 2)),
+            atol=1e-2,
+        )
+    else:
+        xr.testing.assert_allclose(
+            updated.drop_vars("modelfit_results"),
+            full.drop_vars("modelfit_results"),
+        )
+
+    # Nothing to update
+    xr.testing.assert_identical(
+        da.xlm.modelfit_update(updated, "time", "x", model, params=params), updated
+    )